@@ -18,6 +18,10 @@ function autoformat {
     poetry run isort .
 }
 
+function bench {
+    poetry run python -m benchmarks run "$@"
+}
+
 function publish() {
     poetry config repositories.pypi "$1"
     poetry config pypi-token.pypi "$2"
@@ -0,0 +1 @@
+"""Benchmarks of linthell hot paths, run with `python -m benchmarks`."""
@@ -0,0 +1,368 @@
+"""CLI to run benchmarks and compare their results.
+
+Usage:
+$ python -m benchmarks run --size 100k -o before.json
+$ git checkout feature
+$ python -m benchmarks run --size 100k -o after.json
+$ python -m benchmarks compare before.json after.json
+$ python -m benchmarks startup
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+import click
+
+from benchmarks.cases import CASES, OUTPUT_FILE, Measurement, run_case
+from benchmarks.generators import (
+    GENERATORS,
+    generate_source_tree,
+    get_files_count,
+)
+
+SIZES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000, '5m': 5_000_000}
+"""Counts of errors, 5m gives hundreds of megabytes of diff outputs."""
+_MEGABYTE = 1024 * 1024
+STARTUP_COMMANDS = (
+    'lint',
+    'baseline',
+    'pre-commit lint',
+    'pre-commit baseline',
+)
+STARTUP_BUDGET_MS = 150.0
+"""Import time budget of a command, every pre-commit hook run pays it."""
+
+
+@click.group()
+def cli() -> None:
+    """Benchmarks of linthell parse, lint and baseline throughput."""
+
+
+@cli.command('run')
+@click.option(
+    '--size',
+    'size_names',
+    type=click.Choice(list(SIZES), case_sensitive=False),
+    multiple=True,
+    default=['1k', '100k'],
+    show_default=True,
+    help='Count of errors in linter output.',
+)
+@click.option(
+    '--plugin',
+    'plugin_names',
+    type=click.Choice(list(GENERATORS)),
+    multiple=True,
+    help='Plugin to benchmark. [default: all]',
+)
+@click.option(
+    '--case',
+    'case_names',
+    type=click.Choice(list(CASES)),
+    multiple=True,
+    help='Case to run. [default: all]',
+)
+@click.option(
+    '--repeat',
+    type=click.IntRange(min=1),
+    default=3,
+    show_default=True,
+    help='Count of runs of each case, each one in a fresh process.',
+)
+@click.option(
+    '--output',
+    '-o',
+    'output_file',
+    type=click.File('w'),
+    default='-',
+    help='File to write JSON results to. [default: stdout]',
+)
+@click.option(
+    '--work-dir',
+    type=click.Path(file_okay=False),
+    default=None,
+    help='Directory to generate data in. [default: temporary directory]',
+)
+def run_cli(
+    size_names: Tuple[str, ...],
+    plugin_names: Tuple[str, ...],
+    case_names: Tuple[str, ...],
+    repeat: int,
+    output_file: TextIO,
+    work_dir: Optional[str],
+) -> None:
+    """Generate linter outputs with source trees and measure cases.
+
+    Wall time is the minimal time of all runs, peak RSS is the maximal one.
+    """
+    plugin_names = plugin_names or tuple(GENERATORS)
+    # Keep order of execution, later cases depend on earlier ones
+    case_names = tuple(name for name in CASES if name in case_names) or tuple(
+        CASES
+    )
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(work_dir or temp_dir).resolve()
+        for size_name in size_names:
+            errors_count = SIZES[size_name.lower()]
+            size_dir = root / size_name.lower()
+            paths = generate_source_tree(
+                size_dir, get_files_count(errors_count)
+            )
+            for plugin_name in plugin_names:
+                plugin_dir = size_dir / plugin_name
+                plugin_dir.mkdir(exist_ok=True)
+                (plugin_dir / OUTPUT_FILE).write_text(
+                    GENERATORS[plugin_name](paths, errors_count)
+                )
+                for case_name in case_names:
+                    click.echo(
+                        f'{size_name} {plugin_name} {case_name}', err=True
+                    )
+                    measurements = [
+                        _run_in_process(
+                            case_name, plugin_name, size_dir, plugin_dir
+                        )
+                        for _ in range(repeat)
+                    ]
+                    results.append(
+                        _summarize(
+                            size_name.lower(),
+                            errors_count,
+                            plugin_name,
+                            case_name,
+                            measurements,
+                        )
+                    )
+
+    report = {'environment': _get_environment(), 'results': results}
+    json.dump(report, output_file, indent=2)
+    output_file.write('\n')
+
+
+@cli.command('compare')
+@click.argument('base_file', type=click.File())
+@click.argument('new_file', type=click.File())
+def compare_cli(base_file: TextIO, new_file: TextIO) -> None:
+    """Compare results of two runs, ratio < 1 means new one is faster."""
+    base_results = _index_results(json.load(base_file))
+    new_results = _index_results(json.load(new_file))
+    click.echo(
+        f'{"size":<6}{"plugin":<12}{"case":<21}'
+        f'{"base, s":>10}{"new, s":>10}{"ratio":>8}{"rss ratio":>11}'
+    )
+    for key, new_result in new_results.items():
+        base_result = base_results.get(key)
+        if base_result is None:
+            continue
+        size, plugin, case = key
+        base_time, new_time = base_result['wall_time'], new_result['wall_time']
+        click.echo(
+            f'{size:<6}{plugin:<12}{case:<21}{base_time:>10.4f}'
+            f'{new_time:>10.4f}{_ratio(new_time, base_time):>8}'
+            + '{:>11}'.format(
+                _ratio(new_result['peak_rss'], base_result['peak_rss'])
+            )
+        )
+
+
+@cli.command('startup')
+@click.option(
+    '--command',
+    'commands',
+    multiple=True,
+    default=STARTUP_COMMANDS,
+    show_default=True,
+    help='linthell command to start, its words are separated by spaces.',
+)
+@click.option(
+    '--repeat',
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help='Count of starts of each command.',
+)
+@click.option(
+    '--budget',
+    'budget_ms',
+    type=click.FloatRange(min=0),
+    default=STARTUP_BUDGET_MS,
+    show_default=True,
+    help='Max import time of a command in milliseconds.',
+)
+def startup_cli(
+    commands: Tuple[str, ...], repeat: int, budget_ms: float
+) -> None:
+    """Measure import time of commands by `python -X importtime`.
+
+    Each command is started with `--help` in a fresh interpreter (without
+    daemon), so modules imported on startup are measured only. Import time
+    is the minimal one of all starts. Exit code is 1 if any command exceeds
+    the budget.
+    """
+    click.echo(
+        f'{"command":<22}{"imports, ms":>12}{"wall, ms":>10}'
+        '  slowest import'
+    )
+    over_budget = []
+    for command in commands:
+        import_time, wall_time, slowest_import = min(
+            _measure_startup(command.split()) for _ in range(repeat)
+        )
+        click.echo(
+            f'{command:<22}{import_time * 1000:>12.1f}'
+            f'{wall_time * 1000:>10.1f}  {slowest_import}'
+        )
+        if import_time * 1000 > budget_ms:
+            over_budget.append(command)
+    if over_budget:
+        click.echo(
+            f'Import time exceeds budget of {budget_ms:g} ms: '
+            + ', '.join(over_budget),
+            err=True,
+        )
+        sys.exit(1)
+
+
+def _measure_startup(argv: List[str]) -> Tuple[float, float, str]:
+    """Start linthell command in a fresh interpreter.
+
+    :return: import time and wall time in seconds, the slowest top-level
+    import
+    """
+    start = time.perf_counter()
+    process = subprocess.run(
+        [
+            sys.executable,
+            '-X',
+            'importtime',
+            '-m',
+            'linthell',
+            *argv,
+            '--help',
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        env={**os.environ, 'LINTHELL_DAEMON': '0'},
+        check=True,
+    )
+    wall_time = time.perf_counter() - start
+    import_times = _parse_import_times(process.stderr)
+    slowest_import = max(import_times, key=lambda name: import_times[name])
+    return sum(import_times.values()), wall_time, slowest_import
+
+
+def _parse_import_times(importtime_output: str) -> Dict[str, float]:
+    """Get cumulative import time of top-level imports in seconds.
+
+    Lines look like `import time: <self, us> | <cumulative, us> | <name>`,
+    name is indented by nesting level of import.
+    """
+    import_times = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        if name.startswith('  ') or not cumulative.strip().isdigit():
+            continue
+        import_times[name.strip()] = int(cumulative) / 1_000_000
+    return import_times
+
+
+def _run_in_process(
+    case_name: str, plugin_name: str, size_dir: Path, plugin_dir: Path
+) -> Measurement:
+    """Run case in a fresh process, so peak RSS is measured for it only."""
+    with ProcessPoolExecutor(1, mp_context=get_context('spawn')) as executor:
+        return executor.submit(
+            run_case, case_name, plugin_name, str(size_dir), str(plugin_dir)
+        ).result()
+
+
+def _summarize(
+    size_name: str,
+    errors_count: int,
+    plugin_name: str,
+    case_name: str,
+    measurements: List[Measurement],
+) -> Dict[str, Any]:
+    """Summarize runs of a case."""
+    wall_time = min(measurement.wall_time for measurement in measurements)
+    input_bytes = measurements[0].input_bytes
+    peak_rss = _max_or_none(
+        [measurement.peak_rss for measurement in measurements]
+    )
+    peak_rss_delta = _max_or_none(
+        [measurement.peak_rss_delta for measurement in measurements]
+    )
+    return {
+        'size': size_name,
+        'plugin': plugin_name,
+        'case': case_name,
+        'errors': errors_count,
+        'input_bytes': input_bytes,
+        'wall_time': wall_time,
+        'wall_time_median': statistics.median(
+            measurement.wall_time for measurement in measurements
+        ),
+        'errors_per_second': errors_count / wall_time if wall_time else None,
+        'megabytes_per_second': (
+            input_bytes / _MEGABYTE / wall_time if wall_time else None
+        ),
+        'peak_rss': peak_rss,
+        'peak_rss_delta': peak_rss_delta,
+    }
+
+
+def _max_or_none(values: List[Optional[int]]) -> Optional[int]:
+    present_values = [value for value in values if value is not None]
+    return max(present_values) if present_values else None
+
+
+def _get_environment() -> Dict[str, Optional[str]]:
+    """Get description of revision and environment results are taken on."""
+    try:
+        revision: Optional[str] = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        'revision': revision,
+        'python': sys.version,
+        'platform': platform.platform(),
+    }
+
+
+def _index_results(
+    report: Dict[str, Any]
+) -> Dict[Tuple[str, str, str], Dict[str, Any]]:
+    return {
+        (result['size'], result['plugin'], result['case']): result
+        for result in report['results']
+    }
+
+
+def _ratio(new: Optional[float], base: Optional[float]) -> str:
+    if not new or not base:
+        return '-'
+    return f'{new / base:.2f}'
+
+
+if __name__ == '__main__':
+    cli()
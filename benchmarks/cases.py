@@ -0,0 +1,308 @@
+"""Benchmark cases, each one is measured inside a fresh process.
+
+Case prepares its input first, then only the measured operation is timed.
+Peak RSS is taken for the whole process and for the operation itself
+(growth of peak RSS since the preparation is done).
+"""
+
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from linthell.plugins.base import load_plugin_by_name
+from linthell.utils.baseline import (
+    gc_baseline,
+    generate_baseline,
+    get_baseline_format,
+    get_digests_from_baseline,
+    load_baseline,
+    migrate_baseline,
+    save_baseline,
+)
+from linthell.utils.digest_index import get_index_path
+from linthell.utils.lint import lint
+from linthell.utils.linter_input import LinterInput
+from linthell.utils.streams import iter_chunks
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+OUTPUT_FILE = 'output.txt'
+BASELINE_FILE = 'baseline.txt'
+DIGESTS_BASELINE_FILE = 'baseline-digests.txt'
+SHARDED_BASELINE_DIR = 'baseline-sharded'
+SQLITE_BASELINE_FILE = 'baseline.db'
+GC_BASELINE_FILE = 'baseline-gc.txt'
+FEW_FILES_OUTPUT_SIZE = 64 * 1024
+"""Size of output of a few files, like of a pre-commit run."""
+
+
+class Measurement(NamedTuple):
+    """Result of a single run of a case."""
+
+    wall_time: float
+    """Seconds spent by the measured operation."""
+    input_bytes: int
+    """Size of data processed by the operation."""
+    peak_rss: Optional[int]
+    """Peak RSS of the process in bytes."""
+    peak_rss_delta: Optional[int]
+    """Growth of peak RSS during the operation in bytes."""
+
+
+Operation = Callable[[], object]
+Case = Callable[[str, Path], Tuple[Operation, int]]
+"""Prepare case for plugin and its data directory.
+
+Return operation to time and size of its input.
+"""
+
+
+def _read_output(data_dir: Path) -> str:
+    return (data_dir / OUTPUT_FILE).read_text()
+
+
+def parse_case(plugin_name: str, data_dir: Path) -> Tuple[Operation, int]:
+    """Parse the whole linter output."""
+    plugin = load_plugin_by_name(plugin_name)
+    output = _read_output(data_dir)
+    return lambda: plugin.parse(output), len(output)
+
+
+def iter_parse_case(plugin_name: str, data_dir: Path) -> Tuple[Operation, int]:
+    """Parse linter output streamed from file by chunks."""
+    plugin = load_plugin_by_name(plugin_name)
+    output_file = data_dir / OUTPUT_FILE
+
+    def operation() -> None:
+        with output_file.open() as output:
+            for _ in plugin.iter_parse(iter_chunks(output)):
+                pass
+
+    return operation, output_file.stat().st_size
+
+
+def parse_input_case(
+    plugin_name: str, data_dir: Path
+) -> Tuple[Operation, int]:
+    """Parse linter output file, memory mapped if plugin supports it."""
+    plugin = load_plugin_by_name(plugin_name)
+    output_file = data_dir / OUTPUT_FILE
+
+    def operation() -> None:
+        with output_file.open(encoding='utf-8') as output:
+            with LinterInput(output) as linter_input:
+                for _ in linter_input.iter_parse(plugin):
+                    pass
+
+    return operation, output_file.stat().st_size
+
+
+def lint_case(plugin_name: str, data_dir: Path) -> Tuple[Operation, int]:
+    """Lint linter output against its baseline loaded to set."""
+    plugin = load_plugin_by_name(plugin_name)
+    output = _read_output(data_dir)
+    digests = get_digests_from_baseline(
+        data_dir / BASELINE_FILE, use_index=False
+    )
+    return lambda: lint(digests, output, plugin), len(output)
+
+
+def generate_baseline_case(
+    plugin_name: str, data_dir: Path
+) -> Tuple[Operation, int]:
+    """Generate baseline id lines from linter output."""
+    plugin = load_plugin_by_name(plugin_name)
+    output = _read_output(data_dir)
+    return lambda: generate_baseline(output, plugin), len(output)
+
+
+def save_baseline_case(
+    plugin_name: str, data_dir: Path
+) -> Tuple[Operation, int]:
+    """Save baseline file, it's used by the following cases."""
+    plugin = load_plugin_by_name(plugin_name)
+    id_lines = generate_baseline(_read_output(data_dir), plugin)
+    baseline_file = data_dir / BASELINE_FILE
+    size = sum(len(id_line) + 1 for id_line in id_lines)
+    return lambda: save_baseline(baseline_file, id_lines), size
+
+
+def load_baseline_case(
+    plugin_name: str, data_dir: Path
+) -> Tuple[Operation, int]:
+    """Load digests by parsing baseline file."""
+    baseline_file = data_dir / BASELINE_FILE
+    return (
+        lambda: get_digests_from_baseline(baseline_file, use_index=False),
+        baseline_file.stat().st_size,
+    )
+
+
+def load_baseline_index_case(
+    plugin_name: str, data_dir: Path
+) -> Tuple[Operation, int]:
+    """Load digests from up-to-date binary index of baseline."""
+    baseline_file = data_dir / BASELINE_FILE
+    index_path = get_index_path(baseline_file)
+    # Build index if it's missing or stale
+    get_digests_from_baseline(baseline_file)
+    return (
+        lambda: get_digests_from_baseline(baseline_file),
+        index_path.stat().st_size,
+    )
+
+
+def load_baseline_digests_case(
+    plugin_name: str, data_dir: Path
+) -> Tuple[Operation, int]:
+    """Load baseline with digests only (blake2b-64)."""
+    baseline_file = data_dir / DIGESTS_BASELINE_FILE
+    baseline_file.write_bytes((data_dir / BASELINE_FILE).read_bytes())
+    migrate_baseline(baseline_file, get_baseline_format(digests_only=True))
+    return (
+        lambda: get_digests_from_baseline(baseline_file),
+        baseline_file.stat().st_size,
+    )
+
+
+def lint_digests_case(
+    plugin_name: str, data_dir: Path
+) -> Tuple[Operation, int]:
+    """Lint linter output against baseline with digests only."""
+    plugin = load_plugin_by_name(plugin_name)
+    output = _read_output(data_dir)
+    baseline_file = data_dir / DIGESTS_BASELINE_FILE
+    baseline_file.write_bytes((data_dir / BASELINE_FILE).read_bytes())
+    migrate_baseline(baseline_file, get_baseline_format(digests_only=True))
+    digests = get_digests_from_baseline(baseline_file)
+    return lambda: lint(digests, output, plugin), len(output)
+
+
+def lint_few_files_case(
+    plugin_name: str, data_dir: Path
+) -> Tuple[Operation, int]:
+    """Load baseline (from index) and lint output of a few files."""
+    baseline_file = data_dir / BASELINE_FILE
+    # Build index if it's missing or stale
+    get_digests_from_baseline(baseline_file)
+    return _lint_few_files(plugin_name, data_dir, baseline_file)
+
+
+def lint_few_files_sharded_case(
+    plugin_name: str, data_dir: Path
+) -> Tuple[Operation, int]:
+    """Load shards of sharded baseline and lint output of a few files."""
+    baseline_dir = data_dir / SHARDED_BASELINE_DIR
+    if baseline_dir.exists():
+        shutil.rmtree(baseline_dir)
+    baseline_dir.mkdir()
+    save_baseline(
+        baseline_dir,
+        load_baseline(data_dir / BASELINE_FILE),
+        get_baseline_format(sharded=True),
+    )
+    return _lint_few_files(plugin_name, data_dir, baseline_dir)
+
+
+def lint_few_files_sqlite_case(
+    plugin_name: str, data_dir: Path
+) -> Tuple[Operation, int]:
+    """Query digests of errors of a few files from SQLite baseline."""
+    baseline_file = data_dir / SQLITE_BASELINE_FILE
+    save_baseline(
+        baseline_file,
+        load_baseline(data_dir / BASELINE_FILE),
+        get_baseline_format(sqlite=True),
+    )
+    return _lint_few_files(plugin_name, data_dir, baseline_file)
+
+
+def gc_baseline_case(
+    plugin_name: str, data_dir: Path
+) -> Tuple[Operation, int]:
+    """Check each entry of baseline copy against files and linter output.
+
+    Files exist and output is the same, so nothing is removed, but the whole
+    baseline is streamed.
+    """
+    plugin = load_plugin_by_name(plugin_name)
+    id_lines = generate_baseline(_read_output(data_dir), plugin)
+    baseline_file = data_dir / GC_BASELINE_FILE
+    shutil.copyfile(data_dir / BASELINE_FILE, baseline_file)
+    return (
+        lambda: gc_baseline(baseline_file, id_lines),
+        baseline_file.stat().st_size,
+    )
+
+
+def _lint_few_files(
+    plugin_name: str, data_dir: Path, baseline_file: Path
+) -> Tuple[Operation, int]:
+    """Lint the beginning of output, errors are sorted by files."""
+    plugin = load_plugin_by_name(plugin_name)
+    output = _read_output(data_dir)
+    boundary = plugin.find_record_boundary(output, FEW_FILES_OUTPUT_SIZE)
+    if boundary:
+        output = output[:boundary]
+
+    def operation() -> None:
+        lint(get_digests_from_baseline(baseline_file), output, plugin)
+
+    return operation, len(output)
+
+
+CASES: Dict[str, Case] = {
+    'parse': parse_case,
+    'iter-parse': iter_parse_case,
+    'parse-input': parse_input_case,
+    'generate-baseline': generate_baseline_case,
+    'save-baseline': save_baseline_case,
+    'load-baseline': load_baseline_case,
+    'load-baseline-index': load_baseline_index_case,
+    'load-baseline-digests': load_baseline_digests_case,
+    'lint': lint_case,
+    'lint-digests': lint_digests_case,
+    'lint-few-files': lint_few_files_case,
+    'lint-few-files-sharded': lint_few_files_sharded_case,
+    'lint-few-files-sqlite': lint_few_files_sqlite_case,
+    'gc-baseline': gc_baseline_case,
+}
+"""Cases in order of execution, later cases need baseline file saved."""
+
+
+def run_case(
+    case_name: str, plugin_name: str, work_dir: str, data_dir: str
+) -> Measurement:
+    """Prepare and measure case.
+
+    :param case_name: name of case to run
+    :param plugin_name: plugin to use
+    :param work_dir: root of source tree, paths of output are relative to it
+    :param data_dir: directory with linter output and baseline
+    """
+    os.chdir(work_dir)
+    operation, input_bytes = CASES[case_name](plugin_name, Path(data_dir))
+    peak_rss_before = _get_peak_rss()
+    start = time.perf_counter()
+    operation()
+    wall_time = time.perf_counter() - start
+    peak_rss = _get_peak_rss()
+    peak_rss_delta = None
+    if peak_rss is not None and peak_rss_before is not None:
+        peak_rss_delta = peak_rss - peak_rss_before
+    return Measurement(wall_time, input_bytes, peak_rss, peak_rss_delta)
+
+
+def _get_peak_rss() -> Optional[int]:
+    """Get peak RSS of current process in bytes."""
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak_rss if sys.platform == 'darwin' else peak_rss * 1024
@@ -0,0 +1,279 @@
+"""Generators of synthetic source trees and linter outputs.
+
+Outputs reference lines of generated source files, so id lines are built
+from real code lines as they are for real linter outputs.
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+
+SOURCE_DIR = 'pkg'
+LINES_PER_FILE = 1000
+_ERRORS_PER_LINE = 2
+"""Max count of errors reported for a single line of code."""
+
+_FLAKE8_ERRORS = [
+    'E501 line too long (96 > 79 characters)',
+    'F401 \'os\' imported but unused',
+    'E231 missing whitespace after \',\'',
+    'W291 trailing whitespace',
+    'F841 local variable \'value\' is assigned to but never used',
+]
+_PYLINT_ERRORS = [
+    'C0301: Line too long (120/100) (line-too-long)',
+    'C0103: Variable name "x" doesn\'t conform to snake_case (invalid-name)',
+    'W0612: Unused variable \'value\' (unused-variable)',
+    'R1705: Unnecessary "else" after "return" (no-else-return)',
+]
+_MYPY_ERRORS = [
+    (
+        'error: Incompatible types in assignment (expression has type "str",'
+        ' variable has type "int")  [assignment]',
+        None,
+    ),
+    (
+        'error: Argument 1 to "compute" has incompatible type "str";'
+        ' expected "int"  [arg-type]',
+        'note: "compute" defined here',
+    ),
+    (
+        'error: Item "None" of "Optional[int]" has no attribute "real"'
+        '  [union-attr]',
+        'note: See https://mypy.rtfd.io/en/stable/_refs.html#code-union-attr',
+    ),
+]
+_PYDOCSTYLE_ERRORS = [
+    ('in public function `compute_{line}`', 'D103: Missing docstring'),
+    ('in public class `Model{line}`', 'D101: Missing docstring'),
+    ('in public method `run`', 'D401: First line should be imperative'),
+]
+
+Location = Tuple[str, int]
+"""Path of source file and line number."""
+
+
+def generate_source_tree(root: Path, files_count: int) -> List[str]:
+    """Generate python package with unique lines of code.
+
+    :param root: directory to create package in
+    :param files_count: count of modules
+    :return: paths of modules relative to root
+    """
+    paths = []
+    (root / SOURCE_DIR).mkdir(parents=True, exist_ok=True)
+    for file_number in range(files_count):
+        path = f'{SOURCE_DIR}/module_{file_number}.py'
+        lines = (
+            f'value_{line} = compute({file_number}, {line})  # noqa'
+            for line in range(1, LINES_PER_FILE + 1)
+        )
+        (root / path).write_text('\n'.join(lines) + '\n')
+        paths.append(path)
+    return paths
+
+
+def get_files_count(errors_count: int) -> int:
+    """Get count of source files enough to report errors."""
+    lines_count = -(-errors_count // _ERRORS_PER_LINE)
+    return max(1, -(-lines_count // LINES_PER_FILE))
+
+
+def iter_locations(
+    paths: List[str], errors_count: int, seed: int = 0
+) -> Iterator[Location]:
+    """Yield locations of errors sorted by path and line like linters do."""
+    rng = random.Random(seed)
+    lines_count = -(-errors_count // _ERRORS_PER_LINE)
+    lines_per_file = min(-(-lines_count // len(paths)), LINES_PER_FILE)
+    left = errors_count
+    for path in paths:
+        lines = sorted(
+            rng.sample(range(1, LINES_PER_FILE + 1), lines_per_file)
+        )
+        for line in lines:
+            for _ in range(min(_ERRORS_PER_LINE, left)):
+                yield path, line
+                left -= 1
+            if not left:
+                return
+
+
+def generate_flake8(paths: List[str], errors_count: int) -> str:
+    """Generate `flake8` output."""
+    return ''.join(
+        f'{path}:{line}:{index % 80 + 1}: '
+        f'{_FLAKE8_ERRORS[index % len(_FLAKE8_ERRORS)]}\n'
+        for index, (path, line) in enumerate(
+            iter_locations(paths, errors_count)
+        )
+    )
+
+
+def generate_pylint(paths: List[str], errors_count: int) -> str:
+    """Generate `pylint` output with module headers."""
+    parts = []
+    current_path = None
+    for index, (path, line) in enumerate(iter_locations(paths, errors_count)):
+        if path != current_path:
+            current_path = path
+            parts.append(f'************* Module {Path(path).stem}\n')
+        error = _PYLINT_ERRORS[index % len(_PYLINT_ERRORS)]
+        parts.append(f'{path}:{line}:{index % 80}: {error}\n')
+    return ''.join(parts)
+
+
+def generate_mypy(paths: List[str], errors_count: int) -> str:
+    """Generate `mypy` output, some errors are followed by note lines."""
+    parts = []
+    for index, (path, line) in enumerate(iter_locations(paths, errors_count)):
+        error, note = _MYPY_ERRORS[index % len(_MYPY_ERRORS)]
+        parts.append(f'{path}:{line}: {error}\n')
+        if note:
+            parts.append(f'{path}:{line}: {note}\n')
+    parts.append(f'Found {errors_count} errors in {len(paths)} files\n')
+    return ''.join(parts)
+
+
+def generate_flake8_json(paths: List[str], errors_count: int) -> str:
+    """Generate `flake8 --format=json` output (`flake8-json` formatter)."""
+    errors_by_path: Dict[str, List[Dict[str, object]]] = {}
+    for index, (path, line) in enumerate(iter_locations(paths, errors_count)):
+        code, _, text = _FLAKE8_ERRORS[index % len(_FLAKE8_ERRORS)].partition(
+            ' '
+        )
+        errors_by_path.setdefault(path, []).append(
+            {
+                'code': code,
+                'filename': path,
+                'line_number': line,
+                'column_number': index % 80 + 1,
+                'text': text,
+                'physical_line': None,
+            }
+        )
+    return json.dumps(errors_by_path, indent=4) + '\n'
+
+
+def generate_pylint_json(paths: List[str], errors_count: int) -> str:
+    """Generate `pylint --output-format=json` output."""
+    errors = []
+    for index, (path, line) in enumerate(iter_locations(paths, errors_count)):
+        error = _PYLINT_ERRORS[index % len(_PYLINT_ERRORS)]
+        message_id, _, rest = error.partition(': ')
+        message, _, symbol = rest.rpartition(' (')
+        errors.append(
+            {
+                'type': 'convention',
+                'module': Path(path).stem,
+                'obj': '',
+                'line': line,
+                'column': index % 80,
+                'endLine': None,
+                'endColumn': None,
+                'path': path,
+                'symbol': symbol.rstrip(')'),
+                'message': message,
+                'message-id': message_id,
+            }
+        )
+    return json.dumps(errors, indent=4) + '\n'
+
+
+def generate_mypy_json(paths: List[str], errors_count: int) -> str:
+    """Generate `mypy -O json` output, notes are hints of errors."""
+    parts = []
+    for index, (path, line) in enumerate(iter_locations(paths, errors_count)):
+        error, note = _MYPY_ERRORS[index % len(_MYPY_ERRORS)]
+        _, _, error = error.partition('error: ')
+        message, _, code = error.rpartition('  [')
+        record = {
+            'file': path,
+            'line': line,
+            'column': 0,
+            'message': message,
+            'hint': note.partition('note: ')[2] if note else None,
+            'code': code.rstrip(']'),
+            'severity': 'error',
+        }
+        parts.append(json.dumps(record) + '\n')
+    return ''.join(parts)
+
+
+def generate_pydocstyle(paths: List[str], errors_count: int) -> str:
+    """Generate `pydocstyle` output, each error takes two lines."""
+    parts = []
+    for index, (path, line) in enumerate(iter_locations(paths, errors_count)):
+        place, error = _PYDOCSTYLE_ERRORS[index % len(_PYDOCSTYLE_ERRORS)]
+        place = place.format(line=line)
+        parts.append(f'{path}:{line} {place}:\n        {error}\n')
+    return ''.join(parts)
+
+
+def generate_black_diff(paths: List[str], errors_count: int) -> str:
+    """Generate `black --diff` output, each changed line is an error."""
+    return _generate_diff(
+        paths,
+        errors_count,
+        header='{path}\t2024-01-01 00:00:00.000000 +0000',
+        replace=('compute(', 'compute( '),
+    )
+
+
+def generate_isort_diff(paths: List[str], errors_count: int) -> str:
+    """Generate `isort --diff` output, each changed line is an error."""
+    return _generate_diff(
+        paths,
+        errors_count,
+        header='{path}:{version}\t2024-01-01 00:00:00.000000',
+        replace=('# noqa', '# noqa: E501'),
+    )
+
+
+def _generate_diff(
+    paths: List[str],
+    errors_count: int,
+    header: str,
+    replace: Tuple[str, str],
+) -> str:
+    """Generate unified diff with a hunk per changed line.
+
+    Each hunk has removed and added line, so it's reported as two errors.
+    """
+    parts = []
+    current_path = None
+    previous_line = 0
+    for path, line in iter_locations(paths, errors_count):
+        if path != current_path:
+            current_path = path
+            previous_line = 0
+            file_number = Path(path).stem.split('_')[-1]
+            old = header.format(path=path, version='before')
+            new = header.format(path=path, version='after')
+            parts.append(f'--- {old}\n+++ {new}\n')
+        if line == previous_line:
+            # Both errors of the line are already reported by the hunk
+            continue
+        previous_line = line
+        code = f'value_{line} = compute({file_number}, {line})  # noqa'
+        parts.append(
+            f'@@ -{line},1 +{line},1 @@\n'
+            f'-{code}\n'
+            f'+{code.replace(*replace)}\n'
+        )
+    return ''.join(parts)
+
+
+GENERATORS: Dict[str, Callable[[List[str], int], str]] = {
+    'flake8': generate_flake8,
+    'pylint': generate_pylint,
+    'mypy': generate_mypy,
+    'pydocstyle': generate_pydocstyle,
+    'black-diff': generate_black_diff,
+    'isort-diff': generate_isort_diff,
+    'flake8-json': generate_flake8_json,
+    'pylint-json': generate_pylint_json,
+    'mypy-json': generate_mypy_json,
+}
+"""Output generators by names of plugins parsing them."""
@@ -1,6 +1,10 @@
 """Universal flakehell replacement for almost any linter you like."""
 
-from linthell.cli import cli
 
-if __name__ == '__main__':
-    cli()
+def __getattr__(name: str) -> object:
+    # CLI is imported lazily, so `linthell.client` doesn't import commands
+    if name == 'cli':
+        from linthell.cli import cli
+
+        return cli
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
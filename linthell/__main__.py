@@ -1,6 +1,6 @@
 """Universal flakehell replacement for almost any linter you like."""
 
-from linthell.cli import cli
+from linthell.client import main
 
 if __name__ == '__main__':
-    cli()
+    main()
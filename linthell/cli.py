@@ -1,17 +1,31 @@
 """Main CLI module."""
 
 from configparser import ConfigParser
-from contextlib import suppress
+from pathlib import Path
 from typing import Optional, cast
 
 import click
 
-from linthell.commands.baseline import baseline_cli
-from linthell.commands.lint import lint_cli
+from linthell.commands.pre_commit.cli import pre_commit_cli
+from linthell.utils import timings
+from linthell.utils.click import LazyGroup
 from linthell.utils.config import create_config_dict
 
 
-@click.group()
+@click.group(
+    cls=LazyGroup,
+    # Only the invoked command is imported, every hook run pays for imports
+    lazy_commands={
+        'lint': 'linthell.commands.lint:lint_cli',
+        'baseline': 'linthell.commands.baseline:baseline_cli',
+        'run': 'linthell.commands.run:run_cli',
+        'migrate-baseline': (
+            'linthell.commands.migrate_baseline:migrate_baseline_cli'
+        ),
+        'gc-baseline': 'linthell.commands.gc_baseline:gc_baseline_cli',
+        'serve': 'linthell.commands.serve:serve_cli',
+    },
+)
 @click.option(
     '--config',
     'config_path',
@@ -23,8 +37,30 @@ from linthell.utils.config import create_config_dict
     ),
     type=click.Path(dir_okay=False),
 )
+@click.option(
+    '--timings',
+    'show_timings',
+    help=(
+        'Print time spent in each phase (reading input, running linter, '
+        'parsing, loading baseline, etc.) and counters to stderr.'
+    ),
+    is_flag=True,
+    envvar='LINTHELL_TIMINGS',
+)
+@click.option(
+    '--stats-json',
+    'stats_json_file',
+    help='Save time spent in each phase and counters into JSON file.',
+    type=click.Path(dir_okay=False),
+    envvar='LINTHELL_STATS_JSON',
+)
 @click.pass_context
-def cli(ctx: click.Context, config_path: Optional[str]) -> None:
+def cli(
+    ctx: click.Context,
+    config_path: Optional[str],
+    show_timings: bool,
+    stats_json_file: Optional[str],
+) -> None:
     """Universal flakehell replacement for almost any linter you like.
 
     The main concept of this tool is baseline file. It contains all errors
@@ -48,12 +84,22 @@ def cli(ctx: click.Context, config_path: Optional[str]) -> None:
     if config_path:
         config_parser = ConfigParser()
         config_parser.read(config_path)
-        ctx.default_map = create_config_dict(config_parser, command.commands)
+        ctx.default_map = create_config_dict(config_parser, command, ctx)
+    if show_timings or stats_json_file:
+        stats = timings.enable()
+        ctx.call_on_close(
+            lambda: _report_stats(stats, show_timings, stats_json_file)
+        )
+
 
+def _report_stats(
+    stats: timings.Stats, show_timings: bool, stats_json_file: Optional[str]
+) -> None:
+    """Print stats to stderr and save them into JSON file."""
+    if show_timings:
+        click.echo(stats.format(), err=True)
+    if stats_json_file:
+        timings.save_stats(stats, Path(stats_json_file))
 
-cli.add_command(lint_cli, 'lint')
-cli.add_command(baseline_cli, 'baseline')
-with suppress(ImportError):
-    from linthell.commands.pre_commit.cli import pre_commit_cli
 
-    cli.add_command(pre_commit_cli, 'pre-commit')
+cli.add_command(pre_commit_cli, 'pre-commit')
@@ -0,0 +1,205 @@
+"""Entry point of `linthell` script, thin client of `linthell serve`.
+
+`lint` and `pre-commit lint` commands are forwarded to the daemon if it's
+running: client passes its arguments, environment, working directory and
+standard streams (file descriptors) over Unix socket, daemon runs the command
+with warm caches and replies with exit code. Otherwise, and for other
+commands, CLI is imported and run in process as usual.
+
+Module imports only a few standard modules, so forwarded commands don't pay
+for importing click, commands and plugins.
+"""
+
+import array
+import os
+import socket
+import struct
+import sys
+from typing import List, Optional, Tuple
+
+DAEMON_ENV = 'LINTHELL_DAEMON'
+"""Set to `0` to never forward commands to `linthell serve`."""
+SOCKET_ENV = 'LINTHELL_SOCKET'
+"""Path of Unix socket of `linthell serve`."""
+PROTOCOL_VERSION = 1
+FORWARDED_COMMANDS = (('lint',), ('pre-commit', 'lint'))
+"""Command paths which are run by daemon."""
+
+ACCEPTED = b'\x01'
+REJECTED = b'\x00'
+LENGTH = struct.Struct('!I')
+EXIT_CODE = struct.Struct('!i')
+STDIO_FDS = (0, 1, 2)
+_GLOBAL_OPTIONS_WITH_VALUE = ('--config', '--stats-json')
+_ACCEPT_TIMEOUT = 5.0
+"""Seconds to wait for daemon to accept request, then it's run in process."""
+
+
+def main() -> None:
+    """Run command by daemon if it's running, in process otherwise."""
+    argv = sys.argv[1:]
+    if is_forwarded(argv):
+        exit_code = run_by_daemon(argv)
+        if exit_code is not None:
+            sys.exit(exit_code)
+    from linthell.cli import cli
+
+    cli()
+
+
+def is_forwarded(argv: List[str]) -> bool:
+    """Check if command can be run by daemon."""
+    if os.environ.get(DAEMON_ENV) == '0' or not _is_supported():
+        return False
+    return is_forwarded_command(argv)
+
+
+def is_forwarded_command(argv: List[str]) -> bool:
+    """Check if arguments run one of commands which daemon runs."""
+    command_path: List[str] = []
+    arguments = iter(argv)
+    for argument in arguments:
+        if argument == '--help':
+            return False
+        if argument in _GLOBAL_OPTIONS_WITH_VALUE:
+            next(arguments, None)
+        elif not argument.startswith('-'):
+            command_path.append(argument)
+            if len(command_path) == 2:
+                break
+    return tuple(command_path) in FORWARDED_COMMANDS or (
+        tuple(command_path[:1]) in FORWARDED_COMMANDS
+    )
+
+
+def get_socket_path() -> str:
+    """Get path of daemon socket.
+
+    Set by `LINTHELL_SOCKET` environment variable, by default it's inside
+    user runtime directory (or `linthell-<uid>` temporary directory).
+    """
+    socket_path = os.environ.get(SOCKET_ENV)
+    if socket_path:
+        return socket_path
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if not runtime_dir:
+        runtime_dir = os.path.join('/tmp', f'linthell-{os.getuid()}')
+    return os.path.join(runtime_dir, 'linthell.sock')
+
+
+def is_private_dir(path: str) -> bool:
+    """Check if directory is accessible by the current user only.
+
+    Socket of another user's daemon must not receive environment and
+    streams of commands.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o077
+
+
+def run_by_daemon(argv: List[str]) -> Optional[int]:
+    """Forward command to daemon.
+
+    :return: exit code of command, None if daemon isn't running or
+    rejected the request
+    """
+    socket_path = get_socket_path()
+    if not is_private_dir(os.path.dirname(socket_path) or '.'):
+        return None
+    request = encode_request(argv)
+    if request is None:
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with client:
+        try:
+            client.settimeout(_ACCEPT_TIMEOUT)
+            client.connect(socket_path)
+            client.sendmsg(
+                [LENGTH.pack(len(request)), request],
+                [
+                    (
+                        socket.SOL_SOCKET,
+                        socket.SCM_RIGHTS,
+                        array.array('i', STDIO_FDS),
+                    )
+                ],
+            )
+            if client.recv(1) != ACCEPTED:
+                return None
+        except OSError:
+            return None
+        # Command is run by daemon now, it can't be rerun in process
+        client.settimeout(None)
+        try:
+            exit_code = receive_exactly(client, EXIT_CODE.size)
+        except OSError:
+            exit_code = b''
+    if len(exit_code) != EXIT_CODE.size:
+        sys.stderr.write('linthell: daemon exited unexpectedly\n')
+        return 1
+    return int(EXIT_CODE.unpack(exit_code)[0])
+
+
+def encode_request(argv: List[str]) -> Optional[bytes]:
+    """Encode arguments, environment and working directory of command.
+
+    Request is a list of NUL separated strings: protocol version, working
+    directory, encoding and errors handler of each standard stream, count of
+    arguments, arguments and environment variables (`name=value`).
+
+    :return: request, None if standard streams can't be passed
+    """
+    fields = [str(PROTOCOL_VERSION), os.getcwd()]
+    for stream in (sys.stdin, sys.stdout, sys.stderr):
+        if stream is None:
+            return None
+        fields.extend((stream.encoding, stream.errors or 'strict'))
+    fields.append(str(len(argv)))
+    fields.extend(argv)
+    fields.extend(f'{name}={value}' for name, value in os.environ.items())
+    return b'\0'.join(os.fsencode(field) for field in fields)
+
+
+def decode_request(
+    request: bytes,
+) -> Tuple[str, List[Tuple[str, str]], List[str], List[Tuple[str, str]]]:
+    """Decode request encoded by `encode_request`.
+
+    :return: working directory, encoding and errors handler of standard
+    streams, arguments and environment variables
+    :raise ValueError: if request is invalid or of another protocol version
+    """
+    fields = [os.fsdecode(field) for field in request.split(b'\0')]
+    if fields[0] != str(PROTOCOL_VERSION):
+        raise ValueError(f'Unsupported protocol version {fields[0]}')
+    cwd = fields[1]
+    streams = [(fields[i], fields[i + 1]) for i in range(2, 8, 2)]
+    argv_end = 9 + int(fields[8])
+    argv = fields[9:argv_end]
+    environment = []
+    for variable in fields[argv_end:]:
+        name, separator, value = variable.partition('=')
+        if not separator:
+            raise ValueError(f'Invalid environment variable {variable!r}')
+        environment.append((name, value))
+    return cwd, streams, argv, environment
+
+
+def receive_exactly(connection: socket.socket, size: int) -> bytes:
+    """Receive size bytes, less only if connection is closed."""
+    parts = []
+    while size:
+        part = connection.recv(size)
+        if not part:
+            break
+        parts.append(part)
+        size -= len(part)
+    return b''.join(parts)
+
+
+def _is_supported() -> bool:
+    """Check if platform supports passing file descriptors over sockets."""
+    return hasattr(socket, 'AF_UNIX') and hasattr(socket, 'SCM_RIGHTS')
@@ -1,15 +1,24 @@
 """CLI that generates baseline file."""
 
-import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TextIO
 
 import click
 
-from linthell.plugins.base import get_available_plugins, load_plugin_by_name
+from linthell.plugins.base import load_plugin_by_name
 from linthell.plugins.regex import LinthellRegexPlugin
-from linthell.utils.baseline import generate_baseline, save_baseline
-from linthell.utils.click import Mutex
+from linthell.utils.baseline import (
+    DEFAULT_DIGEST_SCHEME,
+    BaselineFormatError,
+    generate_baseline_from_input,
+    get_baseline_format,
+    is_baseline_dir,
+    save_baseline,
+)
+from linthell.utils.baseline_db import is_database
+from linthell.utils.click import Mutex, PluginName
+from linthell.utils.id_lines import DIGEST_SCHEMES
+from linthell.utils.linter_input import LinterInput
 
 
 @click.command()
@@ -18,7 +27,7 @@ from linthell.utils.click import Mutex
     '-b',
     'baseline_file',
     type=click.Path(),
-    help='Path to baseline file with ignores.',
+    help='Path to baseline file (or directory of sharded one) with ignores.',
     required=True,
 )
 @click.option(
@@ -36,19 +45,97 @@ from linthell.utils.click import Mutex
     '-p',
     'plugin_name',
     help='Plugin to use.',
-    type=click.Choice(sorted(get_available_plugins().names)),
+    type=PluginName(),
     default=None,
     cls=Mutex,
     not_required_if=['lint_format'],
 )
+@click.option(
+    '--jobs',
+    '-j',
+    'jobs',
+    type=click.IntRange(min=1),
+    default=None,
+    help=(
+        'Count of processes to parse huge linter output in parallel. '
+        'Output is parsed serially by default or if plugin can not split it.'
+    ),
+)
+@click.option(
+    '--digest',
+    type=click.Choice(sorted(DIGEST_SCHEMES)),
+    help=(
+        'Digest scheme of baseline, baseline file with header is created. '
+        'Baseline without header (md5) is created by default, '
+        f'{DEFAULT_DIGEST_SCHEME.name} is used with --digests-only.'
+    ),
+    default=None,
+)
+@click.option(
+    '--digests-only',
+    is_flag=True,
+    help=(
+        'Store digests of errors instead of id lines. Baseline is smaller '
+        'and loads faster, but it can not be updated or migrated.'
+    ),
+    default=False,
+)
+@click.option(
+    '--sharded',
+    is_flag=True,
+    help=(
+        'Store baseline as directory of shards by file path, commands load '
+        'and write only shards they need. Existing directory is always '
+        'sharded.'
+    ),
+    default=False,
+    cls=Mutex,
+    not_required_if=['sqlite'],
+)
+@click.option(
+    '--sqlite',
+    is_flag=True,
+    help=(
+        'Store baseline as SQLite database indexed by digest and file path, '
+        'lint queries only errors of its run and updates replace entries of '
+        'updated files only. Existing database is always kept.'
+    ),
+    default=False,
+    cls=Mutex,
+    not_required_if=['sharded'],
+)
+@click.option(
+    '--input',
+    'input_file',
+    type=click.File('r'),
+    default='-',
+    help=(
+        'File with linter output, stdin by default. Regular files (and stdin '
+        'redirected from file) are memory mapped instead of read by chunks.'
+    ),
+)
 def baseline_cli(
     baseline_file: str,
     lint_format: Optional[str],
     plugin_name: Optional[str],
+    jobs: Optional[int],
+    digest: Optional[str],
+    digests_only: bool,
+    sharded: bool,
+    sqlite: bool,
+    input_file: TextIO,
 ) -> None:
     """Create baseline file from your linter output.
 
-    Linter output is provided via stdin.
+    Linter output is provided via stdin or `--input` file. With `--jobs` huge
+    output is split at error boundaries and parsed by several processes.
+
+    With `--sharded` baseline is a directory of shards by file path, only
+    shards with changed content are rewritten. With `--sqlite` baseline is
+    a database, text baseline stays the format to exchange baselines.
+
+    Use `linthell migrate-baseline` to convert existing baseline to another
+    format.
 
     Usage:
     $ <linter command> | linthell baseline
@@ -63,6 +150,17 @@ def baseline_cli(
             'Provide either lint_format or plugin_name',
         )
 
-    linter_output = sys.stdin.read()
-    id_lines = generate_baseline(linter_output, plugin)
-    save_baseline(Path(baseline_file), id_lines)
+    with LinterInput(input_file) as linter_input:
+        id_lines = generate_baseline_from_input(linter_input, plugin, jobs)
+    baseline_path = Path(baseline_file)
+    # Existing storage is kept unless another one is set explicitly
+    sqlite = sqlite or (not sharded and is_database(baseline_path))
+    sharded = sharded or (not sqlite and is_baseline_dir(baseline_path))
+    try:
+        save_baseline(
+            baseline_path,
+            id_lines,
+            get_baseline_format(digest, digests_only, sharded, sqlite),
+        )
+    except BaselineFormatError as error:
+        raise click.ClickException(str(error))
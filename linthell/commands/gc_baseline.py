@@ -0,0 +1,118 @@
+"""CLI that removes stale entries from baseline."""
+
+from pathlib import Path
+from typing import List, Optional, TextIO
+
+import click
+
+from linthell.plugins.base import load_plugin_by_name
+from linthell.plugins.regex import LinthellRegexPlugin
+from linthell.utils.baseline import (
+    BaselineFormatError,
+    gc_baseline,
+    generate_baseline_from_input,
+)
+from linthell.utils.click import Mutex, PluginName
+from linthell.utils.linter_input import LinterInput
+from linthell.utils.types import IdLine
+
+
+@click.command()
+@click.option(
+    '--baseline',
+    '-b',
+    'baseline_file',
+    type=click.Path(exists=True),
+    help='Path to baseline file (or directory of sharded one) with ignores.',
+    required=True,
+)
+@click.option(
+    '--lint-format',
+    '--format',
+    '-f',
+    'lint_format',
+    help='Regex to parse your linter output.',
+    default=None,
+    cls=Mutex,
+    not_required_if=['plugin_name'],
+)
+@click.option(
+    '--plugin-name',
+    '-p',
+    'plugin_name',
+    help='Plugin to use.',
+    type=PluginName(),
+    default=None,
+    cls=Mutex,
+    not_required_if=['lint_format'],
+)
+@click.option(
+    '--jobs',
+    '-j',
+    'jobs',
+    type=click.IntRange(min=1),
+    default=None,
+    help=(
+        'Count of processes to parse huge linter output in parallel. '
+        'Output is parsed serially by default or if plugin can not split it.'
+    ),
+)
+@click.option(
+    '--input',
+    'input_file',
+    type=click.File('r'),
+    default=None,
+    help=(
+        'File with output of linter run against all files (- for stdin), '
+        'entries of errors it does not report are removed too.'
+    ),
+)
+def gc_baseline_cli(
+    baseline_file: str,
+    lint_format: Optional[str],
+    plugin_name: Optional[str],
+    jobs: Optional[int],
+    input_file: Optional[TextIO],
+) -> None:
+    """Remove stale entries from baseline.
+
+    Entries of files which do not exist anymore are removed. With `--input`
+    entries of errors which linter does not report anymore are removed too.
+    Baseline is processed in a single pass and it is rewritten only if
+    entries are removed.
+
+    Baseline with digests only stores no paths, so it requires `--input`
+    (unless it is a database).
+
+    Usage:
+    $ linthell gc-baseline -b baseline.txt
+    $ flake8 . | linthell gc-baseline -b baseline.txt -p flake8 --input -
+    """
+    current_id_lines: Optional[List[IdLine]] = None
+    if input_file is not None:
+        if plugin_name:
+            plugin = load_plugin_by_name(plugin_name)
+        elif lint_format:
+            plugin = LinthellRegexPlugin(lint_format)
+        else:
+            raise click.BadOptionUsage(
+                'lint_format | plugin_name',
+                'Provide either lint_format or plugin_name with --input',
+            )
+        with LinterInput(input_file) as linter_input:
+            current_id_lines = generate_baseline_from_input(
+                linter_input, plugin, jobs
+            )
+    try:
+        report = gc_baseline(Path(baseline_file), current_id_lines)
+    except BaselineFormatError as error:
+        raise click.ClickException(str(error))
+    click.echo(
+        f'Removed {report.removed_entries} of {report.entries} entries: '
+        f'{report.missing_file_entries} of missing files, '
+        f'{report.stale_entries} not reported by linter.'
+    )
+    click.echo(
+        f'Baseline size: {report.size_before} -> {report.size_after} bytes, '
+        f'reclaimed {report.size_before - report.size_after} bytes.'
+    )
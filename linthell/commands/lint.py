@@ -2,15 +2,29 @@
 
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Container, Optional, TextIO, Union
 
 import click
 
-from linthell.plugins.base import get_available_plugins, load_plugin_by_name
+from linthell.plugins.base import load_plugin_by_name
 from linthell.plugins.regex import LinthellRegexPlugin
-from linthell.utils.baseline import get_digests_from_baseline
-from linthell.utils.click import Mutex
-from linthell.utils.lint import lint
+from linthell.utils import timings
+from linthell.utils.baseline import (
+    BaselineFormatError,
+    get_digests_from_baseline,
+)
+from linthell.utils.click import Mutex, PluginName
+from linthell.utils.git import GitError, get_diff_scope
+from linthell.utils.lint import (
+    get_digest_scheme,
+    iter_new_errors_by_digests,
+    print_errors,
+    print_new_errors,
+)
+from linthell.utils.linter_input import LinterInput
+from linthell.utils.nested_baselines import NestedBaselines
+from linthell.utils.parallel import is_splittable, iter_errors_with_digests
+from linthell.utils.types import Digest
 
 
 @click.command()
@@ -19,8 +33,23 @@ from linthell.utils.lint import lint
     '-b',
     'baseline_file',
     type=click.Path(),
-    help='Path to baseline file with ignores.',
-    required=True,
+    help='Path to baseline file (or directory of sharded one) with ignores.',
+    default=None,
+    cls=Mutex,
+    not_required_if=['baseline_name'],
+)
+@click.option(
+    '--baseline-name',
+    'baseline_name',
+    metavar='NAME',
+    help=(
+        'Monorepo mode: errors of each file are checked against the nearest '
+        'baseline named NAME among directories of the file (up to working '
+        'directory), paths inside baseline are relative to its directory.'
+    ),
+    default=None,
+    cls=Mutex,
+    not_required_if=['baseline_file'],
 )
 @click.option(
     '--lint-format',
@@ -37,13 +66,61 @@ from linthell.utils.lint import lint
     '-p',
     'plugin_name',
     help='Plugin to use.',
-    type=click.Choice(sorted(get_available_plugins().names)),
+    type=PluginName(),
     default=None,
     cls=Mutex,
     not_required_if=['lint_format'],
 )
+@click.option(
+    '--baseline-index/--no-baseline-index',
+    'use_baseline_index',
+    help=(
+        'Use binary index of baseline for fast loading, it is stored in '
+        'linthell cache directory. It is built on the first run and rebuilt '
+        'once baseline changes.'
+    ),
+    default=True,
+    show_default=True,
+)
+@click.option(
+    '--diff-base',
+    'diff_base',
+    metavar='REF',
+    help=(
+        'Git ref to compare working tree with, only errors on lines changed '
+        'since it are reported.'
+    ),
+)
+@click.option(
+    '--jobs',
+    '-j',
+    'jobs',
+    type=click.IntRange(min=1),
+    default=None,
+    help=(
+        'Count of processes to parse huge linter output in parallel. '
+        'Output is parsed serially by default or if plugin can not split it.'
+    ),
+)
+@click.option(
+    '--input',
+    'input_file',
+    type=click.File('r'),
+    default='-',
+    help=(
+        'File with linter output, stdin by default. Regular files (and stdin '
+        'redirected from file) are memory mapped instead of read by chunks.'
+    ),
+)
 def lint_cli(
-    baseline_file: str, lint_format: Optional[str], plugin_name: Optional[str]
+    baseline_file: Optional[str],
+    baseline_name: Optional[str],
+    lint_format: Optional[str],
+    plugin_name: Optional[str],
+    use_baseline_index: bool,
+    diff_base: Optional[str],
+    jobs: Optional[int],
+    input_file: TextIO,
 ) -> None:
     """Filter your linter output against baseline file.
 
@@ -52,10 +129,26 @@ def lint_cli(
     exits with code 0, otherwise it prints the whole match of format regex
     as error description for each unfiltered error and exists with code 1.
 
-    Linter output is provided via stdin.
+    Linter output is provided via stdin. It's processed by chunks, so new
+    errors are printed as soon as linter outputs them. Output saved to file
+    (`--input` or stdin redirected from file) is memory mapped, regex
+    plugins match it without decoding the whole output.
+
+    With `--diff-base` only errors on lines changed since git ref are
+    reported, other errors are dropped before baseline lookup.
+
+    With `--jobs` huge output is split at error boundaries, parsed and hashed
+    by several processes, errors are still printed in order of output.
+
+    With `--baseline-name` one linter run over monorepo is checked against
+    baselines of its subprojects, each error against the nearest baseline
+    up the directory tree of its file. Baselines are loaded only if they
+    have errors to check, output is parsed serially.
 
     Usage:
     $ <linter command> | linthell lint
+    $ <linter command> | linthell lint --diff-base origin/main
+    $ linthell lint --input <linter output file>
     """
     if plugin_name:
         plugin = load_plugin_by_name(plugin_name)
@@ -67,11 +160,57 @@ def lint_cli(
             'Provide either lint_format or plugin_name',
         )
 
-    linter_output = sys.stdin.read()
-    digests = get_digests_from_baseline(Path(baseline_file))
-    report = lint(digests, linter_output, plugin)
+    scope = None
+    if diff_base is not None:
+        try:
+            scope = get_diff_scope(diff_base)
+        except GitError as error:
+            raise click.BadParameter(str(error), param_hint='--diff-base')
 
-    if report.errors:
-        for error_message in report.errors:
-            print(error_message)
+    digests: Union[Container[Digest], NestedBaselines]
+    if baseline_name:
+        digests = NestedBaselines(baseline_name, use_index=use_baseline_index)
+    elif baseline_file:
+        try:
+            digests = get_digests_from_baseline(
+                Path(baseline_file), use_index=use_baseline_index
+            )
+        except BaselineFormatError as error:
+            raise click.ClickException(str(error))
+    else:
+        raise click.BadOptionUsage(
+            'baseline_file | baseline_name',
+            'Provide either baseline_file or baseline_name',
+        )
+    with LinterInput(input_file) as linter_input:
+        if (
+            jobs is not None
+            and jobs > 1
+            and is_splittable(plugin)
+            and not isinstance(digests, NestedBaselines)
+        ):
+            errors_with_digests = timings.timed(
+                'parse',
+                iter_errors_with_digests(
+                    linter_input.iter_chunks(),
+                    plugin,
+                    jobs,
+                    scope,
+                    scheme=get_digest_scheme(digests),
+                ),
+            )
+            new_errors = iter_new_errors_by_digests(
+                digests, errors_with_digests
+            )
+            has_new_errors = print_errors(new_errors)
+        else:
+            linter_errors = timings.timed(
+                'parse', linter_input.iter_parse(plugin, scope)
+            )
+            try:
+                has_new_errors = print_new_errors(digests, linter_errors)
+            except BaselineFormatError as error:
+                # Baselines of subprojects are loaded while linting
+                raise click.ClickException(str(error))
+    if has_new_errors:
         sys.exit(1)
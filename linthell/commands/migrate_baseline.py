@@ -0,0 +1,96 @@
+"""CLI that converts baseline file to another format."""
+
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from linthell.utils.baseline import (
+    DEFAULT_DIGEST_SCHEME,
+    BaselineFormatError,
+    get_baseline_format,
+    is_baseline_dir,
+    migrate_baseline,
+)
+from linthell.utils.baseline_db import is_database
+from linthell.utils.id_lines import DIGEST_SCHEMES
+
+
+@click.command()
+@click.option(
+    '--baseline',
+    '-b',
+    'baseline_file',
+    type=click.Path(exists=True),
+    help='Path to baseline file (or directory of sharded one) with ignores.',
+    required=True,
+)
+@click.option(
+    '--digest',
+    type=click.Choice(sorted(DIGEST_SCHEMES)),
+    help='Digest scheme of baseline.',
+    default=DEFAULT_DIGEST_SCHEME.name,
+    show_default=True,
+)
+@click.option(
+    '--digests-only',
+    is_flag=True,
+    help=(
+        'Store digests of errors instead of id lines. Baseline is smaller '
+        'and loads faster, but it can not be updated or migrated.'
+    ),
+    default=False,
+)
+@click.option(
+    '--sharded/--single-file',
+    help=(
+        'Convert baseline file to directory of shards by file path '
+        'or vice versa. [default: keep layout]'
+    ),
+    default=None,
+)
+@click.option(
+    '--sqlite/--text',
+    help=(
+        'Convert baseline to SQLite database or back to text baseline, '
+        'the format to exchange baselines. [default: keep storage]'
+    ),
+    default=None,
+)
+def migrate_baseline_cli(
+    baseline_file: str,
+    digest: Optional[str],
+    digests_only: bool,
+    sharded: Optional[bool],
+    sqlite: Optional[bool],
+) -> None:
+    """Convert baseline file to the latest format.
+
+    Baseline file gets a header with format version and digest scheme, so
+    `lint` detects format automatically. Baseline with digests only can not
+    be converted, generate it again instead.
+
+    With `--sharded` baseline file is replaced with directory of shards,
+    `--single-file` converts it back. With `--sqlite` baseline is replaced
+    with database, `--text` converts it back.
+
+    Usage:
+    $ linthell migrate-baseline -b baseline.txt
+    $ linthell migrate-baseline -b baseline.txt --digests-only
+    $ linthell migrate-baseline -b baseline.txt --sharded
+    $ linthell migrate-baseline -b baseline.db --text
+    """
+    baseline_path = Path(baseline_file)
+    if sharded and sqlite:
+        raise click.UsageError('--sharded and --sqlite can not be combined')
+    if sqlite is None:
+        sqlite = not sharded and is_database(baseline_path)
+    if sharded is None:
+        sharded = not sqlite and is_baseline_dir(baseline_path)
+    baseline_format = get_baseline_format(
+        digest, digests_only, sharded, sqlite
+    )
+    try:
+        migrate_baseline(baseline_path, baseline_format)
+    except BaselineFormatError as error:
+        raise click.ClickException(str(error))
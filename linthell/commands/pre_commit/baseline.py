@@ -1,17 +1,32 @@
 """Baseline CLI with pre-commit integration."""
 
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 
 import click
 from typing_extensions import Literal
 
-from linthell.commands.baseline import generate_baseline, save_baseline
-from linthell.plugins.base import get_available_plugins, load_plugin_by_name
+from linthell.plugins.base import load_plugin_by_name
 from linthell.plugins.regex import LinthellRegexPlugin
-from linthell.utils.click import Mutex
-from linthell.utils.linters import run_linter_and_get_output
-from linthell.utils.pre_commit import get_all_files_by_hook
+from linthell.utils.baseline import (
+    DEFAULT_DIGEST_SCHEME,
+    BaselineFormatError,
+    get_baseline_format,
+    is_baseline_dir,
+    load_baseline,
+    read_baseline_format,
+    save_baseline,
+    update_baseline,
+)
+from linthell.utils.baseline_db import is_database
+from linthell.utils.click import Mutex, PluginName
+from linthell.utils.git import GitError, get_changed_files
+from linthell.utils.id_lines import DIGEST_SCHEMES
+from linthell.utils.linters import get_linter_errors
+from linthell.utils.path import normalize_path
+from linthell.utils.pre_commit import get_all_files_by_hook, get_files_by_hook
+from linthell.utils.results_cache import DEFAULT_MAX_SIZE, ResultsCache
+from linthell.utils.types import LinterError
 
 
 @click.command()
@@ -20,7 +35,7 @@ from linthell.utils.pre_commit import get_all_files_by_hook
     '-b',
     'baseline_file',
     type=click.Path(),
-    help='Path to baseline file with ignores.',
+    help='Path to baseline file (or directory of sharded one) with ignores.',
     required=True,
 )
 @click.option(
@@ -38,7 +53,7 @@ from linthell.utils.pre_commit import get_all_files_by_hook
     '-p',
     'plugin_name',
     help='Plugin to use.',
-    type=click.Choice(sorted(get_available_plugins().names)),
+    type=PluginName(),
     default=None,
     cls=Mutex,
     not_required_if=['lint_format'],
@@ -56,19 +71,157 @@ from linthell.utils.pre_commit import get_all_files_by_hook
     default='stdout',
     show_default=True,
 )
+@click.option(
+    '--linter-jobs',
+    type=click.IntRange(min=1),
+    help=(
+        'Count of linter processes to run in parallel, each one lints '
+        'its own chunk of files. [default: CPU count]'
+    ),
+    default=None,
+)
+@click.option(
+    '--whole-program',
+    is_flag=True,
+    help=(
+        'Run linter once against all files instead of chunks. Required '
+        'for linters which analyze files together, enabled automatically '
+        'for such plugins (mypy).'
+    ),
+    default=False,
+)
+@click.option(
+    '--cache/--no-cache',
+    'use_cache',
+    help=(
+        'Cache parsed linter errors per file. Only files changed since '
+        'the last run are linted, cache is invalidated by changes of linter '
+        'command, plugin and linter config files.'
+    ),
+    default=False,
+    show_default=True,
+)
+@click.option(
+    '--cache-dir',
+    type=click.Path(file_okay=False),
+    help=(
+        'Directory of linthell cache. '
+        '[default: $LINTHELL_CACHE_DIR or user cache directory]'
+    ),
+    default=None,
+)
+@click.option(
+    '--cache-max-size',
+    type=click.IntRange(min=0),
+    help='Max size of cache in MiB, least recently used entries are evicted.',
+    default=DEFAULT_MAX_SIZE // 2**20,
+    show_default=True,
+)
+@click.option(
+    '--linter-config',
+    'linter_config_files',
+    type=click.Path(dir_okay=False),
+    multiple=True,
+    help=(
+        'Linter config file, changes of it invalidate cache. Common config '
+        'files (setup.cfg, pyproject.toml, etc.) are always checked.'
+    ),
+)
+@click.option(
+    '--digest',
+    type=click.Choice(sorted(DIGEST_SCHEMES)),
+    help=(
+        'Digest scheme of baseline, baseline file with header is created. '
+        'Baseline without header (md5) is created by default, '
+        f'{DEFAULT_DIGEST_SCHEME.name} is used with --digests-only.'
+    ),
+    default=None,
+)
+@click.option(
+    '--digests-only',
+    is_flag=True,
+    help=(
+        'Store digests of errors instead of id lines. Baseline is smaller '
+        'and loads faster, but it can not be updated or migrated.'
+    ),
+    default=False,
+)
+@click.option(
+    '--sharded',
+    is_flag=True,
+    help=(
+        'Store baseline as directory of shards by file path, commands load '
+        'and write only shards they need. Existing directory is always '
+        'sharded.'
+    ),
+    default=False,
+    cls=Mutex,
+    not_required_if=['sqlite'],
+)
+@click.option(
+    '--sqlite',
+    is_flag=True,
+    help=(
+        'Store baseline as SQLite database indexed by digest and file path, '
+        'lint queries only errors of its run and updates replace entries of '
+        'updated files only. Existing database is always kept.'
+    ),
+    default=False,
+    cls=Mutex,
+    not_required_if=['sharded'],
+)
 @click.option(
     '--hook-name',
     type=click.STRING,
     help='Update baseline based on all files from pre-commit hook',
     required=True,
 )
+@click.option(
+    '--hook-cache/--no-hook-cache',
+    'use_hook_cache',
+    help=(
+        'Cache files of pre-commit hooks until pre-commit config or git '
+        'index changes, so hooks are not resolved on every run.'
+    ),
+    default=True,
+    show_default=True,
+)
+@click.option(
+    '--update',
+    is_flag=True,
+    help=(
+        'Update baseline only for provided files and files changed since '
+        '--since ref, entries of other files are kept untouched.'
+    ),
+)
+@click.option(
+    '--since',
+    'since_ref',
+    metavar='REF',
+    help='Git ref, files changed since it are updated. Requires --update.',
+)
+@click.argument('files', nargs=-1, type=click.Path())
 def baseline_cli(
     baseline_file: str,
     lint_format: Optional[str],
     plugin_name: Optional[str],
     linter_command: str,
     linter_output: Literal['stdout', 'stderr'],
+    linter_jobs: Optional[int],
+    whole_program: bool,
+    use_cache: bool,
+    cache_dir: Optional[str],
+    cache_max_size: int,
+    linter_config_files: Tuple[str, ...],
+    digest: Optional[str],
+    digests_only: bool,
+    sharded: bool,
+    sqlite: bool,
     hook_name: str,
+    use_hook_cache: bool,
+    update: bool,
+    since_ref: Optional[str],
+    files: Tuple[str, ...],
 ) -> None:
     """Linthell baseline command for pre-commit workflow.
 
@@ -78,8 +231,21 @@ def baseline_cli(
     - Executes linter command embedded, so you can set it inside linthell
     config file.
 
+    With `--update` only provided files and files changed since `--since`
+    ref are linted. Their entries in baseline are replaced (errors of deleted
+    files and fixed errors are removed), other entries are kept untouched.
+    Format of baseline is kept unless it's set explicitly. Only shards of
+    updated files are loaded and written if baseline is sharded. Entries of
+    updated files are replaced in a single transaction if baseline is SQLite
+    database, other entries aren't loaded.
+
+    Files of hooks are cached until pre-commit config or git index changes,
+    see `--hook-cache`.
+
     Usage:
     $ linthell pre-commit baseline --hook-name <linthell hook name>
+    $ linthell pre-commit baseline --hook-name <hook name> --update <files>
+    $ linthell pre-commit baseline --hook-name <hook> --update --since main
     """
     if plugin_name:
         plugin = load_plugin_by_name(plugin_name)
@@ -91,8 +257,100 @@ def baseline_cli(
             'Provide either lint_format or plugin_name',
         )
 
-    files = get_all_files_by_hook('.pre-commit-config.yaml', hook_name)
-    output = run_linter_and_get_output(linter_command, files, linter_output)
+    if not update and (files or since_ref):
+        raise click.UsageError('Files and --since require --update')
+    if update and not files and since_ref is None:
+        raise click.UsageError('Provide files or --since ref to update')
 
-    id_lines = generate_baseline(output, plugin)
-    save_baseline(Path(baseline_file), id_lines)
+    updated_files = set(files)
+    if since_ref is not None:
+        try:
+            updated_files.update(get_changed_files(since_ref))
+        except GitError as error:
+            raise click.BadParameter(str(error), param_hint='--since')
+    cache_path = Path(cache_dir) if cache_dir else None
+    try:
+        if update:
+            # Deleted files and files not handled by hook are not linted, but
+            # their entries are still removed from baseline
+            files = get_files_by_hook(
+                '.pre-commit-config.yaml',
+                hook_name,
+                sorted(updated_files),
+                use_cache=use_hook_cache,
+                cache_dir=cache_path,
+            )
+        else:
+            files = get_all_files_by_hook(
+                '.pre-commit-config.yaml',
+                hook_name,
+                use_cache=use_hook_cache,
+                cache_dir=cache_path,
+            )
+    except ModuleNotFoundError as error:
+        # pre-commit is optional, it's imported only to resolve hooks
+        if (error.name or '').partition('.')[0] != 'pre_commit':
+            raise
+        raise click.UsageError(
+            'pre-commit package is not installed, install it in the same '
+            'environment as linthell (poetry install --with pre-commit)'
+        ) from error
+    cache = None
+    if use_cache:
+        cache = ResultsCache.for_linter(
+            linter_command,
+            linter_output,
+            plugin,
+            cache_dir=cache_path,
+            max_size=cache_max_size * 2**20,
+            config_files=linter_config_files,
+        )
+    linter_errors: Iterable[LinterError] = []
+    if files or not update:
+        linter_errors = get_linter_errors(
+            linter_command,
+            files,
+            linter_output,
+            plugin,
+            jobs=linter_jobs,
+            whole_program=whole_program or plugin.whole_program,
+            cache=cache,
+        )
+
+    baseline_path = Path(baseline_file)
+    # Existing storage is kept unless another one is set explicitly
+    sqlite = sqlite or (not sharded and is_database(baseline_path))
+    sharded = sharded or (not sqlite and is_baseline_dir(baseline_path))
+    baseline_format = get_baseline_format(
+        digest, digests_only, sharded, sqlite
+    )
+    # Shards to load and save, None for the whole baseline
+    shard_paths = None
+    if update:
+        existing_id_lines = []
+        updated_paths = {normalize_path(Path(file)) for file in updated_files}
+        try:
+            # Other directories are rejected once baseline is saved
+            if baseline_path.is_file() or is_baseline_dir(baseline_path):
+                existing_format = read_baseline_format(baseline_path)
+                if digest is None and not digests_only:
+                    baseline_format = existing_format
+                if baseline_format == existing_format:
+                    shard_paths = updated_paths
+                # Database replaces entries of updated files by itself,
+                # so they aren't loaded (baseline may store digests only)
+                if not (baseline_format.sqlite and shard_paths is not None):
+                    existing_id_lines = load_baseline(
+                        baseline_path, shard_paths
+                    )
+        except BaselineFormatError as error:
+            raise click.ClickException(str(error))
+        id_lines = update_baseline(
+            existing_id_lines, linter_errors, updated_paths
+        )
+    else:
+        id_lines = [linter_error.id_line for linter_error in linter_errors]
+    try:
+        save_baseline(baseline_path, id_lines, baseline_format, shard_paths)
+    except BaselineFormatError as error:
+        raise click.ClickException(str(error))
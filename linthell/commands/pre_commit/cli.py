@@ -2,15 +2,16 @@
 
 import click
 
-from linthell.commands.pre_commit.baseline import baseline_cli
-from linthell.commands.pre_commit.lint import lint_cli
+from linthell.utils.click import LazyGroup
 
 
-@click.group()
+@click.group(
+    cls=LazyGroup,
+    lazy_commands={
+        'lint': 'linthell.commands.pre_commit.lint:lint_cli',
+        'baseline': 'linthell.commands.pre_commit.baseline:baseline_cli',
+    },
+)
 def pre_commit_cli():
     """Commands for pre-commit integration."""
     pass
-
-
-pre_commit_cli.add_command(lint_cli, 'lint')
-pre_commit_cli.add_command(baseline_cli, 'baseline')
@@ -1,17 +1,27 @@
 """Lint CLI with pre-commit integration."""
 
 import sys
+from contextlib import closing
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Container, Optional, Tuple, Union
 
 import click
 from typing_extensions import Literal
 
-from linthell.commands.lint import get_digests_from_baseline, lint
-from linthell.plugins.base import get_available_plugins, load_plugin_by_name
+from linthell.plugins.base import load_plugin_by_name
 from linthell.plugins.regex import LinthellRegexPlugin
-from linthell.utils.click import Mutex
-from linthell.utils.linters import run_linter_and_get_output
+from linthell.utils.baseline import (
+    BaselineFormatError,
+    get_digests_from_baseline,
+)
+from linthell.utils.click import Mutex, PluginName
+from linthell.utils.git import GitError, get_diff_scope
+from linthell.utils.lint import print_new_errors
+from linthell.utils.linters import get_linter_errors
+from linthell.utils.nested_baselines import NestedBaselines
+from linthell.utils.path import normalize_path
+from linthell.utils.results_cache import DEFAULT_MAX_SIZE, ResultsCache
+from linthell.utils.types import Digest
 
 
 @click.command()
@@ -20,8 +30,23 @@ from linthell.utils.linters import run_linter_and_get_output
     '-b',
     'baseline_file',
     type=click.Path(),
-    help='Path to baseline file with ignores.',
-    required=True,
+    help='Path to baseline file (or directory of sharded one) with ignores.',
+    default=None,
+    cls=Mutex,
+    not_required_if=['baseline_name'],
+)
+@click.option(
+    '--baseline-name',
+    'baseline_name',
+    metavar='NAME',
+    help=(
+        'Monorepo mode: errors of each file are checked against the nearest '
+        'baseline named NAME among directories of the file (up to working '
+        'directory), paths inside baseline are relative to its directory.'
+    ),
+    default=None,
+    cls=Mutex,
+    not_required_if=['baseline_file'],
 )
 @click.option(
     '--lint-format',
@@ -38,7 +63,7 @@ from linthell.utils.linters import run_linter_and_get_output
     '-p',
     'plugin_name',
     help='Plugin to use.',
-    type=click.Choice(sorted(get_available_plugins().names)),
+    type=PluginName(),
     default=None,
     cls=Mutex,
     not_required_if=['lint_format'],
@@ -56,13 +81,115 @@ from linthell.utils.linters import run_linter_and_get_output
     default='stdout',
     show_default=True,
 )
+@click.option(
+    '--linter-jobs',
+    type=click.IntRange(min=1),
+    help=(
+        'Count of linter processes to run in parallel, each one lints '
+        'its own chunk of files. [default: CPU count]'
+    ),
+    default=None,
+)
+@click.option(
+    '--whole-program',
+    is_flag=True,
+    help=(
+        'Run linter once against all files instead of chunks. Required '
+        'for linters which analyze files together, enabled automatically '
+        'for such plugins (mypy).'
+    ),
+    default=False,
+)
+@click.option(
+    '--cache/--no-cache',
+    'use_cache',
+    help=(
+        'Cache parsed linter errors per file. Only files changed since '
+        'the last run are linted, cache is invalidated by changes of linter '
+        'command, plugin and linter config files.'
+    ),
+    default=False,
+    show_default=True,
+)
+@click.option(
+    '--cache-dir',
+    type=click.Path(file_okay=False),
+    help=(
+        'Directory of linthell cache. '
+        '[default: $LINTHELL_CACHE_DIR or user cache directory]'
+    ),
+    default=None,
+)
+@click.option(
+    '--cache-max-size',
+    type=click.IntRange(min=0),
+    help='Max size of cache in MiB, least recently used entries are evicted.',
+    default=DEFAULT_MAX_SIZE // 2**20,
+    show_default=True,
+)
+@click.option(
+    '--linter-config',
+    'linter_config_files',
+    type=click.Path(dir_okay=False),
+    multiple=True,
+    help=(
+        'Linter config file, changes of it invalidate cache. Common config '
+        'files (setup.cfg, pyproject.toml, etc.) are always checked.'
+    ),
+)
+@click.option(
+    '--baseline-index/--no-baseline-index',
+    'use_baseline_index',
+    help=(
+        'Use binary index of baseline for fast loading, it is stored in '
+        'linthell cache directory. It is built on the first run and rebuilt '
+        'once baseline changes.'
+    ),
+    default=True,
+    show_default=True,
+)
+@click.option(
+    '--diff-base',
+    'diff_base',
+    metavar='REF',
+    help=(
+        'Git ref to compare working tree with, only errors on lines changed '
+        'since it are reported.'
+    ),
+)
+@click.option(
+    '--max-new-errors',
+    type=click.IntRange(min=1),
+    help=(
+        'Stop once this count of new errors is reported, linters which are '
+        'still running are killed.'
+    ),
+    default=None,
+)
+@click.option(
+    '--fail-fast',
+    is_flag=True,
+    help='Stop on the first new error, same as --max-new-errors 1.',
+    default=False,
+)
 @click.argument('files', nargs=-1, type=click.Path())
 def lint_cli(
-    baseline_file: str,
+    baseline_file: Optional[str],
+    baseline_name: Optional[str],
     lint_format: Optional[str],
     plugin_name: Optional[str],
     linter_command: str,
     linter_output: Literal['stdout', 'stderr'],
+    linter_jobs: Optional[int],
+    whole_program: bool,
+    use_cache: bool,
+    cache_dir: Optional[str],
+    cache_max_size: int,
+    linter_config_files: Tuple[str, ...],
+    use_baseline_index: bool,
+    diff_base: Optional[str],
+    max_new_errors: Optional[int],
+    fail_fast: bool,
     files: Tuple[str, ...],
 ) -> None:
     """Linthell lint command for pre-commit workflow.
@@ -90,6 +217,18 @@ def lint_cli(
     inside it. For example, pylint with poetry as venv manager can be launched
     via `entrypoint: poetry run pylint ...`.
 
+    With `--diff-base` linter is executed only against files changed since
+    git ref and only errors on changed lines are reported.
+
+    Linter output is parsed as soon as linter prints it. With
+    `--max-new-errors` (or `--fail-fast`) linting is stopped once enough new
+    errors are reported, so hook fails without waiting for the whole linter
+    run.
+
+    With `--baseline-name` a single hook lints all subprojects of monorepo,
+    errors are checked against the nearest baseline up the directory tree
+    of their files, see `linthell lint`.
+
     Usage:
     Create a pre-commit hook with entry like: `linthell pre-commit lint`.
     """
@@ -103,11 +242,74 @@ def lint_cli(
             'Provide either lint_format or plugin_name',
         )
 
-    output = run_linter_and_get_output(linter_command, files, linter_output)
+    scope = None
+    if diff_base is not None:
+        try:
+            scope = get_diff_scope(diff_base)
+        except GitError as error:
+            raise click.BadParameter(str(error), param_hint='--diff-base')
+        changed_files = set(scope.files)
+        scoped_files = tuple(
+            file
+            for file in files
+            if normalize_path(Path(file)) in changed_files
+        )
+        if files and not scoped_files:
+            return
+        files = scoped_files
+
+    cache = None
+    if use_cache:
+        cache = ResultsCache.for_linter(
+            linter_command,
+            linter_output,
+            plugin,
+            cache_dir=Path(cache_dir) if cache_dir else None,
+            max_size=cache_max_size * 2**20,
+            config_files=linter_config_files,
+        )
+    linter_errors = get_linter_errors(
+        linter_command,
+        files,
+        linter_output,
+        plugin,
+        jobs=linter_jobs,
+        whole_program=whole_program or plugin.whole_program,
+        cache=cache,
+        scope=scope,
+    )
 
-    digests = get_digests_from_baseline(Path(baseline_file))
-    report = lint(digests, output, plugin)
-    if report.errors:
-        for error_message in report.errors:
-            print(error_message)
+    digests: Union[Container[Digest], NestedBaselines]
+    if baseline_name:
+        digests = NestedBaselines(baseline_name, use_index=use_baseline_index)
+    elif baseline_file:
+        try:
+            digests = get_digests_from_baseline(
+                Path(baseline_file), use_index=use_baseline_index
+            )
+        except BaselineFormatError as error:
+            raise click.ClickException(str(error))
+    else:
+        raise click.BadOptionUsage(
+            'baseline_file | baseline_name',
+            'Provide either baseline_file or baseline_name',
+        )
+    if fail_fast:
+        max_new_errors = 1
+    # Closing stops linters which are still running
+    with closing(linter_errors):
+        try:
+            new_errors_count = print_new_errors(
+                digests, linter_errors, max_new_errors
+            )
+        except BaselineFormatError as error:
+            # Baselines of subprojects are loaded while linting
+            raise click.ClickException(str(error))
+    if new_errors_count:
+        if new_errors_count == max_new_errors:
+            click.echo(
+                f'Linting is stopped after {new_errors_count} new errors, '
+                'other errors may be not reported',
+                err=True,
+            )
         sys.exit(1)
@@ -0,0 +1,84 @@
+"""CLI that runs several linters concurrently and lints their outputs."""
+
+import sys
+from typing import Tuple
+
+import click
+
+from linthell.utils.config import read_linter_sections
+from linthell.utils.runner import LinterConfig, run_linters
+
+
+@click.command()
+@click.option(
+    '--linter',
+    'linter_names',
+    multiple=True,
+    help='Name of linter to run. [default: all linters from config file]',
+)
+@click.option(
+    '--baseline-index/--no-baseline-index',
+    'use_baseline_index',
+    help=(
+        'Use binary index of baseline for fast loading, it is stored in '
+        'linthell cache directory. It is built on the first run and rebuilt '
+        'once baseline changes.'
+    ),
+    default=True,
+    show_default=True,
+)
+@click.argument('files', nargs=-1, type=click.Path())
+@click.pass_context
+def run_cli(
+    ctx: click.Context,
+    linter_names: Tuple[str, ...],
+    use_baseline_index: bool,
+    files: Tuple[str, ...],
+) -> None:
+    """Run several linters concurrently and lint their outputs.
+
+    Linters are declared in config file (see `linthell --config`), one
+    section per linter: `[run:<linter name>]`. Keys are `linter_command`,
+    `baseline_file`, `plugin_name` or `lint_format` and `linter_output`
+    (stdout by default). Files are appended to each linter command.
+
+    All linters are started at once, output of each one is linted against
+    its own baseline. New errors are printed grouped by linter after
+    `[<linter name>]` line, exit code is 1 if any linter has new errors.
+
+    Usage:
+    $ linthell --config linthell.ini run
+    """
+    config_path = ctx.find_root().params.get('config_path')
+    sections = read_linter_sections(config_path) if config_path else {}
+    if not sections:
+        raise click.UsageError(
+            'No linters declared, add [run:<linter name>] sections '
+            'to config file'
+        )
+    unknown_names = set(linter_names) - set(sections)
+    if unknown_names:
+        raise click.BadOptionUsage(
+            'linter_names', f'Unknown linters: {", ".join(unknown_names)}'
+        )
+
+    try:
+        linters = [
+            LinterConfig.from_section(name, section)
+            for name, section in sections.items()
+            if not linter_names or name in linter_names
+        ]
+        reports = run_linters(linters, files, use_baseline_index)
+    except ValueError as error:
+        raise click.ClickException(str(error))
+
+    has_errors = False
+    for report in reports:
+        if not report.errors:
+            continue
+        has_errors = True
+        print(f'[{report.name}]')
+        for error_message in report.errors:
+            print(error_message)
+    if has_errors:
+        sys.exit(1)
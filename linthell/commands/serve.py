@@ -0,0 +1,47 @@
+"""CLI that runs daemon serving hook commands with warm caches."""
+
+from typing import Optional
+
+import click
+
+from linthell.client import SOCKET_ENV, get_socket_path
+from linthell.utils.daemon import DaemonError, serve
+
+
+@click.command()
+@click.option(
+    '--socket',
+    'socket_path',
+    type=click.Path(dir_okay=False),
+    envvar=SOCKET_ENV,
+    help=(
+        'Path of Unix socket, its directory must be accessible by the '
+        'current user only. Clients find it by the same environment '
+        f'variable. [default: ${SOCKET_ENV} or linthell.sock inside '
+        '$XDG_RUNTIME_DIR or /tmp/linthell-<uid>]'
+    ),
+    default=None,
+)
+@click.pass_context
+def serve_cli(ctx: click.Context, socket_path: Optional[str]) -> None:
+    """Run daemon which runs `lint` and `pre-commit lint` commands.
+
+    Daemon keeps imported modules, plugins and loaded baselines in memory,
+    baselines are reloaded once their files change. `linthell lint` and
+    `linthell pre-commit lint` forward their arguments, environment and
+    standard streams to daemon if it's running and fall back to running
+    in process otherwise. Each command is run by a forked process, so
+    commands run in parallel. Set `LINTHELL_DAEMON=0` to disable forwarding.
+
+    Daemon runs commands with plugins installed into its own environment.
+
+    Usage:
+    $ linthell serve &
+    $ git commit  # pre-commit hooks are run by daemon
+    """
+    socket_path = socket_path or get_socket_path()
+    click.echo(f'Serving on {socket_path}', err=True)
+    try:
+        serve(ctx.find_root().command, socket_path)
+    except DaemonError as error:
+        raise click.ClickException(str(error))
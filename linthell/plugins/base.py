@@ -1,35 +1,181 @@
 import abc
+import hashlib
+import json
+import mmap
+import os
 import sys
-from typing import List, cast
-
-if sys.version_info < (3, 10):
-    from importlib_metadata import EntryPoints, entry_points
-else:
-    from importlib.metadata import EntryPoints, entry_points
+from contextlib import suppress
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    cast,
+)
 
+from linthell.utils.cache import get_cache_dir
+from linthell.utils.diff_scope import DiffScope
+from linthell.utils.path import write_atomic
 from linthell.utils.types import LinterError
 
+if TYPE_CHECKING:
+    if sys.version_info < (3, 10):
+        from importlib_metadata import EntryPoints
+    else:
+        from importlib.metadata import EntryPoints
+
+PLUGINS_GROUP = 'linthell.plugins'
+PLUGINS_CACHE_ENV = 'LINTHELL_PLUGINS_CACHE'
+"""Set to `0` to disable on-disk cache of available plugins."""
+_PLUGINS_CACHE_FILE = 'plugins.json'
+
 
 class LinthellPlugin(abc.ABC):
     """Linthell plugin base class."""
 
+    whole_program: bool = False
+    """Linter analyzes all files together, so it can't lint chunks of files.
+
+    Such linters are executed once against all files in pre-commit commands.
+    """
+
     @abc.abstractmethod
     def parse(self, linter_output: str) -> List[LinterError]:
         """Parse linter output to list of linter errors."""
         ...
 
+    def iter_parse(self, chunks: Iterable[str]) -> Iterator[LinterError]:
+        """Parse linter output provided by chunks, yield errors lazily.
+
+        Chunks can be split at any position of linter output. Empty chunk
+        means that source is idle, streaming parsers may yield errors they
+        hold back if the next line can't change them. Default implementation
+        collects the whole output and calls `parse`, override it to process
+        large outputs with constant memory.
+        """
+        yield from self.parse(''.join(chunks))
+
+    def find_record_boundary(
+        self, linter_output: str, position: int
+    ) -> Optional[int]:
+        """Find start of the first record at or after position.
+
+        Used to split linter output into parts parsed in parallel: records
+        before boundary must be complete and parts must be parsed to the
+        same errors as the whole output. Default implementation doesn't
+        support splitting.
+
+        :param linter_output: part of linter output, may end in the middle
+        of a record
+        :param position: position to search boundary from
+        :return: position of boundary, None if there is no safe boundary
+        """
+        return None
+
+    def iter_parse_in_scope(
+        self, chunks: Iterable[str], scope: DiffScope
+    ) -> Iterator[LinterError]:
+        """Parse linter output by chunks, yield errors inside scope only.
+
+        Default implementation filters errors of `iter_parse` by their path
+        and line, override it to skip errors before building their id lines.
+        """
+        for linter_error in self.iter_parse(chunks):
+            if scope.contains(linter_error.path, linter_error.line):
+                yield linter_error
+
+    def iter_parse_buffer(
+        self, buffer: mmap.mmap, scope: Optional[DiffScope] = None
+    ) -> Optional[Iterator[LinterError]]:
+        """Parse memory mapped linter output without decoding it as whole.
+
+        Buffer contains UTF-8 encoded output with LF line breaks, plugin
+        decodes only the parts it needs. Errors may keep reference to buffer
+        until their messages are accessed. Default implementation doesn't
+        support buffers.
+
+        :param buffer: the whole linter output
+        :param scope: if provided, only errors inside it are yielded
+        :return: iterator of errors, None if plugin can't parse the buffer,
+        then output is parsed by chunks of text
+        """
+        return None
 
-def get_available_plugins() -> EntryPoints:
-    """Get available linthell plugins."""
-    plugins = cast(EntryPoints, entry_points(group='linthell.plugins'))
+
+@lru_cache(maxsize=None)
+def get_available_plugins() -> 'EntryPoints':
+    """Get available linthell plugins.
+
+    Entry points of all installed distributions are scanned once per process.
+    """
+    if sys.version_info < (3, 10):
+        from importlib_metadata import EntryPoints, entry_points
+    else:
+        from importlib.metadata import EntryPoints, entry_points
+
+    plugins = cast(EntryPoints, entry_points(group=PLUGINS_GROUP))
     return plugins
 
 
+@lru_cache(maxsize=None)
+def get_plugin_references() -> Dict[str, str]:
+    """Get object references (`module:attr`) of plugins by their names.
+
+    Result is cached on disk until packages are installed or removed
+    (`sys.path` directories are modified), so usually installed distributions
+    aren't scanned at all.
+    """
+    use_cache = os.environ.get(PLUGINS_CACHE_ENV) != '0'
+    cache_file = get_cache_dir() / _PLUGINS_CACHE_FILE
+    environment_key = _get_environment_key()
+    if use_cache:
+        with suppress(OSError, ValueError):
+            cache = json.loads(cache_file.read_text(encoding='utf-8'))
+            if cache['key'] == environment_key:
+                return cast(Dict[str, str], cache['plugins'])
+
+    references = {
+        plugin.name: plugin.value for plugin in get_available_plugins()
+    }
+    if use_cache:
+        cache = {'key': environment_key, 'plugins': references}
+        with suppress(OSError):
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(cache_file, json.dumps(cache).encode('utf-8'))
+    return references
+
+
+def get_plugin_names() -> List[str]:
+    """Get sorted names of available plugins."""
+    return sorted(get_plugin_references())
+
+
 def load_plugin_by_name(name: str) -> LinthellPlugin:
     """Load class plugin by it's plugin name."""
-    plugins = entry_points(group='linthell.plugins')
+    if sys.version_info < (3, 10):
+        from importlib_metadata import EntryPoint
+    else:
+        from importlib.metadata import EntryPoint
+
     try:
-        plugin_class = plugins[name].load()
+        reference = get_plugin_references()[name]
     except KeyError as error:
         raise ValueError(f"Cannot find plugin {name}") from error
+    plugin_class = EntryPoint(name, reference, PLUGINS_GROUP).load()
     return plugin_class()
+
+
+def _get_environment_key() -> str:
+    """Get hash of the state of directories distributions are installed to.
+
+    Installing or removing a distribution creates or removes its metadata
+    directory, so modification time of the containing directory changes.
+    """
+    state = [sys.executable, sys.version]
+    for path in sys.path:
+        with suppress(OSError):
+            state.append(f'{path}:{os.stat(path or ".").st_mtime_ns}')
+    return hashlib.md5('\n'.join(state).encode('utf-8')).hexdigest()
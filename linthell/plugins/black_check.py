@@ -1,20 +1,34 @@
 import re
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 
 from linthell.plugins.base import LinthellPlugin
 from linthell.utils.path import normalize_path
+from linthell.utils.streams import find_line_start, iter_lines
 from linthell.utils.types import LinterError
 
+_WOULD_REFORMAT_PATTERN = re.compile(r'would reformat (.+)')
+
 
 class LinthellBlackCheckPlugin(LinthellPlugin):
     """Linthell plugin for black with --check option (show files only)."""
 
     def parse(self, linter_output: str) -> List[LinterError]:  # noqa D102
-        errors = []
-        for match in re.finditer(r'would reformat (.+)', linter_output):
+        return list(self.iter_parse([linter_output]))
+
+    def find_record_boundary(
+        self, linter_output: str, position: int
+    ) -> Optional[int]:
+        """Each line is a separate record."""
+        return find_line_start(linter_output, position)
+
+    def iter_parse(self, chunks: Iterable[str]) -> Iterator[LinterError]:
+        """Parse output line by line, yield errors as soon as found."""
+        for line in iter_lines(chunks):
+            match = _WOULD_REFORMAT_PATTERN.search(line)
+            if not match:
+                continue
             file_path = match.group(1)
             message = match.group(0)
             id_line = normalize_path(Path(file_path))
-            errors.append(LinterError(id_line, message))
-        return errors
+            yield LinterError(id_line, message, path=id_line)
@@ -0,0 +1,28 @@
+from typing import Any, Optional
+
+from linthell.plugins.json_output import JsonRecord, LinthellJsonPlugin
+
+
+class LinthellFlake8JsonPlugin(LinthellJsonPlugin):
+    """Linthell plugin for flake8 with JSON formatter (`--format=json`).
+
+    JSON formatter is provided by `flake8-json` package. Output is an object
+    mapping paths to arrays of errors. Id lines are the same as of `flake8`
+    plugin, so baseline can be reused.
+    """
+
+    records_depth = 2
+
+    def parse_record(self, record: Any) -> Optional[JsonRecord]:
+        """Convert flake8 error to error fields."""
+        path = record['filename']
+        line = record['line_number']
+        message = f'{record["code"]} {record["text"]}'
+        return JsonRecord(
+            path=path,
+            line=line,
+            message=message,
+            error_message=(
+                f'{path}:{line}:{record["column_number"]}: {message}'
+            ),
+        )
@@ -0,0 +1,166 @@
+"""Base of plugins parsing machine-readable JSON outputs of linters."""
+
+import abc
+from typing import (
+    Any,
+    ClassVar,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from linthell.plugins.base import LinthellPlugin
+from linthell.plugins.regex import IdLineBuilder
+from linthell.utils import timings
+from linthell.utils.diff_scope import DiffScope
+from linthell.utils.json_records import (
+    JsonOutputInvalidError,
+    iter_json_records,
+)
+from linthell.utils.source_lines import SourceLines
+from linthell.utils.streams import find_line_start
+from linthell.utils.types import LinterError
+
+
+class JsonRecord(NamedTuple):
+    """Fields of a linter error taken from JSON record."""
+
+    path: str
+    line: Optional[int]
+    message: str
+    """Message of id line, it must not depend on error position."""
+    error_message: str
+    """Message printed for a new error."""
+
+
+class LinthellJsonPlugin(LinthellPlugin):
+    """Linthell plugin which parses JSON output of linter.
+
+    Records are decoded incrementally as chunks of output are read, id lines
+    are built straight from fields of records, same way as regex plugins do
+    (path:code_line:message). Subclasses set depth of records inside output
+    and convert decoded records to `JsonRecord`.
+    """
+
+    records_depth: ClassVar[int] = 1
+    """Count of containers around records, 0 for JSON lines output."""
+
+    @abc.abstractmethod
+    def parse_record(self, record: Any) -> Optional[JsonRecord]:
+        """Convert decoded JSON record to error fields.
+
+        :param record: decoded JSON value
+        :return: error fields or None if record isn't an error
+        """
+        ...
+
+    def parse(self, linter_output: str) -> List[LinterError]:
+        """Parse linter output to list of linter errors."""
+        return list(self.iter_parse([linter_output]))
+
+    def find_record_boundary(
+        self, linter_output: str, position: int
+    ) -> Optional[int]:
+        """Find the first line start of JSON lines output.
+
+        Records nested into containers can't be split.
+        """
+        if self.records_depth:
+            return None
+        return find_line_start(linter_output, position)
+
+    def iter_parse(self, chunks: Iterable[str]) -> Iterator[LinterError]:
+        """Parse linter output by chunks.
+
+        Records of a chunk are grouped by file, so files with many errors
+        are read in parallel.
+
+        :raise JsonOutputInvalidError: if output isn't valid JSON
+        """
+        return self._iter_errors(chunks, scope=None)
+
+    def iter_parse_in_scope(
+        self, chunks: Iterable[str], scope: DiffScope
+    ) -> Iterator[LinterError]:
+        """Parse linter output by chunks, yield errors inside scope only.
+
+        Records outside of scope are dropped before their source lines are
+        read and id lines are built.
+        """
+        return self._iter_errors(chunks, scope=scope)
+
+    def _iter_errors(
+        self, chunks: Iterable[str], scope: Optional[DiffScope]
+    ) -> Iterator[LinterError]:
+        """Parse linter output by chunks, see `iter_parse`."""
+        records_span = timings.span('parse.records')
+        with SourceLines() as source_lines:
+            id_line_builder = IdLineBuilder(source_lines)
+            for records in timings.timed(
+                'parse.decode',
+                iter_json_records(chunks, self.records_depth),
+            ):
+                with records_span:
+                    json_records = self._parse_records(records)
+                yield from self._records_to_errors(
+                    json_records, id_line_builder, scope
+                )
+
+    def _parse_records(self, records: List[Any]) -> List[JsonRecord]:
+        """Convert decoded JSON records to error fields, skip non-errors."""
+        json_records = []
+        for record in records:
+            try:
+                json_record = self.parse_record(record)
+            except (KeyError, TypeError, AttributeError) as error:
+                raise JsonOutputInvalidError(
+                    repr(record), f'unexpected record, {error!r}'
+                ) from error
+            if json_record is not None:
+                json_records.append(json_record)
+        return json_records
+
+    @staticmethod
+    def _records_to_errors(
+        json_records: List[JsonRecord],
+        id_line_builder: IdLineBuilder,
+        scope: Optional[DiffScope],
+    ) -> Iterator[LinterError]:
+        """Convert error fields to linter errors."""
+        timings.count('records', len(json_records))
+        if scope is not None:
+            records_count = len(json_records)
+            json_records = [
+                json_record
+                for json_record in json_records
+                if scope.contains(
+                    id_line_builder.normalize_path(json_record.path),
+                    json_record.line,
+                )
+            ]
+            timings.count('out of scope', records_count - len(json_records))
+        with timings.span('parse.prefetch'):
+            id_line_builder.prefetch(
+                json_record.path
+                for json_record in json_records
+                if json_record.line
+            )
+        errors = []
+        with timings.span('parse.id lines'):
+            for json_record in json_records:
+                path = json_record.path
+                line = json_record.line
+                id_line = id_line_builder.build(
+                    path, str(line) if line else '', json_record.message
+                )
+                errors.append(
+                    LinterError(
+                        id_line,
+                        json_record.error_message,
+                        path=id_line_builder.normalize_path(path),
+                        line=line,
+                    )
+                )
+        yield from errors
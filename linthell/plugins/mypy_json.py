@@ -0,0 +1,37 @@
+from typing import Any, Optional
+
+from linthell.plugins.json_output import JsonRecord, LinthellJsonPlugin
+
+
+class LinthellMypyJsonPlugin(LinthellJsonPlugin):
+    """Linthell plugin for mypy with `--output=json` (`-O json`).
+
+    Output is a JSON object per line, notes attached to errors are provided
+    as hints of errors. Standalone notes aren't errors and are skipped.
+    Id lines are the same as of `mypy` plugin, so baseline can be reused.
+    """
+
+    records_depth = 0
+    whole_program = True
+
+    def parse_record(self, record: Any) -> Optional[JsonRecord]:
+        """Convert mypy error to error fields, skip notes."""
+        if record.get('severity') != 'error':
+            return None
+        path = record['file']
+        line = record['line']
+        message = f'error: {record["message"]}'
+        if record.get('code'):
+            message += f'  [{record["code"]}]'
+        error_message = f'{path}:{line}: {message}'
+        if record.get('hint'):
+            error_message += ''.join(
+                f'\n{path}:{line}: note: {hint}'
+                for hint in record['hint'].splitlines()
+            )
+        return JsonRecord(
+            path=path,
+            line=line if line > 0 else None,
+            message=message,
+            error_message=error_message,
+        )
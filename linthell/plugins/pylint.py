@@ -2,7 +2,13 @@ from linthell.plugins.regex import LinthellRegexPlugin
 
 
 class LinthellPylintPlugin(LinthellRegexPlugin):
-    """Linthell plugin for pylint."""
+    """Linthell plugin for pylint.
+
+    Some checks of pylint are cross-module (duplicate-code, cyclic-import),
+    so it's executed against all files together.
+    """
+
+    whole_program = True
 
     def __init__(self) -> None:  # noqa: D107
         lint_format = r'(?P<path>.+):(?P<line>\d+):\d+: (?P<message>.+): .+'  # noqa: E501
@@ -0,0 +1,34 @@
+from typing import Any, Optional
+
+from linthell.plugins.json_output import JsonRecord, LinthellJsonPlugin
+
+
+class LinthellPylintJsonPlugin(LinthellJsonPlugin):
+    """Linthell plugin for pylint with `--output-format=json`.
+
+    Output is an array of errors. Id lines are the same as of `pylint`
+    plugin, so baseline can be reused. Like `pylint` plugin, it's executed
+    against all files together.
+    """
+
+    records_depth = 1
+    whole_program = True
+
+    def parse_record(self, record: Any) -> Optional[JsonRecord]:
+        """Convert pylint message to error fields."""
+        path = record['path']
+        line = record['line']
+        error = (
+            f'{record["message-id"]}: {record["message"]}'
+            f' ({record["symbol"]})'
+        )
+        # Text plugin takes everything before the last ': ' of the first
+        # line as message (some messages are multiline)
+        first_line, _, _ = error.partition('\n')
+        message, _, _ = first_line.rpartition(': ')
+        return JsonRecord(
+            path=path,
+            line=line,
+            message=message,
+            error_message=f'{path}:{line}:{record["column"]}: {error}',
+        )
@@ -1,23 +1,278 @@
-import linecache
+import mmap
 import re
+import sys
+from collections import Counter
+from itertools import islice
 from pathlib import Path
-from typing import List
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Match,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
 
 from linthell.plugins.base import LinthellPlugin
+from linthell.utils import timings
+from linthell.utils.diff_scope import DiffScope
 from linthell.utils.path import normalize_path
-from linthell.utils.types import IdLine, LinterError
+from linthell.utils.source_lines import SourceLines
+from linthell.utils.streams import find_line_start
+from linthell.utils.types import IdLine, LinterError, LinterOutput
 
+if sys.version_info >= (3, 11):
+    from re import _parser as sre_parse  # type: ignore
+else:
+    import sre_parse
 
-def get_id_line(path: str, line: str, message: str) -> IdLine:
-    """Convert path, line and message to id line (path:code_line:message)."""
+_PREFETCH_MIN_ERRORS = 4
+"""Files with at least this count of errors in a chunk are read in advance."""
+_SOURCE_LINES = SourceLines()
+_MAX_BOUNDARY_SEARCH_LINES = 1000
+"""Lines to check for record boundary before giving up."""
+_BUFFER_BATCH_SIZE = 1000
+"""Count of matches of memory mapped output converted to errors at once."""
+_SEPARATOR_BYTES = (b'\x1c', b'\x1d', b'\x1e', b'\x1f')
+"""ASCII chars which str and bytes patterns match differently.
+
+Unicode aware `\\s` of str patterns matches them, ASCII one doesn't. Other
+Unicode aware classes (like `\\w` and `\\d`) differ for non-ASCII only.
+"""
+_CHECK_WINDOW_SIZE = 1024 * 1024
+"""Size of memory mapped output parts checked to be ASCII at once."""
+_LF = ord('\n')
+_LF_CATEGORIES = (
+    sre_parse.CATEGORY_SPACE,
+    sre_parse.CATEGORY_NOT_DIGIT,
+    sre_parse.CATEGORY_NOT_WORD,
+    sre_parse.CATEGORY_LINEBREAK,
+)
+"""Categories of parsed regex (like `\\s` or `\\D`) containing line break."""
+_REPEATS = (
+    sre_parse.MAX_REPEAT,
+    sre_parse.MIN_REPEAT,
+    getattr(sre_parse, 'POSSESSIVE_REPEAT', sre_parse.MAX_REPEAT),
+)
+
+_MatchFields = Tuple[str, Optional[int], str, int, int]
+"""Path, line number and message groups and span of the whole match."""
+
+
+def get_id_line(
+    path: str,
+    line: str,
+    message: str,
+    source_lines: Optional[SourceLines] = None,
+) -> IdLine:
+    """Convert path, line and message to id line (path:code_line:message).
+
+    :param source_lines: files cache to read code line from, shared module
+    cache is used by default
+    """
     code = ''
     if line:
         line_int = int(line)
-        code = linecache.getline(path, line_int).rstrip('\n')
+        code = (source_lines or _SOURCE_LINES).getline(path, line_int)
     normalized_path = normalize_path(Path(path))
     return f'{normalized_path}:{code}:{message}'
 
 
+class IdLineBuilder:
+    """Id lines builder with per-run caches of source files and paths.
+
+    Shared by plugins which build id lines of path, code line and message.
+    """
+
+    def __init__(self, source_lines: SourceLines) -> None:  # noqa: D107
+        self.source_lines = source_lines
+        self._normalized_paths: Dict[str, str] = {}
+
+    def normalize_path(self, path: str) -> str:
+        """Normalize path, result is cached and interned.
+
+        Errors of the same file share a single path string.
+        """
+        normalized_path = self._normalized_paths.get(path)
+        if normalized_path is None:
+            normalized_path = sys.intern(normalize_path(Path(path)))
+            self._normalized_paths[path] = normalized_path
+        return normalized_path
+
+    def build(
+        self, path: str, line: Union[str, int, None], message: str
+    ) -> IdLine:
+        """Convert path, line and message to id line, same as `get_id_line`.
+
+        :param line: line number, empty or None if it's not provided
+        """
+        code = ''
+        if line:
+            code = self.source_lines.getline(path, int(line))
+        normalized_path = self.normalize_path(path)
+        return f'{normalized_path}:{code}:{message}'
+
+    def prefetch(self, paths: Iterable[str]) -> None:
+        """Read in advance files with many errors in parallel.
+
+        :param paths: paths of errors with line number, a path per error
+        """
+        errors_count = Counter(paths)
+        self.source_lines.prefetch(
+            path
+            for path, count in errors_count.items()
+            if count >= _PREFETCH_MIN_ERRORS
+        )
+
+
+def _get_fields(match: Match[str]) -> _MatchFields:
+    """Get groups of match used to build linter error."""
+    path, line, message = match.group('path', 'line', 'message')
+    start, end = match.span()
+    return path, int(line) if line else None, message, start, end
+
+
+def _decode_fields(match: Match[bytes]) -> _MatchFields:
+    """Get groups of bytes match used to build linter error, decoded."""
+    path, line, message = match.group('path', 'line', 'message')
+    start, end = match.span()
+    return (
+        path.decode('utf-8'),
+        int(line) if line else None,
+        message.decode('utf-8'),
+        start,
+        end,
+    )
+
+
+def _is_matched_same_as_text(buffer: mmap.mmap) -> bool:
+    """Check if bytes pattern matches output the same as str pattern.
+
+    It's true for ASCII output without separator chars. Output is checked by
+    windows, it's several times faster than searching with regex.
+    """
+    for start in range(0, len(buffer), _CHECK_WINDOW_SIZE):
+        end = start + _CHECK_WINDOW_SIZE
+        window = buffer[start:end]
+        if not window.isascii() or any(
+            separator in window for separator in _SEPARATOR_BYTES
+        ):
+            return False
+    return True
+
+
+def _iter_matches_before(
+    pattern: Pattern[str], text: str, position: int, lines_count: int
+) -> Iterator[Match[str]]:
+    """Yield matches starting inside `lines_count` lines before position.
+
+    Position must be a start of line.
+    """
+    start = position
+    for _ in range(lines_count):
+        if start == 0:
+            break
+        start = text.rfind('\n', 0, start - 1) + 1
+    for match in pattern.finditer(text, start):
+        if match.start() >= position:
+            break
+        yield match
+
+
+def can_match_line_break(lint_format: str) -> bool:
+    """Check if regex can match line break, so its match can span lines.
+
+    Regex is parsed by `re` parser, each part which can consume line break
+    is detected: literal, negated literal or class (`[^...]`), whitespace,
+    non-digit and non-word classes, `.` with DOTALL flag. Lookarounds are
+    checked too, they may look at the next line. Check is conservative:
+    unknown parts and invalid regex are considered matching line break.
+    """
+    try:
+        flags = re.compile(lint_format).flags
+        parsed = sre_parse.parse(lint_format, flags)
+    except re.error:
+        return True
+    return _can_match_line_break(parsed, bool(flags & re.DOTALL))
+
+
+def _can_match_line_break(items: Iterable[Any], dotall: bool) -> bool:
+    """Check if parsed regex (or its part) can match line break."""
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            matches = av == _LF
+        elif op is sre_parse.NOT_LITERAL:
+            matches = av != _LF
+        elif op is sre_parse.ANY:
+            matches = dotall
+        elif op is sre_parse.IN:
+            matches = _class_contains_line_break(av)
+        elif op in _REPEATS:
+            matches = _can_match_line_break(av[2], dotall)
+        elif op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, subpattern = av
+            subpattern_dotall = (dotall or bool(add_flags & re.DOTALL)) and (
+                not del_flags & re.DOTALL
+            )
+            matches = _can_match_line_break(subpattern, subpattern_dotall)
+        elif op is sre_parse.BRANCH:
+            matches = any(
+                _can_match_line_break(branch, dotall) for branch in av[1]
+            )
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            matches = _can_match_line_break(av[1], dotall)
+        elif op is sre_parse.GROUPREF_EXISTS:
+            _, yes_branch, no_branch = av
+            matches = _can_match_line_break(
+                [*yes_branch, *(no_branch or [])], dotall
+            )
+        elif op is getattr(sre_parse, 'ATOMIC_GROUP', None):
+            matches = _can_match_line_break(av, dotall)
+        elif op in (sre_parse.AT, sre_parse.GROUPREF):
+            # Anchors don't consume text, group is checked by itself
+            matches = False
+        else:
+            matches = True
+        if matches:
+            return True
+    return False
+
+
+def _class_contains_line_break(items: Iterable[Any]) -> bool:
+    """Check if parsed character class (`[...]`) contains line break."""
+    negated = False
+    contains = False
+    for op, av in items:
+        if op is sre_parse.NEGATE:
+            negated = True
+        elif op is sre_parse.LITERAL:
+            contains = contains or av == _LF
+        elif op is sre_parse.RANGE:
+            contains = contains or av[0] <= _LF <= av[1]
+        elif op is sre_parse.CATEGORY:
+            contains = contains or av in _LF_CATEGORIES
+        else:
+            return True
+    return contains != negated
+
+
+def _get_held_back_start(buffer: str, lines_count: int) -> int:
+    """Get the position of the last `lines_count` lines inside buffer.
+
+    The last unfinished line is always held back and isn't counted.
+    """
+    position = buffer.rfind('\n') + 1
+    for _ in range(lines_count):
+        if position == 0:
+            break
+        position = buffer.rfind('\n', 0, position - 1) + 1
+    return position
+
+
 class LinthellRegexPlugin(LinthellPlugin):
     """Linthell plugin which uses regex to extract errors.
 
@@ -28,21 +283,206 @@ class LinthellRegexPlugin(LinthellPlugin):
     some code or explanation
 
     Also whole regex match should match to whole error message of linter
-    and will be returned as LinterError.error_message
+    and will be returned as LinterError.error_message. Match isn't copied
+    until the message is accessed, see `LinterError.from_output`.
+    """
+
+    max_record_lines: int = 2
+    """Max count of lines a single error can span in linter output.
+
+    Used to parse linter output by chunks: lines at the end of a chunk are
+    held back until the next chunk is read, so no error is split in half.
+    It's 1 for formats which can't match line breaks (see
+    `can_match_line_break`), their errors are complete once their line is.
     """
 
     def __init__(self, lint_format: str) -> None:  # noqa: D107
         super().__init__()
         self.lint_format = lint_format
+        if not can_match_line_break(lint_format):
+            self.max_record_lines = 1
+
+    def find_record_boundary(
+        self, linter_output: str, position: int
+    ) -> Optional[int]:
+        """Find the first line where a record starts and no record crosses.
+
+        Only lines followed by at least `max_record_lines - 1` lines are
+        checked, so the record starting at boundary is complete. Lines before
+        the boundary are matched again to make sure no record spans over it.
+        """
+        pattern = re.compile(self.lint_format)
+        limit = _get_held_back_start(linter_output, self.max_record_lines - 1)
+        line_start = find_line_start(linter_output, position)
+        for _ in range(_MAX_BOUNDARY_SEARCH_LINES):
+            if line_start is None or line_start >= limit:
+                return None
+            if pattern.match(linter_output, line_start) and not any(
+                match.end() > line_start
+                for match in _iter_matches_before(
+                    pattern,
+                    linter_output,
+                    line_start,
+                    self.max_record_lines - 1,
+                )
+            ):
+                return line_start
+            line_start = find_line_start(linter_output, line_start + 1)
+        return None
 
     def parse(self, linter_output: str) -> List[LinterError]:
         """Parse linter output to list of linter errors."""
+        return list(self.iter_parse([linter_output]))
+
+    def iter_parse(self, chunks: Iterable[str]) -> Iterator[LinterError]:
+        """Parse linter output by chunks.
+
+        Matches starting inside the last `max_record_lines - 1` lines of
+        a chunk are postponed until the next chunk is read, even if source is
+        idle (chunk is empty): the next line may continue them, like note of
+        mypy error. Matches of a chunk are grouped by file, so files with
+        many errors are read in parallel.
+        """
+        return self._iter_errors(chunks, scope=None)
+
+    def iter_parse_in_scope(
+        self, chunks: Iterable[str], scope: DiffScope
+    ) -> Iterator[LinterError]:
+        """Parse linter output by chunks, yield errors inside scope only.
+
+        Matches outside of scope are dropped before their source lines are
+        read and id lines are built.
+        """
+        return self._iter_errors(chunks, scope=scope)
+
+    def iter_parse_buffer(
+        self, buffer: mmap.mmap, scope: Optional[DiffScope] = None
+    ) -> Optional[Iterator[LinterError]]:
+        """Parse memory mapped linter output with bytes pattern.
+
+        Only groups used in id lines are decoded, messages are decoded once
+        they are printed. Bytes pattern matches exactly the same as str one
+        only if both pattern and output are ASCII (without FS, GS, RS and US
+        separators), otherwise output is parsed by chunks of text.
+        """
+        if not self.lint_format.isascii():
+            return None
+        try:
+            pattern = re.compile(self.lint_format.encode('ascii'))
+        except (re.error, ValueError):
+            # E.g. `\\u` escapes aren't allowed in bytes patterns
+            return None
+        with timings.span('parse.check input'):
+            if not _is_matched_same_as_text(buffer):
+                return None
+        return self._iter_buffer_errors(pattern, buffer, scope)
+
+    def _iter_buffer_errors(
+        self,
+        pattern: Pattern[bytes],
+        buffer: mmap.mmap,
+        scope: Optional[DiffScope],
+    ) -> Iterator[LinterError]:
+        """Parse memory mapped output, see `iter_parse_buffer`."""
+        match_span = timings.span('parse.match')
+        matches = pattern.finditer(buffer)
+        with SourceLines() as source_lines:
+            id_line_builder = IdLineBuilder(source_lines)
+            while True:
+                with match_span:
+                    fields = [
+                        _decode_fields(match)
+                        for match in islice(matches, _BUFFER_BATCH_SIZE)
+                    ]
+                if not fields:
+                    break
+                yield from self._matches_to_errors(
+                    fields, buffer, id_line_builder, scope
+                )
+
+    def _iter_errors(
+        self, chunks: Iterable[str], scope: Optional[DiffScope]
+    ) -> Iterator[LinterError]:
+        """Parse linter output by chunks, see `iter_parse`."""
+        pattern = re.compile(self.lint_format)
+        match_span = timings.span('parse.match')
+        with SourceLines() as source_lines:
+            id_line_builder = IdLineBuilder(source_lines)
+            buffer = ''
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                buffer += chunk
+                held_back_start = _get_held_back_start(
+                    buffer, self.max_record_lines - 1
+                )
+                # Unfinished line may continue any match
+                complete_end = buffer.rfind('\n') + 1
+                resume_position = held_back_start
+                fields = []
+                with match_span:
+                    for match in pattern.finditer(buffer):
+                        if match.start() >= held_back_start:
+                            break
+                        if match.end() > complete_end:
+                            resume_position = match.start()
+                            break
+                        fields.append(_get_fields(match))
+                        resume_position = max(resume_position, match.end())
+                output = buffer
+                buffer = buffer[resume_position:]
+                yield from self._matches_to_errors(
+                    fields, output, id_line_builder, scope
+                )
+            with match_span:
+                fields = list(map(_get_fields, pattern.finditer(buffer)))
+            yield from self._matches_to_errors(
+                fields, buffer, id_line_builder, scope
+            )
+
+    @staticmethod
+    def _matches_to_errors(
+        matches: List[_MatchFields],
+        linter_output: LinterOutput,
+        id_line_builder: IdLineBuilder,
+        scope: Optional[DiffScope],
+    ) -> Iterator[LinterError]:
+        """Convert fields of regex matches to linter errors.
+
+        Errors of the whole chunk are built at once, so time spent on reading
+        source lines is measured apart from consuming errors.
+
+        :param linter_output: output matches are found in
+        """
+        timings.count('matches', len(matches))
+        if scope is not None:
+            matches_count = len(matches)
+            matches = [
+                fields
+                for fields in matches
+                if scope.contains(
+                    id_line_builder.normalize_path(fields[0]),
+                    fields[1],
+                )
+            ]
+            timings.count('out of scope', matches_count - len(matches))
+        with timings.span('parse.prefetch'):
+            id_line_builder.prefetch(
+                path for path, line, _, _, _ in matches if line
+            )
         errors = []
-        for match in re.finditer(self.lint_format, linter_output):
-            path = match.groupdict()['path']
-            line = match.groupdict()['line']
-            message = match.groupdict()['message']
-            lint_message = match.group(0)
-            id_line = get_id_line(path, line, message)
-            errors.append(LinterError(id_line, lint_message))
-        return errors
+        with timings.span('parse.id lines'):
+            for path, line, message, start, end in matches:
+                id_line = id_line_builder.build(path, line, message)
+                normalized_path = id_line_builder.normalize_path(path)
+                errors.append(
+                    LinterError.from_output(
+                        id_line,
+                        linter_output,
+                        start,
+                        end,
+                        path=normalized_path,
+                        line=line,
+                    )
+                )
+        yield from errors
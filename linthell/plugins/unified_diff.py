@@ -0,0 +1,235 @@
+"""Shared parser of unified diff outputs (black --diff, isort --diff, etc.)."""
+
+import re
+from pathlib import Path
+from typing import ClassVar, Iterable, Iterator, List, Optional, Pattern, Type
+
+from linthell.plugins.base import LinthellPlugin
+from linthell.utils.path import normalize_path
+from linthell.utils.streams import find_line_start, iter_lf_lines
+from linthell.utils.types import LinterError
+
+_OLD_FILE_SIGN = '--- '
+_NEW_FILE_SIGN = '+++ '
+_HUNK_SIGN = '@@'
+_REMOVE_LINE_SIGN = '-'
+_ADD_LINE_SIGN = '+'
+_KEEP_LINE_SIGN = ' '
+_NO_NEWLINE_SIGN = '\\'
+"""Example: \\ No newline at end of file"""
+_HUNK_PATTERN = re.compile(
+    r'@@ -(?P<old_line_number>\d+)(?:,(?P<old_count>\d+))?'
+    r' \+(?P<new_line_number>\d+)(?:,(?P<new_count>\d+))? @@'
+)
+"""Example: @@ -10,20 +10,20 @@"""
+_SPLITLINES_BREAK_PATTERN = re.compile(
+    '[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]'
+)
+"""Line boundaries of `str.splitlines` other than line feed."""
+
+
+class DiffOutputInvalidError(Exception):
+    """Base error of invalid diff output.
+
+    Used to encapsulate logic of building an error message.
+    Allows to set `DEFAULT_MSG` for subclasses.
+    """
+
+    DEFAULT_MSG: str = 'no detail'
+    TOOL_NAME: str = 'diff'
+
+    def __init__(self, line: str, msg: Optional[str] = None) -> None:
+        """Initialize exception instance.
+
+        :param line: line of diff output.
+        :param msg: verbose message of error.
+                    If not passed `self.DEFAULT_MSG` is used.
+        """
+        self.line = line
+        self.msg = msg or self.DEFAULT_MSG
+
+    def __str__(self):
+        return f'Invalid {self.TOOL_NAME} output ({self.msg}): {self.line}'
+
+
+class DiffOutputInvalidFilePathLineError(DiffOutputInvalidError):
+    """Error of diff output. Invalid line with file path.
+
+    Raised if line expected to contain file path but doesn't match pattern.
+    """
+
+    DEFAULT_MSG = (
+        'expected line to contain file path '
+        'but it does not match expected pattern'
+    )
+
+
+class DiffOutputInvalidLineNumberLineError(DiffOutputInvalidError):
+    """Error of diff output. Invalid line with line numbers.
+
+    Raised if line expected to contain line numbers but doesn't match pattern.
+    """
+
+    DEFAULT_MSG = (
+        'expected line to contain line number '
+        'but it does not match expected pattern'
+    )
+
+
+class DiffOutputInvalidLineOrderError(DiffOutputInvalidError):
+    """Error of diff output. Invalid line order.
+
+    Raised if expected to face lines with file path and line numbers before
+    current in-process line.
+    """
+
+    DEFAULT_MSG = (
+        'expected lines with file path and line number before lines with code'
+    )
+
+
+class LinthellUnifiedDiffPlugin(LinthellPlugin):
+    """Parser of unified diff produced by formatters in diff mode.
+
+    Each added or removed line is an error. Id line consists of normalized
+    file path and the diff line, so it doesn't depend on line numbers.
+    Subclasses set pattern of file path headers and errors to raise.
+
+    Parser is stateless: state of parsing lives inside `iter_parse` only,
+    so the same plugin instance can parse several outputs.
+
+    Diff is split by line feeds only, as diff tools do. Id line keeps the
+    diff line up to the first other line boundary of `str.splitlines` (like
+    form feed), diffs were split by them before, so baselines keep matching.
+
+    Diff is parsed line by line: file headers (`--- `, `+++ `) set the file,
+    hunk headers (`@@ -1,3 +1,7 @@`) set line numbers and count of lines
+    in hunk, so lines of code starting with `---` aren't confused with file
+    headers. Any unexpected line order raises an error immediately,
+    preventing broken baseline or linter's output.
+    """
+
+    file_path_pattern: ClassVar[Pattern[str]] = re.compile(
+        r'(?:-{3}|\+{3})\s(?P<file_path>[\w/.-]+).*'
+    )
+    """Pattern of file header, group `file_path` is path of file."""
+    invalid_file_path_error: ClassVar[
+        Type[DiffOutputInvalidError]
+    ] = DiffOutputInvalidFilePathLineError
+    invalid_line_number_error: ClassVar[
+        Type[DiffOutputInvalidError]
+    ] = DiffOutputInvalidLineNumberLineError
+    invalid_line_order_error: ClassVar[
+        Type[DiffOutputInvalidError]
+    ] = DiffOutputInvalidLineOrderError
+
+    def parse(self, linter_output: str) -> List[LinterError]:
+        """Entry point for linthell.
+
+        :param linter_output: complete diff output
+        :return: List of found LinterError representing diff output
+
+        :raise DiffOutputInvalidError: on any unexpected output or it's order
+        """
+        return list(self.iter_parse([linter_output]))
+
+    def find_record_boundary(
+        self, linter_output: str, position: int
+    ) -> Optional[int]:
+        """Find the first file header, each file section is parsed alone."""
+        line_start = find_line_start(linter_output, position)
+        while line_start is not None:
+            next_line_start = find_line_start(linter_output, line_start + 1)
+            if next_line_start is None:
+                return None
+            if linter_output.startswith(
+                _OLD_FILE_SIGN, line_start
+            ) and linter_output.startswith(_NEW_FILE_SIGN, next_line_start):
+                return line_start
+            line_start = next_line_start
+        return None
+
+    def iter_parse(self, chunks: Iterable[str]) -> Iterator[LinterError]:
+        """Parse output line by line, yield errors as soon as found.
+
+        :param chunks: diff output split by chunks
+        :return: iterator of found LinterError representing diff output
+
+        :raise DiffOutputInvalidError: on any unexpected output or it's order
+        """
+        file_path: Optional[str] = None
+        normalized_path = ''
+        old_line_number = new_line_number = 0
+        # Count of lines of the current hunk which aren't parsed yet
+        old_left = new_left = 0
+        for line in iter_lf_lines(chunks):
+            if old_left or new_left:
+                sign = line[:1]
+                if sign == _REMOVE_LINE_SIGN and old_left:
+                    yield self._create_error(
+                        file_path, normalized_path, old_line_number, line
+                    )
+                    old_line_number += 1
+                    old_left -= 1
+                    continue
+                if sign == _ADD_LINE_SIGN and new_left:
+                    yield self._create_error(
+                        file_path, normalized_path, new_line_number, line
+                    )
+                    new_line_number += 1
+                    new_left -= 1
+                    continue
+                if sign == _KEEP_LINE_SIGN and old_left and new_left:
+                    old_line_number += 1
+                    new_line_number += 1
+                    old_left -= 1
+                    new_left -= 1
+                    continue
+                if sign == _NO_NEWLINE_SIGN:
+                    continue
+                raise self.invalid_line_order_error(
+                    line=line, msg='hunk is shorter than expected'
+                )
+
+            if line.startswith((_OLD_FILE_SIGN, _NEW_FILE_SIGN)):
+                file_path = self._parse_file_path(line)
+                normalized_path = normalize_path(Path(file_path))
+            elif line.startswith(_HUNK_SIGN):
+                if file_path is None:
+                    raise self.invalid_line_order_error(line=line)
+                hunk_match = _HUNK_PATTERN.match(line)
+                if not hunk_match:
+                    raise self.invalid_line_number_error(line=line)
+                old_line_number = int(hunk_match.group('old_line_number'))
+                new_line_number = int(hunk_match.group('new_line_number'))
+                old_left = int(hunk_match.group('old_count') or 1)
+                new_left = int(hunk_match.group('new_count') or 1)
+            elif line.startswith(
+                (_REMOVE_LINE_SIGN, _ADD_LINE_SIGN, _KEEP_LINE_SIGN)
+            ):
+                raise self.invalid_line_order_error(line=line)
+            # Other lines (like "Skipped 2 files") aren't part of diff
+
+    def _parse_file_path(self, line: str) -> str:
+        """Parse file path from header that starts with --- or +++."""
+        file_path_match = self.file_path_pattern.fullmatch(line)
+        if not file_path_match:
+            raise self.invalid_file_path_error(line=line)
+        return file_path_match.group('file_path')
+
+    @staticmethod
+    def _create_error(
+        file_path: Optional[str],
+        normalized_path: str,
+        line_number: int,
+        line: str,
+    ) -> LinterError:
+        """Create error of added or removed line."""
+        line_break = _SPLITLINES_BREAK_PATTERN.search(line)
+        end = len(line) if line_break is None else line_break.start()
+        return LinterError(
+            id_line=f'{normalized_path}:{line[:end]}',
+            error_message=f'{file_path}:{line_number}: {line}',
+            path=normalized_path,
+            line=line_number,
+        )
@@ -1,41 +1,1052 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from collections import defaultdict
+from contextlib import suppress
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Set
+from typing import (
+    AbstractSet,
+    Container,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from linthell.plugins.base import LinthellPlugin
-from linthell.utils.id_lines import id_line_to_digest
-from linthell.utils.types import IdLine
+from linthell.utils import timings
+from linthell.utils.baseline_db import (
+    DatabaseDigests,
+    DatabaseError,
+    Entry,
+    is_database,
+    load_id_lines,
+    read_header,
+    remove_database,
+    remove_entries,
+    save_entries,
+)
+from linthell.utils.digest_index import (
+    DigestIndex,
+    get_baseline_stamp,
+    get_index_path,
+    open_digest_index,
+    save_digest_index,
+)
+from linthell.utils.id_lines import (
+    BLAKE2B_64,
+    DIGEST_SCHEMES,
+    MD5,
+    DigestScheme,
+    id_line_to_digest,
+    id_line_to_path,
+)
+from linthell.utils.linter_input import LinterInput
+from linthell.utils.parallel import is_splittable, iter_id_lines
+from linthell.utils.types import Digest, IdLine, LinterError
 
+BASELINE_VERSION = 2
+"""The latest version of baseline format."""
+SHARDS_COUNT = 256
+"""Count of shards of new sharded baselines."""
+_HEADER_PREFIX = '# linthell-baseline '
+_CONTENT_ID_LINES = 'id-lines'
+_CONTENT_DIGESTS = 'digests'
+_MANIFEST_NAME = 'manifest'
+_SHARD_SUFFIX = '.txt'
 
-def get_digests_from_baseline(baseline_file: Path) -> Set[str]:
-    """Get digests from provided baseline file."""
-    id_lines = load_baseline(baseline_file)
-    digests = {id_line_to_digest(id_line) for id_line in id_lines}
+
+class BaselineFormatError(Exception):
+    """Baseline has unsupported format or it can't be used this way."""
+
+
+class BaselineFormat(NamedTuple):
+    """Format of baseline file, stored in header of baseline file.
+
+    Baseline without header has the legacy format: version 1, sorted id
+    lines with MD5 digests.
+    """
+
+    version: int = 1
+    scheme: DigestScheme = MD5
+    """Hash function to convert id lines to digests."""
+    digests_only: bool = False
+    """Baseline stores sorted digests of id lines instead of id lines."""
+    shards: int = 0
+    """Count of shards of baseline directory, 0 for baseline file."""
+    sqlite: bool = False
+    """Baseline is SQLite database, see `linthell.utils.baseline_db`."""
+
+
+LEGACY_FORMAT = BaselineFormat()
+DEFAULT_DIGEST_SCHEME = BLAKE2B_64
+"""Digest scheme of baselines with header if it isn't set explicitly."""
+
+
+class CachedDigests(NamedTuple):
+    """Digests of baseline kept in memory."""
+
+    stamp: Tuple[int, int, int]
+    """Inode, size and modification time of baseline file."""
+    digests: Union[Set[Digest], DigestIndex]
+
+
+DigestsCache = Dict[Tuple[Path, bool], CachedDigests]
+"""Cached digests by resolved baseline path and usage of its index."""
+_digests_cache: Optional[DigestsCache] = None
+
+
+def get_baseline_format(
+    digest: Optional[str] = None,
+    digests_only: bool = False,
+    sharded: bool = False,
+    sqlite: bool = False,
+) -> BaselineFormat:
+    """Get format of new baseline by options of commands.
+
+    Baseline of legacy format is created if no option is set, so it can be
+    read by older versions of linthell.
+
+    :param digest: name of digest scheme
+    :param digests_only: store digests instead of id lines
+    :param sharded: store baseline as directory of shards
+    :param sqlite: store baseline as SQLite database, it isn't sharded
+    """
+    if digest is None and not digests_only and not sharded and not sqlite:
+        return LEGACY_FORMAT
+    scheme = DIGEST_SCHEMES[digest] if digest else DEFAULT_DIGEST_SCHEME
+    shards = SHARDS_COUNT if sharded and not sqlite else 0
+    return BaselineFormat(
+        BASELINE_VERSION, scheme, digests_only, shards, sqlite
+    )
+
+
+def format_baseline_header(baseline_format: BaselineFormat) -> str:
+    """Format header line of baseline, see `parse_baseline_header`."""
+    content = (
+        _CONTENT_DIGESTS if baseline_format.digests_only else _CONTENT_ID_LINES
+    )
+    header = (
+        f'{_HEADER_PREFIX}version={baseline_format.version}'
+        f' digest={baseline_format.scheme.name} content={content}'
+    )
+    if baseline_format.shards:
+        header += f' shards={baseline_format.shards}'
+    return header
+
+
+def parse_baseline_header(line: str) -> BaselineFormat:
+    """Parse the first line of baseline file.
+
+    Example: `# linthell-baseline version=2 digest=blake2b-64 content=digests`
+
+    Manifest of sharded baseline is the same header with count of shards
+    (`shards=256`) at the end.
+
+    :return: format of baseline, legacy one if line isn't a header
+    :raise BaselineFormatError: if format isn't supported
+    """
+    if not line.startswith(_HEADER_PREFIX):
+        return LEGACY_FORMAT
+    _, _, fields_raw = line.partition(_HEADER_PREFIX)
+    fields = dict(field.partition('=')[::2] for field in fields_raw.split())
+    try:
+        version = int(fields.get('version', ''))
+    except ValueError:
+        raise BaselineFormatError(f'Invalid baseline header: {line}')
+    if version > BASELINE_VERSION:
+        raise BaselineFormatError(
+            f'Baseline version {version} is not supported, '
+            f'upgrade linthell to use it'
+        )
+    scheme = DIGEST_SCHEMES.get(fields.get('digest', ''))
+    content = fields.get('content')
+    shards_raw = fields.get('shards', '0')
+    if (
+        scheme is None
+        or content not in (_CONTENT_ID_LINES, _CONTENT_DIGESTS)
+        or not shards_raw.isdigit()
+    ):
+        raise BaselineFormatError(f'Invalid baseline header: {line}')
+    return BaselineFormat(
+        version, scheme, content == _CONTENT_DIGESTS, int(shards_raw)
+    )
+
+
+def read_baseline_format(baseline_file: Path) -> BaselineFormat:
+    """Read format of baseline from its header, the rest isn't read.
+
+    Format of sharded baseline (directory) is read from its manifest,
+    format of database is stored inside it.
+
+    :raise BaselineFormatError: if baseline directory has no valid manifest
+    (directory isn't a baseline) or database isn't a baseline
+    """
+    if is_database(baseline_file):
+        try:
+            header = read_header(baseline_file)
+        except DatabaseError as error:
+            raise BaselineFormatError(str(error))
+        return parse_baseline_header(header)._replace(sqlite=True)
+    if baseline_file.is_dir():
+        manifest = baseline_file / _MANIFEST_NAME
+        if not manifest.is_file():
+            raise BaselineFormatError(
+                f'Baseline directory {baseline_file} has no manifest'
+            )
+        baseline_format = read_baseline_format(manifest)
+        if not baseline_format.shards:
+            raise BaselineFormatError(
+                f'Manifest of baseline {baseline_file} has no count of shards'
+            )
+        return baseline_format
+    with baseline_file.open() as file:
+        return parse_baseline_header(file.readline().rstrip('\n'))
+
+
+def is_baseline_dir(path: Path) -> bool:
+    """Check if path is a directory of sharded baseline.
+
+    Only directory with manifest is a baseline, other directories are never
+    treated as baselines, so their files aren't overwritten.
+    """
+    return path.is_dir() and (path / _MANIFEST_NAME).is_file()
+
+
+def get_shard_name(path: str, shards: int) -> str:
+    """Get name of shard file storing entries of file.
+
+    :param path: normalized path of file, as in id lines
+    :param shards: count of shards of baseline
+    """
+    path_hash = hashlib.blake2b(path.encode('utf-8'), digest_size=4).digest()
+    shard = int.from_bytes(path_hash, 'big') % shards
+    return _format_shard_name(shard, shards)
+
+
+def _format_shard_name(shard: int, shards: int) -> str:
+    """Format name of shard file by its number."""
+    width = len(f'{shards - 1:x}')
+    return f'{shard:0{width}x}{_SHARD_SUFFIX}'
+
+
+class ShardedDigests:
+    """Digests of sharded baseline, shards are loaded on demand.
+
+    Errors are looked up in shard of their file by `get_shard`, so only
+    shards of files present in linter output are read. Plain `in` operator
+    loads all shards.
+    """
+
+    def __init__(
+        self, baseline_dir: Path, baseline_format: BaselineFormat
+    ) -> None:
+        """Initialize digests of baseline directory, nothing is read yet.
+
+        :param baseline_dir: path to baseline directory
+        :param baseline_format: format from manifest of baseline
+        """
+        self.baseline_dir = baseline_dir
+        self.baseline_format = baseline_format
+        self.scheme = baseline_format.scheme
+        self._shards: Dict[str, Container[Digest]] = {}
+        self._shards_by_path: Dict[str, Container[Digest]] = {}
+        self._all_digests: Optional[Container[Digest]] = None
+
+    def get_shard(self, path: str) -> Container[Digest]:
+        """Get digests of shard storing entries of file.
+
+        :param path: normalized path of file, as in id lines
+        """
+        shard = self._shards_by_path.get(path)
+        if shard is None:
+            name = get_shard_name(path, self.baseline_format.shards)
+            shard = self._shards.get(name)
+            if shard is None:
+                shard = self._shards[name] = self._load_shards([name])
+            self._shards_by_path[path] = shard
+        return shard
+
+    def __contains__(self, digest: object) -> bool:
+        if self._all_digests is None:
+            names = [
+                shard.name
+                for shard in _iter_shards(
+                    self.baseline_dir, self.baseline_format.shards
+                )
+            ]
+            self._all_digests = self._load_shards(names)
+        return digest in self._all_digests
+
+    def _load_shards(self, names: List[str]) -> Container[Digest]:
+        with timings.span('load baseline'):
+            lines = []
+            for name in names:
+                lines.extend(
+                    _read_shard(self.baseline_dir / name, self.baseline_format)
+                )
+            digests = _lines_to_digests(lines, self.baseline_format)
+        timings.count('baseline shards', len(names))
+        timings.count('baseline size', len(lines))
+        return digests
+
+
+def get_digests_from_baseline(
+    baseline_file: Path, use_index: bool = True
+) -> Container[Digest]:
+    """Get digests from provided baseline file.
+
+    :param baseline_file: path to baseline file
+    :param use_index: use binary index of baseline, it's built on the first
+    call and reused until baseline content changes
+    :return: container of digests, supports `in` operator. Digests of
+    baseline directory are `ShardedDigests`, their shards are loaded later
+    and never indexed. Digests of database are `DatabaseDigests`, they are
+    queried by lookups
+    """
+    if baseline_file.is_dir():
+        return ShardedDigests(
+            baseline_file, read_baseline_format(baseline_file)
+        )
+    if is_database(baseline_file):
+        return DatabaseDigests(
+            baseline_file, read_baseline_format(baseline_file).scheme
+        )
+    with timings.span('load baseline'):
+        if _digests_cache is None:
+            digests = _load_digests(baseline_file, use_index)
+        else:
+            digests = _load_cached_digests(
+                baseline_file, use_index, _digests_cache
+            )
+    timings.count('baseline size', len(digests))
     return digests
 
 
+def enable_digests_cache() -> DigestsCache:
+    """Keep digests of loaded baselines in memory, used by `linthell serve`.
+
+    Baseline is reloaded once its file is replaced or modified.
+    """
+    global _digests_cache
+    _digests_cache = {}
+    return _digests_cache
+
+
+def get_digests_cache() -> Optional[DigestsCache]:
+    """Get cached digests, None if cache is disabled."""
+    return _digests_cache
+
+
+def _load_cached_digests(
+    baseline_file: Path, use_index: bool, cache: DigestsCache
+) -> Union[Set[Digest], DigestIndex]:
+    """Get digests from cache, load them if baseline is changed."""
+    stat = baseline_file.stat()
+    stamp = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    key = (baseline_file.resolve(), use_index)
+    cached = cache.get(key)
+    if cached is not None and cached.stamp == stamp:
+        timings.count('cached baseline', 1)
+        return cached.digests
+    digests = _load_digests(baseline_file, use_index)
+    cache[key] = CachedDigests(stamp, digests)
+    return digests
+
+
+def _load_digests(
+    baseline_file: Path, use_index: bool
+) -> Union[Set[Digest], DigestIndex]:
+    """Load digests from baseline file or its binary index."""
+    baseline_format = read_baseline_format(baseline_file)
+    scheme = baseline_format.scheme
+    if baseline_format.digests_only or not use_index:
+        # Sorted digests are loaded as fast as index, so it isn't used
+        _, lines = _read_baseline(baseline_file)
+        return _lines_to_digests(lines, baseline_format)
+
+    index = open_digest_index(baseline_file, scheme)
+    if index is None:
+        stamp = get_baseline_stamp(baseline_file)
+        index = DigestIndex.from_id_lines(load_baseline(baseline_file), scheme)
+        with suppress(OSError):
+            save_digest_index(baseline_file, index, stamp)
+    return index
+
+
+def _lines_to_digests(
+    lines: List[str], baseline_format: BaselineFormat
+) -> Union[Set[Digest], DigestIndex]:
+    """Convert raw lines of baseline to digests."""
+    if baseline_format.digests_only:
+        return _digests_to_index(lines, baseline_format.scheme)
+    id_lines = _decode_id_lines(lines)
+    if baseline_format == LEGACY_FORMAT:
+        return {id_line_to_digest(id_line) for id_line in id_lines}
+    return DigestIndex.from_id_lines(id_lines, baseline_format.scheme)
+
+
+def _digests_to_index(
+    digests: List[Digest], scheme: DigestScheme
+) -> DigestIndex:
+    """Convert hex digests of baseline to in-memory index."""
+    digests.sort()
+    try:
+        raw_digests = bytes.fromhex(''.join(digests))
+    except ValueError:
+        raise BaselineFormatError('Baseline contains invalid digests')
+    if len(raw_digests) != len(digests) * scheme.size:
+        raise BaselineFormatError(
+            f'Baseline contains digests not of {scheme.name} size'
+        )
+    return DigestIndex.from_raw_digests(raw_digests, scheme)
+
+
 def generate_baseline(
-    linter_output: str, plugin: LinthellPlugin
+    linter_output: str, plugin: LinthellPlugin, jobs: Optional[int] = None
 ) -> List[IdLine]:
     """Generate id lines based on linter output."""
-    return [
-        linter_error.id_line for linter_error in plugin.parse(linter_output)
-    ]
+    return generate_baseline_by_chunks([linter_output], plugin, jobs)
 
 
-def load_baseline(baseline_file: Path) -> List[IdLine]:
-    """Load id lines from baseline file. Handles special characters."""
-    id_lines_raw = Path(baseline_file).read_text().splitlines()
-    id_lines = [
-        id_line.encode('utf-8').decode('unicode_escape')
-        for id_line in id_lines_raw
-    ]
+def generate_baseline_by_chunks(
+    chunks: Iterable[str], plugin: LinthellPlugin, jobs: Optional[int] = None
+) -> List[IdLine]:
+    """Generate id lines based on linter output provided by chunks.
+
+    Only id lines are kept in memory, not the linter output itself.
+
+    :param jobs: count of processes to parse output in parallel, it's parsed
+    serially by default or if plugin can't split output
+    """
+    if jobs is not None and jobs > 1 and is_splittable(plugin):
+        id_lines = list(
+            timings.timed('parse', iter_id_lines(chunks, plugin, jobs))
+        )
+    else:
+        linter_errors = timings.timed('parse', plugin.iter_parse(chunks))
+        id_lines = [linter_error.id_line for linter_error in linter_errors]
+    timings.count('errors', len(id_lines))
     return id_lines
 
 
-def save_baseline(baseline_file: Path, id_lines: List[IdLine]) -> None:
-    """Save id lines into baseline file. Handles special characters."""
-    id_lines_raw = [
+def generate_baseline_from_input(
+    linter_input: LinterInput,
+    plugin: LinthellPlugin,
+    jobs: Optional[int] = None,
+) -> List[IdLine]:
+    """Generate id lines based on linter output read from stdin or file.
+
+    Memory mapped output is parsed directly if plugin supports it, see
+    `generate_baseline_by_chunks` for parameters.
+    """
+    if jobs is not None and jobs > 1 and is_splittable(plugin):
+        return generate_baseline_by_chunks(
+            linter_input.iter_chunks(), plugin, jobs
+        )
+    linter_errors = timings.timed('parse', linter_input.iter_parse(plugin))
+    id_lines = [linter_error.id_line for linter_error in linter_errors]
+    timings.count('errors', len(id_lines))
+    return id_lines
+
+
+def update_baseline(
+    id_lines: Iterable[IdLine],
+    linter_errors: Iterable[LinterError],
+    paths: AbstractSet[str],
+) -> List[IdLine]:
+    """Replace id lines of files with id lines of their new errors.
+
+    Id lines of other files are kept untouched, errors of other files are
+    skipped (linters can report errors of imported files).
+
+    :param id_lines: id lines of existing baseline
+    :param linter_errors: errors of linter executed against updated files
+    :param paths: normalized paths of updated files, deleted ones included
+    :return: updated id lines
+    """
+    updated_id_lines = [
+        id_line
+        for id_line in id_lines
+        if id_line_to_path(id_line) not in paths
+    ]
+    updated_id_lines.extend(
+        linter_error.id_line
+        for linter_error in linter_errors
+        if (linter_error.path or id_line_to_path(linter_error.id_line))
+        in paths
+    )
+    return updated_id_lines
+
+
+def _read_baseline(
+    baseline_file: Path, paths: Optional[Iterable[str]] = None
+) -> Tuple[BaselineFormat, List[str]]:
+    """Read format and raw lines of baseline, header isn't included.
+
+    :param paths: read only shards of these files if baseline is sharded
+    """
+    if baseline_file.is_dir():
+        baseline_format = read_baseline_format(baseline_file)
+        if paths is None:
+            shard_files = list(
+                _iter_shards(baseline_file, baseline_format.shards)
+            )
+        else:
+            shards = baseline_format.shards
+            shard_names = {get_shard_name(path, shards) for path in paths}
+            shard_files = [baseline_file / name for name in shard_names]
+        lines = []
+        for shard_file in shard_files:
+            lines.extend(_read_shard(shard_file, baseline_format))
+        return baseline_format, lines
+    lines = Path(baseline_file).read_text().splitlines()
+    baseline_format = parse_baseline_header(lines[0] if lines else '')
+    if baseline_format != LEGACY_FORMAT:
+        del lines[0]
+    if baseline_format.digests_only:
+        lines = [line.lower() for line in lines if line]
+    return baseline_format, lines
+
+
+def _iter_shards(baseline_dir: Path, shards: int) -> Iterator[Path]:
+    """Iterate over existing shard files of baseline directory.
+
+    Only files named as shards of baseline are listed, other files of
+    directory are never read or overwritten.
+
+    :param shards: count of shards of baseline
+    """
+    shard_names = {
+        _format_shard_name(shard, shards) for shard in range(shards)
+    }
+    for path in sorted(baseline_dir.iterdir()):
+        if path.name in shard_names and path.is_file():
+            yield path
+
+
+def _read_shard(
+    shard_file: Path, baseline_format: BaselineFormat
+) -> List[str]:
+    """Read raw lines of shard, missing shard is empty."""
+    try:
+        lines = shard_file.read_text().splitlines()
+    except FileNotFoundError:
+        return []
+    if baseline_format.digests_only:
+        return [line.lower() for line in lines if line]
+    return lines
+
+
+def _decode_id_lines(lines: Iterable[str]) -> List[IdLine]:
+    """Decode raw lines of baseline to id lines."""
+    return [line.encode('utf-8').decode('unicode_escape') for line in lines]
+
+
+def _encode_lines(
+    id_lines: Iterable[IdLine], baseline_format: BaselineFormat
+) -> List[str]:
+    """Encode id lines to sorted raw lines of baseline."""
+    if baseline_format.digests_only:
+        scheme = baseline_format.scheme
+        return sorted({scheme.digest(id_line) for id_line in id_lines})
+    return sorted(
         id_line.encode('unicode_escape').decode('utf-8')
         for id_line in id_lines
+    )
+
+
+def load_baseline(
+    baseline_file: Path, paths: Optional[Iterable[str]] = None
+) -> List[IdLine]:
+    """Load id lines from baseline file. Handles special characters.
+
+    :param paths: normalized paths of files, only shards storing them are
+    loaded from sharded baseline (they contain entries of other files too),
+    only their entries are loaded from database. Baseline file is loaded as
+    a whole anyway
+    :raise BaselineFormatError: if baseline stores digests only
+    """
+    database = is_database(baseline_file)
+    id_lines_raw: List[str] = []
+    if database:
+        baseline_format = read_baseline_format(baseline_file)
+    else:
+        baseline_format, id_lines_raw = _read_baseline(baseline_file, paths)
+    if baseline_format.digests_only:
+        raise BaselineFormatError(
+            f'Baseline {baseline_file} stores digests only, id lines of '
+            f'errors are not available, regenerate baseline instead'
+        )
+    if database:
+        try:
+            return load_id_lines(baseline_file, paths)
+        except DatabaseError as error:
+            raise BaselineFormatError(str(error))
+    return _decode_id_lines(id_lines_raw)
+
+
+def save_baseline(
+    baseline_file: Path,
+    id_lines: List[IdLine],
+    baseline_format: BaselineFormat = LEGACY_FORMAT,
+    paths: Optional[Iterable[str]] = None,
+) -> None:
+    """Save id lines into baseline file. Handles special characters.
+
+    :param baseline_format: format of baseline, header is written for
+    all formats except legacy one. Sharded baseline is saved as directory,
+    database is saved as SQLite file, they replace baseline of other
+    storage once they're written completely
+    :param paths: normalized paths of files, only shards storing them are
+    saved into sharded baseline, id lines must contain all entries of these
+    shards. Only entries of these files (and files of id lines) are
+    replaced in database. Baseline file (and baseline replacing another
+    storage) is saved as a whole anyway
+    :raise BaselineFormatError: if database can't be written or existing
+    directory isn't a baseline, see `is_baseline_dir`
+    """
+    with timings.span('save baseline'):
+        if baseline_format.sqlite:
+            other_storage = baseline_file.is_dir() or (
+                baseline_file.is_file() and not is_database(baseline_file)
+            )
+        elif baseline_format.shards:
+            other_storage = baseline_file.is_file()
+        else:
+            other_storage = baseline_file.is_dir() or is_database(
+                baseline_file
+            )
+        if other_storage:
+            _replace_storage(baseline_file, id_lines, baseline_format)
+        else:
+            _save_storage(baseline_file, id_lines, baseline_format, paths)
+    timings.count('baseline size', len(id_lines))
+
+
+def _save_storage(
+    baseline_file: Path,
+    id_lines: Iterable[IdLine],
+    baseline_format: BaselineFormat,
+    paths: Optional[Iterable[str]],
+) -> None:
+    """Save id lines into baseline of the same storage or a new one."""
+    if baseline_format.sqlite:
+        _save_database(baseline_file, id_lines, baseline_format, paths)
+    elif baseline_format.shards:
+        _save_shards(baseline_file, id_lines, baseline_format, paths)
+    else:
+        lines = _encode_lines(id_lines, baseline_format)
+        if baseline_format != LEGACY_FORMAT:
+            lines.insert(0, format_baseline_header(baseline_format))
+        baseline_file.write_text('\n'.join(lines))
+
+
+def _replace_storage(
+    baseline_file: Path,
+    id_lines: Iterable[IdLine],
+    baseline_format: BaselineFormat,
+) -> None:
+    """Replace baseline of another storage with the new one.
+
+    New baseline is saved into temporary directory next to the old one,
+    the old one is removed only once the new one is written completely.
+    """
+    if baseline_file.is_dir():
+        # Directory which can't be removed is rejected before writing
+        _list_baseline_dir(baseline_file)
+    temp_dir = Path(
+        tempfile.mkdtemp(
+            prefix=f'.{baseline_file.name}.', dir=baseline_file.parent
+        )
+    )
+    new_file = temp_dir / baseline_file.name
+    try:
+        _save_storage(new_file, id_lines, baseline_format, None)
+    except BaseException:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+    if baseline_file.is_dir():
+        _remove_baseline_dir(baseline_file)
+    else:
+        _remove_baseline_file(baseline_file)
+    os.replace(new_file, baseline_file)
+    # Database may leave its journal files
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _save_shards(
+    baseline_dir: Path,
+    id_lines: Iterable[IdLine],
+    baseline_format: BaselineFormat,
+    paths: Optional[Iterable[str]],
+) -> None:
+    """Save id lines into shards of baseline directory.
+
+    Only shards with changed content are written, so unchanged shards keep
+    their modification time and don't conflict on merge. Empty shards are
+    removed.
+
+    :raise BaselineFormatError: if directory exists, but it isn't empty and
+    isn't a baseline
+    """
+    old_shards = 0
+    if baseline_dir.is_dir() and any(baseline_dir.iterdir()):
+        old_shards = read_baseline_format(baseline_dir).shards
+    shards = baseline_format.shards
+    shard_id_lines: Dict[str, List[IdLine]] = defaultdict(list)
+    for id_line in id_lines:
+        shard_name = get_shard_name(id_line_to_path(id_line), shards)
+        shard_id_lines[shard_name].append(id_line)
+    if paths is None:
+        shard_names = set(shard_id_lines)
+        if old_shards:
+            shard_names.update(
+                shard.name for shard in _iter_shards(baseline_dir, old_shards)
+            )
+    else:
+        shard_names = {get_shard_name(path, shards) for path in paths}
+
+    baseline_dir.mkdir(parents=True, exist_ok=True)
+    _write_if_changed(
+        baseline_dir / _MANIFEST_NAME, format_baseline_header(baseline_format)
+    )
+    written_count = 0
+    for shard_name in sorted(shard_names):
+        shard_file = baseline_dir / shard_name
+        lines = _encode_lines(shard_id_lines[shard_name], baseline_format)
+        if not lines:
+            with suppress(FileNotFoundError):
+                shard_file.unlink()
+        elif _write_if_changed(shard_file, '\n'.join(lines)):
+            written_count += 1
+    timings.count('written shards', written_count)
+
+
+def _save_database(
+    database_path: Path,
+    id_lines: Iterable[IdLine],
+    baseline_format: BaselineFormat,
+    paths: Optional[Iterable[str]],
+) -> None:
+    """Replace entries of baseline database in a single transaction."""
+    scheme = baseline_format.scheme
+    entries: Iterable[Entry]
+    if baseline_format.digests_only:
+        entries = {
+            (id_line_to_path(id_line), scheme.raw_digest(id_line), None)
+            for id_line in id_lines
+        }
+    else:
+        entries = [
+            (id_line_to_path(id_line), scheme.raw_digest(id_line), id_line)
+            for id_line in id_lines
+        ]
+    if paths is not None:
+        paths = {*paths, *(path for path, _, _ in entries)}
+    try:
+        save_entries(
+            database_path,
+            format_baseline_header(baseline_format),
+            entries,
+            paths,
+        )
+    except DatabaseError as error:
+        raise BaselineFormatError(str(error))
+
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    """Write content into file unless it's already there.
+
+    :return: was file written
+    """
+    with suppress(FileNotFoundError):
+        if path.read_text() == content:
+            return False
+    path.write_text(content)
+    return True
+
+
+def migrate_baseline(
+    baseline_file: Path, baseline_format: BaselineFormat
+) -> None:
+    """Convert baseline to another format.
+
+    Baseline file is replaced with directory once it's converted to sharded
+    format and vice versa, the same for SQLite database. Converted baseline
+    is written next to the old one and replaces it only once it's complete,
+    the old baseline is kept if conversion fails.
+
+    :raise BaselineFormatError: if baseline stores digests only, they can't
+    be converted to another format
+    """
+    if read_baseline_format(baseline_file) == baseline_format:
+        return
+    id_lines = load_baseline(baseline_file)
+    with timings.span('save baseline'):
+        _replace_storage(baseline_file, id_lines, baseline_format)
+    timings.count('baseline size', len(id_lines))
+
+
+@dataclass
+class GcReport:
+    """Report from collecting stale entries of baseline."""
+
+    entries: int = 0
+    """Count of entries before collection."""
+    missing_file_entries: int = 0
+    """Removed entries of files which don't exist anymore."""
+    stale_entries: int = 0
+    """Removed entries which linter doesn't report anymore."""
+    size_before: int = 0
+    """Size of baseline in bytes before collection."""
+    size_after: int = 0
+
+    @property
+    def removed_entries(self) -> int:
+        """Count of all removed entries."""
+        return self.missing_file_entries + self.stale_entries
+
+
+class _StaleEntries:
+    """Decides which entries are stale, entries come grouped by path.
+
+    Existence of each file is checked once, for the first of its entries.
+    """
+
+    def __init__(
+        self, report: GcReport, current_digests: Optional[Set[bytes]]
+    ) -> None:  # noqa: D107
+        self.report = report
+        self.current_digests = current_digests
+        """Raw digests of errors linter reports now, None if unknown."""
+        self._path: Optional[str] = None
+        self._path_exists = True
+
+    def is_stale(self, path: Optional[str], digest: Optional[bytes]) -> bool:
+        """Check if entry is stale and count it.
+
+        :param path: normalized path of file, None if it's unknown
+        :param digest: raw digest of entry, it's ignored (and may be None)
+        if current digests are unknown
+        """
+        self.report.entries += 1
+        if path is not None:
+            if path != self._path:
+                self._path = path
+                self._path_exists = os.path.lexists(path)
+            if not self._path_exists:
+                self.report.missing_file_entries += 1
+                return True
+        if (
+            digest is not None
+            and self.current_digests is not None
+            and digest not in self.current_digests
+        ):
+            self.report.stale_entries += 1
+            return True
+        return False
+
+
+def gc_baseline(
+    baseline_file: Path, current_id_lines: Optional[Iterable[IdLine]] = None
+) -> GcReport:
+    """Remove stale entries of baseline in a single pass.
+
+    Entries of files which don't exist anymore are removed. Baseline is
+    streamed: text baseline is rewritten line by line, shards are rewritten
+    one by one and database entries are removed in a single transaction.
+    Baseline is written only if entries are removed.
+
+    :param current_id_lines: id lines of linter run against all files,
+    entries which don't match any of them are removed too
+    :raise BaselineFormatError: if baseline stores digests only (without
+    paths) and current id lines aren't provided
+    """
+    baseline_format = read_baseline_format(baseline_file)
+    if (
+        baseline_format.digests_only
+        and not baseline_format.sqlite
+        and current_id_lines is None
+    ):
+        raise BaselineFormatError(
+            f'Baseline {baseline_file} stores digests only, paths of its '
+            f'entries are unknown, provide linter output to collect them'
+        )
+    current_digests = None
+    if current_id_lines is not None:
+        # Lookups in set are several times faster than in compact index,
+        # it's not larger than current id lines anyway
+        scheme = baseline_format.scheme
+        current_digests = {
+            scheme.raw_digest(id_line) for id_line in current_id_lines
+        }
+    report = GcReport(size_before=_get_baseline_size(baseline_file))
+    stale_entries = _StaleEntries(report, current_digests)
+    with timings.span('gc baseline'):
+        if baseline_format.sqlite:
+            _gc_database(baseline_file, stale_entries)
+        elif baseline_format.shards:
+            _gc_shards(baseline_file, baseline_format, stale_entries)
+        else:
+            _gc_baseline_file(baseline_file, baseline_format, stale_entries)
+    report.size_after = _get_baseline_size(baseline_file)
+    timings.count('baseline size', report.entries - report.removed_entries)
+    return report
+
+
+def _iter_live_lines(
+    lines: Iterable[str],
+    baseline_format: BaselineFormat,
+    stale_entries: _StaleEntries,
+) -> Iterator[str]:
+    """Skip raw lines of stale entries, lines must be sorted."""
+    scheme = baseline_format.scheme
+    check_digests = stale_entries.current_digests is not None
+    for line in lines:
+        path = None
+        digest = None
+        if baseline_format.digests_only:
+            try:
+                digest = bytes.fromhex(line)
+            except ValueError:
+                raise BaselineFormatError('Baseline contains invalid digests')
+        else:
+            id_line = line.encode('utf-8').decode('unicode_escape')
+            path = id_line_to_path(id_line)
+            if check_digests:
+                digest = scheme.raw_digest(id_line)
+        if not stale_entries.is_stale(path, digest):
+            yield line
+
+
+def _gc_baseline_file(
+    baseline_file: Path,
+    baseline_format: BaselineFormat,
+    stale_entries: _StaleEntries,
+) -> None:
+    """Rewrite baseline file without stale entries, replace it atomically."""
+    with baseline_file.open() as file, tempfile.NamedTemporaryFile(
+        'w', dir=baseline_file.parent, prefix=baseline_file.name, delete=False
+    ) as new_file:
+        try:
+            lines = (line.rstrip('\n') for line in file)
+            separator = ''
+            if baseline_format != LEGACY_FORMAT:
+                new_file.write(next(lines))
+                separator = '\n'
+            if baseline_format.digests_only:
+                lines = (line for line in lines if line)
+            for line in _iter_live_lines(
+                lines, baseline_format, stale_entries
+            ):
+                new_file.write(separator + line)
+                separator = '\n'
+        except BaseException:
+            os.unlink(new_file.name)
+            raise
+    try:
+        if not stale_entries.report.removed_entries:
+            os.unlink(new_file.name)
+            return
+        os.chmod(new_file.name, baseline_file.stat().st_mode)
+        os.replace(new_file.name, baseline_file)
+    except OSError:
+        with suppress(FileNotFoundError):
+            os.unlink(new_file.name)
+        raise
+
+
+def _gc_shards(
+    baseline_dir: Path,
+    baseline_format: BaselineFormat,
+    stale_entries: _StaleEntries,
+) -> None:
+    """Rewrite shards with stale entries, empty shards are removed."""
+    report = stale_entries.report
+    written_count = 0
+    for shard_file in list(_iter_shards(baseline_dir, baseline_format.shards)):
+        removed_before = report.removed_entries
+        lines = list(
+            _iter_live_lines(
+                _read_shard(shard_file, baseline_format),
+                baseline_format,
+                stale_entries,
+            )
+        )
+        if report.removed_entries == removed_before:
+            continue
+        if lines:
+            shard_file.write_text('\n'.join(lines))
+            written_count += 1
+        else:
+            shard_file.unlink()
+    timings.count('written shards', written_count)
+
+
+def _gc_database(database_path: Path, stale_entries: _StaleEntries) -> None:
+    """Remove stale entries of database in a single transaction."""
+    try:
+        remove_entries(database_path, stale_entries.is_stale)
+    except DatabaseError as error:
+        raise BaselineFormatError(str(error))
+
+
+def _get_baseline_size(baseline_file: Path) -> int:
+    """Get size of baseline in bytes, shards and manifest included."""
+    if baseline_file.is_dir():
+        return sum(
+            path.stat().st_size
+            for path in baseline_file.iterdir()
+            if path.is_file()
+        )
+    return baseline_file.stat().st_size
+
+
+def _remove_baseline_file(baseline_file: Path) -> None:
+    """Remove baseline file (or database) with its index."""
+    if is_database(baseline_file):
+        remove_database(baseline_file)
+        return
+    baseline_file.unlink()
+    with suppress(FileNotFoundError):
+        get_index_path(baseline_file).unlink()
+
+
+def _list_baseline_dir(baseline_dir: Path) -> List[Path]:
+    """List shards and manifest of baseline directory to remove them.
+
+    :raise BaselineFormatError: if directory isn't a baseline or it contains
+    other files
+    """
+    baseline_format = read_baseline_format(baseline_dir)
+    files = [
+        *_iter_shards(baseline_dir, baseline_format.shards),
+        baseline_dir / _MANIFEST_NAME,
     ]
-    baseline_file.write_text('\n'.join(sorted(id_lines_raw)))
+    other_files = set(baseline_dir.iterdir()).difference(files)
+    if other_files:
+        raise BaselineFormatError(
+            f'Baseline directory {baseline_dir} contains other files, it '
+            f'can not be replaced: '
+            + ', '.join(sorted(path.name for path in other_files))
+        )
+    return files
+
+
+def _remove_baseline_dir(baseline_dir: Path) -> None:
+    """Remove shards and manifest of baseline directory, then itself.
+
+    :raise BaselineFormatError: if directory can't be removed, see
+    `_list_baseline_dir`, nothing is removed then
+    """
+    for path in _list_baseline_dir(baseline_dir):
+        path.unlink()
+    baseline_dir.rmdir()
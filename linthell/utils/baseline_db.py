@@ -0,0 +1,265 @@
+"""SQLite storage of baselines.
+
+Database keeps entries of baseline: normalized path of file, binary digest
+and id line (unless baseline stores digests only), indexed by digest and by
+path, and the header of baseline format. Errors are looked up by queries, so
+only digests of errors present in linter output are read. Entries of files
+are replaced in a single transaction. Database is in WAL mode: parallel
+hooks read it while it's updated.
+
+Text baseline stays the default and exchange format, see `migrate-baseline`.
+Module `sqlite3` is imported only once a database is accessed.
+"""
+
+from contextlib import closing, contextmanager, suppress
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from linthell.utils import timings
+from linthell.utils.id_lines import DigestScheme
+from linthell.utils.types import IdLine
+
+if TYPE_CHECKING:
+    import sqlite3
+
+SQLITE_MAGIC = b'SQLite format 3\x00'
+"""The first bytes of SQLite database file."""
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS meta '
+    '(key TEXT PRIMARY KEY, value TEXT NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS entries '
+    '(path TEXT NOT NULL, digest BLOB NOT NULL, id_line TEXT)',
+    'CREATE INDEX IF NOT EXISTS entries_by_digest ON entries (digest)',
+    'CREATE INDEX IF NOT EXISTS entries_by_path ON entries (path)',
+)
+_HEADER_KEY = 'header'
+_BUSY_TIMEOUT = 30.0
+"""Seconds to wait for a concurrent writer to finish its transaction."""
+_MAX_QUERY_PATHS = 500
+"""Paths per query, SQLite limits count of query parameters."""
+_DATABASE_SUFFIXES = ('-wal', '-shm', '-journal')
+
+Entry = Tuple[str, bytes, Optional[IdLine]]
+"""Normalized path, raw digest and id line (None for digests only)."""
+
+
+class DatabaseError(Exception):
+    """File isn't a baseline database or it can't be accessed."""
+
+
+def is_database(path: Path) -> bool:
+    """Check if file is SQLite database by its first bytes."""
+    with suppress(OSError):
+        with path.open('rb') as file:
+            return file.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    return False
+
+
+class DatabaseDigests:
+    """Digests of baseline database, each lookup is an indexed query.
+
+    Supports `in` operator with hex digests. Database is opened on the
+    first lookup.
+    """
+
+    def __init__(
+        self, database_path: Path, scheme: DigestScheme
+    ) -> None:  # noqa: D107
+        self.database_path = database_path
+        self.scheme = scheme
+        self._connection: Optional['sqlite3.Connection'] = None
+        self._lookup_span = timings.span('query baseline')
+
+    def __contains__(self, digest: object) -> bool:
+        if not isinstance(digest, str):
+            return False
+        try:
+            raw_digest = bytes.fromhex(digest)
+        except ValueError:
+            return False
+        with self._lookup_span, _database_errors(self.database_path):
+            if self._connection is None:
+                self._connection = _connect(self.database_path, False)
+            row = self._connection.execute(
+                'SELECT 1 FROM entries WHERE digest = ? LIMIT 1',
+                (raw_digest,),
+            ).fetchone()
+        return row is not None
+
+
+def read_header(database_path: Path) -> str:
+    """Read header of baseline format stored in database.
+
+    :raise DatabaseError: if database isn't a baseline
+    """
+    with _database_errors(database_path):
+        with closing(_connect(database_path, False)) as connection:
+            row = connection.execute(
+                'SELECT value FROM meta WHERE key = ?', (_HEADER_KEY,)
+            ).fetchone()
+    if row is None:
+        raise DatabaseError(f'Database {database_path} has no baseline')
+    return str(row[0])
+
+
+def load_id_lines(
+    database_path: Path, paths: Optional[Iterable[str]] = None
+) -> List[IdLine]:
+    """Load sorted id lines of database entries.
+
+    :param paths: normalized paths of files, only their entries are loaded
+    :raise DatabaseError: if database can't be read
+    """
+    id_lines: List[IdLine] = []
+    with timings.span('load baseline'), _database_errors(database_path):
+        with closing(_connect(database_path, False)) as connection:
+            if paths is None:
+                query = 'SELECT id_line FROM entries'
+                id_lines.extend(row[0] for row in connection.execute(query))
+            else:
+                for paths_chunk in _chunks(sorted(set(paths))):
+                    query = (
+                        'SELECT id_line FROM entries WHERE path IN '
+                        f'({", ".join("?" * len(paths_chunk))})'
+                    )
+                    id_lines.extend(
+                        row[0]
+                        for row in connection.execute(query, paths_chunk)
+                    )
+    id_lines.sort()
+    return id_lines
+
+
+def save_entries(
+    database_path: Path,
+    header: str,
+    entries: Iterable[Entry],
+    paths: Optional[Iterable[str]] = None,
+) -> None:
+    """Replace entries of database in a single transaction.
+
+    Database is created if it doesn't exist. Readers see either old or new
+    entries, concurrent writers wait for each other.
+
+    :param header: header of baseline format
+    :param entries: new entries
+    :param paths: normalized paths of files, only their entries are
+    replaced, entries must belong to these files. All entries are replaced
+    by default
+    :raise DatabaseError: if database can't be written
+    """
+    with _database_errors(database_path):
+        with closing(_connect(database_path, True)) as connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            connection.execute('PRAGMA journal_mode=WAL')
+            with _transaction(connection):
+                connection.execute(
+                    'INSERT OR REPLACE INTO meta VALUES (?, ?)',
+                    (_HEADER_KEY, header),
+                )
+                if paths is None:
+                    connection.execute('DELETE FROM entries')
+                else:
+                    connection.executemany(
+                        'DELETE FROM entries WHERE path = ?',
+                        ((path,) for path in paths),
+                    )
+                connection.executemany(
+                    'INSERT INTO entries VALUES (?, ?, ?)', entries
+                )
+
+
+def remove_entries(
+    database_path: Path, is_removed: Callable[[str, bytes], bool]
+) -> int:
+    """Remove entries chosen by predicate in a single transaction.
+
+    Entries are streamed in order of paths, free space is reclaimed once
+    entries are removed.
+
+    :param is_removed: called with path and raw digest of each entry
+    :return: count of removed entries
+    :raise DatabaseError: if database can't be written
+    """
+    with _database_errors(database_path):
+        with closing(_connect(database_path, False)) as connection:
+            with _transaction(connection):
+                removed_rows = [
+                    (rowid,)
+                    for rowid, path, digest in connection.execute(
+                        'SELECT rowid, path, digest FROM entries ORDER BY path'
+                    )
+                    if is_removed(path, digest)
+                ]
+                connection.executemany(
+                    'DELETE FROM entries WHERE rowid = ?', removed_rows
+                )
+            if removed_rows:
+                connection.execute('VACUUM')
+    return len(removed_rows)
+
+
+def remove_database(database_path: Path) -> None:
+    """Remove database with its journal files."""
+    database_path.unlink()
+    for suffix in _DATABASE_SUFFIXES:
+        with suppress(FileNotFoundError):
+            Path(f'{database_path}{suffix}').unlink()
+
+
+def _connect(database_path: Path, create: bool) -> 'sqlite3.Connection':
+    """Open database, transactions are controlled explicitly.
+
+    Readers don't create database, but they open it writable: the last
+    closed connection removes WAL files, read only one leaves them.
+    """
+    import sqlite3
+
+    mode = 'rwc' if create else 'rw'
+    return sqlite3.connect(
+        f'{database_path.resolve().as_uri()}?mode={mode}',
+        uri=True,
+        timeout=_BUSY_TIMEOUT,
+        isolation_level=None,
+    )
+
+
+@contextmanager
+def _transaction(connection: 'sqlite3.Connection') -> Iterator[None]:
+    """Run statements in transaction, concurrent writers wait for it."""
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        yield
+    except BaseException:
+        connection.execute('ROLLBACK')
+        raise
+    connection.execute('COMMIT')
+
+
+@contextmanager
+def _database_errors(database_path: Path) -> Iterator[None]:
+    """Convert errors of sqlite3 into DatabaseError."""
+    import sqlite3
+
+    try:
+        yield
+    except sqlite3.Error as error:
+        raise DatabaseError(
+            f'Baseline database {database_path}: {error}'
+        ) from error
+
+
+def _chunks(paths: Sequence[str]) -> Iterator[Sequence[str]]:
+    for start in range(0, len(paths), _MAX_QUERY_PATHS):
+        end = start + _MAX_QUERY_PATHS
+        yield paths[start:end]
@@ -0,0 +1,25 @@
+"""Local caches of linthell."""
+
+import os
+import sys
+from pathlib import Path
+
+CACHE_DIR_ENV = 'LINTHELL_CACHE_DIR'
+
+
+def get_cache_dir() -> Path:
+    """Get root directory of linthell caches.
+
+    Set by `LINTHELL_CACHE_DIR` environment variable, by default it's
+    `linthell` directory inside user cache directory.
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir:
+        return Path(cache_dir)
+    if sys.platform == 'win32':
+        user_cache_dir = os.environ.get('LOCALAPPDATA')
+    else:
+        user_cache_dir = os.environ.get('XDG_CACHE_HOME')
+    if not user_cache_dir:
+        user_cache_dir = str(Path.home() / '.cache')
+    return Path(user_cache_dir) / 'linthell'
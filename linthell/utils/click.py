@@ -1,6 +1,8 @@
-from typing import Any, List, Mapping, Optional, Tuple
+import importlib
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 import click
+from click.shell_completion import CompletionItem
 
 
 class Mutex(click.Option):
@@ -39,3 +41,86 @@ class Mutex(click.Option):
                 else:
                     self.prompt = None
         return super(Mutex, self).handle_parse_result(ctx, opts, args)
+
+
+class LazyGroup(click.Group):
+    """Group which imports modules of its commands only once they're used.
+
+    Commands are provided by import paths `<module>:<attribute>`, so
+    `linthell lint` doesn't import other commands with their dependencies.
+    Subgroups must be added eagerly with `add_command` (keep their modules
+    cheap to import): config is mapped to commands before the invoked command
+    is known, see `create_default_map`.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        lazy_commands: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ):  # noqa: D107
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+        """Import paths of commands by their names."""
+
+    def list_commands(self, ctx: click.Context) -> List[str]:  # noqa: D102
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(
+        self, ctx: click.Context, cmd_name: str
+    ) -> Optional[click.Command]:  # noqa: D102
+        if cmd_name in self.lazy_commands and cmd_name not in self.commands:
+            self.add_command(
+                _import_command(self.lazy_commands[cmd_name]), cmd_name
+            )
+        return super().get_command(ctx, cmd_name)
+
+
+def _import_command(import_path: str) -> click.Command:
+    """Import command by path `<module>:<attribute>`."""
+    module_name, _, attribute = import_path.partition(':')
+    command = getattr(importlib.import_module(module_name), attribute)
+    if not isinstance(command, click.Command):
+        raise TypeError(f'{import_path} is not a click command')
+    return command
+
+
+class PluginName(click.ParamType):
+    """Name of linthell plugin.
+
+    Unlike `click.Choice`, available plugins are looked up only when
+    the option is used, so other commands and `--help` start faster.
+    """
+
+    name = 'plugin'
+
+    def convert(
+        self,
+        value: Any,
+        param: Optional[click.Parameter],
+        ctx: Optional[click.Context],
+    ) -> str:  # noqa: D102
+        # Plugins aren't imported by modules of groups, see `LazyGroup`
+        from linthell.plugins.base import get_plugin_names
+
+        plugin_names = get_plugin_names()
+        if value not in plugin_names:
+            self.fail(
+                f'{value!r} is not one of '
+                + ', '.join(map(repr, plugin_names))
+                + '.',
+                param,
+                ctx,
+            )
+        return str(value)
+
+    def shell_complete(
+        self, ctx: click.Context, param: click.Parameter, incomplete: str
+    ) -> List[CompletionItem]:  # noqa: D102
+        from linthell.plugins.base import get_plugin_names
+
+        return [
+            CompletionItem(name)
+            for name in get_plugin_names()
+            if name.startswith(incomplete)
+        ]
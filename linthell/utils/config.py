@@ -1,8 +1,8 @@
 """Utilities for config files."""
 from configparser import ConfigParser
-from typing import Any, Dict, MutableMapping, Union
+from typing import Any, Dict, Union
 
-from click import Command, Group
+from click import Context, Group
 
 
 def config_to_dict(config_parser: ConfigParser) -> Dict[str, Dict[str, str]]:
@@ -32,32 +32,62 @@ def get_by_dotted_path(d: Dict[str, Any], path: str) -> Any:
 
 ConfigMap = Dict[str, Union['ConfigMap', str]]
 
+LINTER_SECTION_PREFIX = 'run:'
+"""Prefix of sections with linters for `run` command: [run:<linter name>]."""
+
 
 def create_default_map(
-    common: Dict[str, str], commands: MutableMapping[str, Command]
+    common: Dict[str, str], group: Group, ctx: Context
 ) -> ConfigMap:
-    """Create a config dict with default values."""
+    """Create a config dict with default values.
+
+    Commands of group aren't loaded (see `LazyGroup`), only already loaded
+    ones can be subgroups.
+    """
+    config: ConfigMap = {}
+    for command_name in group.list_commands(ctx):
+        command = group.commands.get(command_name)
+        if isinstance(command, Group):
+            config[command_name] = create_default_map(common, command, ctx)
+        else:
+            config[command_name] = dict(common)
+    return config
+
+
+def read_linter_sections(config_path: str) -> Dict[str, Dict[str, str]]:
+    """Read linters of `run` command from config file.
+
+    Linters are declared in sections [run:<linter name>].
+
+    Output format: {<linter name>: {<key>: <string value>}}
+    """
+    config_parser = ConfigParser()
+    config_parser.read(config_path)
     return {
-        command_name: create_default_map(common, command.commands)  # type: ignore # noqa: E501
-        if isinstance(command, Group)
-        else common
-        for command_name, command in commands.items()
+        section.replace(LINTER_SECTION_PREFIX, '', 1): values
+        for section, values in config_to_dict(config_parser).items()
+        if section.startswith(LINTER_SECTION_PREFIX)
     }
 
 
 def create_config_dict(
-    config_parser: ConfigParser,
-    commands: MutableMapping[str, Command],
+    config_parser: ConfigParser, group: Group, ctx: Context
 ):
     """Create config to be used as click.Context.default_map values.
 
     Supports nested groups.
 
     Top element 'common' will be used as default for all commands.
+
+    Sections [run:<linter name>] declare linters of `run` command, they
+    are skipped (see `read_linter_sections`).
     """
     sections = config_to_dict(config_parser)
     common = sections.pop('common', {})
-    config = create_default_map(common, commands)
+    for section in list(sections):
+        if section.startswith(LINTER_SECTION_PREFIX):
+            del sections[section]
+    config = create_default_map(common, group, ctx)
     for path, values in sorted(sections.items(), key=lambda pair: pair[0]):
         get_by_dotted_path(config, path).update(**values)
     return config
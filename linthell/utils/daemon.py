@@ -0,0 +1,323 @@
+"""Daemon running forwarded commands with warm caches (`linthell serve`).
+
+Daemon accepts commands forwarded by `linthell.client` and runs each one in
+a forked process: commands are isolated from each other and run in parallel
+(pre-commit runs hook for batches of files at once), but they share
+everything daemon has loaded: imported modules, plugins and baselines.
+Baselines loaded by commands are reported back to daemon and loaded by it
+too, so the following commands find them in memory.
+"""
+
+import array
+import os
+import re
+import select
+import signal
+import socket
+import sys
+import traceback
+from contextlib import suppress
+from pathlib import Path
+from typing import IO, List, Optional, Tuple
+
+import click
+
+from linthell.client import (
+    ACCEPTED,
+    EXIT_CODE,
+    FORWARDED_COMMANDS,
+    LENGTH,
+    REJECTED,
+    STDIO_FDS,
+    decode_request,
+    is_forwarded_command,
+    is_private_dir,
+    receive_exactly,
+)
+from linthell.plugins.base import get_plugin_names, load_plugin_by_name
+from linthell.plugins.regex import LinthellRegexPlugin
+from linthell.utils.baseline import (
+    BaselineFormatError,
+    DigestsCache,
+    enable_digests_cache,
+    get_digests_cache,
+    get_digests_from_baseline,
+)
+
+_BACKLOG = 64
+_REQUEST_TIMEOUT = 5.0
+"""Seconds to wait for request after connection is accepted."""
+_REAP_INTERVAL = 1.0
+"""Seconds between checks of finished commands."""
+_REPORT_SEPARATOR = b'\0'
+_MAX_REQUEST_SIZE = 16 * 1024 * 1024
+
+
+class DaemonError(Exception):
+    """Daemon can't be started."""
+
+
+def serve(cli: click.Command, socket_path: str) -> None:
+    """Accept commands forwarded to socket until interrupted.
+
+    :param cli: root command, forwarded arguments are parsed by it
+    :param socket_path: path of Unix socket, its directory must be
+    accessible by the current user only
+    :raise DaemonError: if socket can't be created or daemon is running
+    """
+    if not hasattr(os, 'fork') or not hasattr(socket, 'AF_UNIX'):
+        raise DaemonError('Daemon is not supported on this platform')
+    enable_digests_cache()
+    _preload_commands(cli)
+    _preload_plugins()
+    server = _bind(socket_path)
+    report_reader, report_writer = os.pipe()
+    reported = b''
+    signal.signal(signal.SIGTERM, _exit_on_signal)
+    try:
+        while True:
+            readable, _, _ = select.select(
+                [server.fileno(), report_reader], [], [], _REAP_INTERVAL
+            )
+            if report_reader in readable:
+                reported += os.read(report_reader, 65536)
+                *records, reported = reported.split(_REPORT_SEPARATOR)
+                _load_reported_baselines(records)
+            if server.fileno() in readable:
+                connection, _ = server.accept()
+                with connection:
+                    if os.fork() == 0:
+                        _run_child(
+                            cli,
+                            server,
+                            connection,
+                            report_reader,
+                            report_writer,
+                        )
+            _reap_children()
+    finally:
+        server.close()
+        with suppress(OSError):
+            os.unlink(socket_path)
+
+
+def is_running(socket_path: str) -> bool:
+    """Check if daemon accepts connections on socket."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def _bind(socket_path: str) -> socket.socket:
+    """Create listening socket, replace socket left by dead daemon."""
+    directory = os.path.dirname(socket_path) or '.'
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not is_private_dir(directory):
+        raise DaemonError(
+            f'Directory of socket {directory} must be accessible '
+            'by the current user only'
+        )
+    if os.path.exists(socket_path):
+        if is_running(socket_path):
+            raise DaemonError(f'Daemon is already running on {socket_path}')
+        os.unlink(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(socket_path)
+        os.chmod(socket_path, 0o600)
+        server.listen(_BACKLOG)
+    except OSError as error:
+        server.close()
+        raise DaemonError(f'Cannot listen on {socket_path}: {error}')
+    return server
+
+
+def _preload_commands(cli: click.Command) -> None:
+    """Import modules of forwarded commands, which are imported lazily."""
+    ctx = click.Context(cli)
+    for command_path in FORWARDED_COMMANDS:
+        command: Optional[click.Command] = cli
+        for command_name in command_path:
+            if isinstance(command, click.Group):
+                command = command.get_command(ctx, command_name)
+
+
+def _preload_plugins() -> None:
+    """Import all plugins and compile their patterns.
+
+    Broken plugins are skipped, commands report their errors.
+    """
+    for plugin_name in get_plugin_names():
+        try:
+            plugin = load_plugin_by_name(plugin_name)
+        except Exception:  # noqa: B902
+            continue
+        if isinstance(plugin, LinthellRegexPlugin):
+            with suppress(re.error):
+                re.compile(plugin.lint_format)
+
+
+def _load_reported_baselines(records: List[bytes]) -> None:
+    """Load baselines reported by commands, so they are kept in memory."""
+    for record in records:
+        use_index = record[:1] == b'1'
+        path = Path(os.fsdecode(record[1:]))
+        with suppress(OSError, ValueError, BaselineFormatError):
+            get_digests_from_baseline(path, use_index=use_index)
+
+
+def _reap_children() -> None:
+    """Wait for finished commands without blocking."""
+    with suppress(ChildProcessError):
+        while os.waitpid(-1, os.WNOHANG)[0]:
+            pass
+
+
+def _exit_on_signal(signum: int, frame: object) -> None:
+    sys.exit(128 + signum)
+
+
+def _run_child(
+    cli: click.Command,
+    server: socket.socket,
+    connection: socket.socket,
+    report_reader: int,
+    report_writer: int,
+) -> None:
+    """Handle connection inside forked process, it never returns."""
+    try:
+        server.close()
+        os.close(report_reader)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        _handle_connection(cli, connection, report_writer)
+    except BaseException:  # noqa: B902
+        with suppress(BaseException):
+            traceback.print_exc()
+    finally:
+        # Parent's cleanup (like removing socket) must not be run
+        os._exit(0)
+
+
+def _handle_connection(
+    cli: click.Command, connection: socket.socket, report_writer: int
+) -> None:
+    """Receive request, run command and send its exit code."""
+    connection.settimeout(_REQUEST_TIMEOUT)
+    request, fds = _receive_request(connection)
+    try:
+        if request is None:
+            raise ValueError('Invalid request')
+        cwd, streams, argv, environment = decode_request(request)
+        if not is_forwarded_command(argv):
+            raise ValueError('Command is not run by daemon')
+    except (ValueError, IndexError):
+        for fd in fds:
+            os.close(fd)
+        connection.sendall(REJECTED)
+        return
+    connection.sendall(ACCEPTED)
+    connection.settimeout(None)
+
+    # Standard streams of client are used by linters too
+    for fd, stdio_fd in zip(fds, STDIO_FDS):
+        os.dup2(fd, stdio_fd)
+        os.close(fd)
+    sys.stdin, sys.stdout, sys.stderr = [
+        _open_stream(fd, encoding, errors)
+        for fd, (encoding, errors) in zip(STDIO_FDS, streams)
+    ]
+    sys.argv = ['linthell', *argv]
+    os.environ.clear()
+    os.environ.update(environment)
+
+    loaded_before = dict(get_digests_cache() or {})
+    try:
+        os.chdir(cwd)
+        exit_code = _run_command(cli, argv)
+    finally:
+        with suppress(OSError, ValueError):
+            sys.stdout.flush()
+            sys.stderr.flush()
+    _report_loaded_baselines(loaded_before, report_writer)
+    connection.sendall(EXIT_CODE.pack(exit_code))
+
+
+def _run_command(cli: click.Command, argv: List[str]) -> int:
+    """Run command like `linthell` script does.
+
+    :return: exit code
+    """
+    try:
+        cli.main(args=argv, prog_name='linthell')
+    except SystemExit as error:
+        if error.code is None or isinstance(error.code, int):
+            return error.code or 0
+        print(error.code, file=sys.stderr)
+        return 1
+    except Exception:  # noqa: B902
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def _open_stream(fd: int, encoding: str, errors: str) -> IO[str]:
+    """Open standard stream of client with its encoding."""
+    if fd == 0:
+        return open(fd, encoding=encoding, errors=errors, closefd=False)
+    return open(
+        fd,
+        'w',
+        encoding=encoding,
+        errors=errors,
+        buffering=1 if fd == 2 or os.isatty(fd) else -1,
+        closefd=False,
+    )
+
+
+def _report_loaded_baselines(
+    loaded_before: DigestsCache, report_writer: int
+) -> None:
+    """Report baselines loaded by command to daemon."""
+    cache = get_digests_cache() or {}
+    for key, cached in cache.items():
+        if loaded_before.get(key) is cached:
+            continue
+        path, use_index = key
+        record = b'1' if use_index else b'0'
+        record += os.fsencode(str(path)) + _REPORT_SEPARATOR
+        with suppress(OSError):
+            os.write(report_writer, record)
+
+
+def _receive_request(
+    connection: socket.socket,
+) -> Tuple[Optional[bytes], List[int]]:
+    """Receive request with file descriptors of standard streams.
+
+    :return: request (None if it's invalid) and received descriptors
+    """
+    fds = array.array('i')
+    length, ancillary, flags, _ = connection.recvmsg(
+        LENGTH.size, socket.CMSG_SPACE(len(STDIO_FDS) * fds.itemsize)
+    )
+    for level, kind, data in ancillary:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            usable_size = len(data) - len(data) % fds.itemsize
+            fds.frombytes(data[:usable_size])
+    if (
+        len(length) != LENGTH.size
+        or flags & socket.MSG_CTRUNC
+        or len(fds) != len(STDIO_FDS)
+    ):
+        return None, list(fds)
+    request_size = LENGTH.unpack(length)[0]
+    if request_size > _MAX_REQUEST_SIZE:
+        return None, list(fds)
+    request = receive_exactly(connection, request_size)
+    if len(request) != request_size:
+        return None, list(fds)
+    return request, list(fds)
@@ -0,0 +1,131 @@
+"""Scope of linting limited to lines changed in diff."""
+
+import bisect
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_NEW_FILE_PREFIX = '+++ '
+_HUNK_PATTERN = re.compile(
+    r'@@ -\d+(?:,(?P<old_count>\d+))?'
+    r' \+(?P<new_line_number>\d+)(?:,(?P<new_count>\d+))? @@'
+)
+"""Example: @@ -10,2 +10,3 @@ def func():"""
+_REMOVE_LINE_SIGN = '-'
+_ADD_LINE_SIGN = '+'
+_KEEP_LINE_SIGN = ' '
+_NO_NEWLINE_SIGN = '\\'
+_DEV_NULL = '/dev/null'
+
+
+class DiffScope:
+    """Changed lines of files, errors outside of them are out of scope.
+
+    Only added and modified lines are in scope, lines of context are not.
+    """
+
+    def __init__(self, changed_lines: Dict[str, List[Tuple[int, int]]]):
+        """Initialize scope.
+
+        :param changed_lines: sorted non-overlapping ranges (first and last
+        line) of changed lines by normalized paths of files
+        """
+        self._range_starts = {
+            path: [start for start, _ in ranges]
+            for path, ranges in changed_lines.items()
+        }
+        self._range_ends = {
+            path: [end for _, end in ranges]
+            for path, ranges in changed_lines.items()
+        }
+
+    @classmethod
+    def from_diff(cls, diff_lines: Iterable[str]) -> 'DiffScope':
+        """Build scope from lines of unified diff without context.
+
+        Diff must be produced with `-U0`, files must have `b/` prefix.
+        Lines of hunk are counted by its header, so changed lines of code
+        starting with `++ ` aren't confused with file headers.
+        """
+        changed_lines: Dict[str, List[Tuple[int, int]]] = {}
+        ranges: Optional[List[Tuple[int, int]]] = None
+        # Count of lines of the current hunk which aren't skipped yet
+        old_left = new_left = 0
+        for line in diff_lines:
+            if old_left or new_left:
+                sign = line[:1]
+                if sign == _REMOVE_LINE_SIGN and old_left:
+                    old_left -= 1
+                    continue
+                if sign == _ADD_LINE_SIGN and new_left:
+                    new_left -= 1
+                    continue
+                if sign == _KEEP_LINE_SIGN and old_left and new_left:
+                    old_left -= 1
+                    new_left -= 1
+                    continue
+                if sign == _NO_NEWLINE_SIGN:
+                    continue
+                # Hunk is shorter than its header says, it's over anyway
+                old_left = new_left = 0
+
+            if line.startswith(_NEW_FILE_PREFIX):
+                _, _, header_path = line.partition(' ')
+                path = _parse_diff_path(header_path)
+                ranges = None
+                if path is not None:
+                    ranges = changed_lines.setdefault(path, [])
+            elif line.startswith('@@'):
+                match = _HUNK_PATTERN.match(line)
+                if not match:
+                    continue
+                old_left = int(match.group('old_count') or 1)
+                new_left = int(match.group('new_count') or 1)
+                start = int(match.group('new_line_number'))
+                if new_left and ranges is not None:
+                    ranges.append((start, start + new_left - 1))
+        for ranges in changed_lines.values():
+            ranges.sort()
+        return cls(changed_lines)
+
+    @property
+    def files(self) -> Tuple[str, ...]:
+        """Normalized paths of changed files, deleted files excluded."""
+        return tuple(self._range_starts)
+
+    def contains(self, path: Optional[str], line: Optional[int]) -> bool:
+        """Check if error is inside changed lines.
+
+        Errors without line are in scope if their file is changed, errors
+        without path are always in scope.
+
+        :param path: normalized path of file
+        :param line: line number of error
+        """
+        if path is None:
+            return True
+        starts = self._range_starts.get(path)
+        if starts is None:
+            return False
+        if line is None:
+            return True
+        index = bisect.bisect_right(starts, line) - 1
+        return index >= 0 and line <= self._range_ends[path][index]
+
+
+def _parse_diff_path(header_path: str) -> Optional[str]:
+    """Parse path of file from `+++` header, None for deleted files."""
+    header_path = header_path.rstrip('\n')
+    if header_path.startswith('"'):
+        # Git quotes paths with special characters using C-style escapes
+        header_path = (
+            header_path[1:-1]
+            .encode('latin-1', 'backslashreplace')
+            .decode('unicode_escape')
+            .encode('latin-1')
+            .decode('utf-8')
+        )
+    if header_path == _DEV_NULL:
+        return None
+    if header_path.startswith('b/'):
+        header_path = header_path[2:]
+    return header_path
@@ -0,0 +1,266 @@
+"""Precompiled binary index of baseline digests.
+
+Index is stored in linthell cache directory, one file per baseline path,
+so nothing is written next to the baseline. It contains a header and sorted
+fixed-width binary digests of baseline id lines, so it can be memory-mapped
+and binary-searched in place without parsing the baseline. Header stores
+size, modification time and content hash of the baseline, index is stale
+once the content changes.
+"""
+
+import hashlib
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from contextlib import suppress
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional, Union
+
+from linthell.utils.cache import get_cache_dir
+from linthell.utils.id_lines import MD5, DigestScheme
+from linthell.utils.path import write_atomic
+from linthell.utils.types import IdLine
+
+INDEX_SUFFIX = '.idx'
+_INDEX_DIR = 'baseline-index'
+_MAGIC = b'LHIDX\x00\x02' + (b'L' if sys.byteorder == 'little' else b'B')
+"""Magic of index format, keys are stored in native byte order."""
+_HEADER = struct.Struct('<8s16sQqII')
+"""Magic, baseline MD5, baseline size, baseline mtime, digest size, count."""
+_KEY_SIZE = 8
+"""Digests are looked up by their first 8 bytes as unsigned integers."""
+_KEY_HEX_SIZE = _KEY_SIZE * 2
+_READ_BLOCK_SIZE = 1024 * 1024
+
+
+class BaselineStamp(NamedTuple):
+    """State of baseline file the index is built from."""
+
+    content_hash: bytes
+    size: int
+    mtime: int
+
+
+class DigestIndex:
+    """Sorted fixed-width binary digests with binary search lookup.
+
+    Supports `in` operator with hex digests, so it can replace a set of
+    digests loaded from baseline. Data of index has two parts: sorted keys,
+    the first 8 bytes of digests as unsigned integers in native byte order,
+    and whole digests in the same order (only if digests are longer than
+    keys). Keys are viewed as integers in place by `memoryview.cast`, so
+    lookup is a C-level bisect and memory-mapped index isn't copied.
+    """
+
+    def __init__(
+        self,
+        buffer: Union[bytes, mmap.mmap],
+        offset: int = 0,
+        scheme: DigestScheme = MD5,
+    ) -> None:
+        """Initialize index over data stored in buffer.
+
+        :param buffer: bytes or memory-mapped file with data of index, see
+        `from_raw_digests` to build it
+        :param offset: position of data inside buffer
+        :param scheme: digest scheme of baseline, defines size of digests
+        """
+        self.scheme = scheme
+        self._buffer = buffer
+        self._offset = offset
+        self._digest_size = scheme.size
+        self._hex_size = scheme.size * 2
+        self._count = (len(buffer) - offset) // _get_record_size(scheme)
+        self._digests_offset = offset + self._count * _KEY_SIZE
+        keys_end = self._digests_offset
+        self._keys = memoryview(buffer)[offset:keys_end].cast('Q')
+
+    @classmethod
+    def from_id_lines(
+        cls, id_lines: Iterable[IdLine], scheme: DigestScheme = MD5
+    ) -> 'DigestIndex':
+        """Build in-memory index from id lines."""
+        raw_digests = {scheme.raw_digest(id_line) for id_line in id_lines}
+        return cls.from_raw_digests(b''.join(sorted(raw_digests)), scheme)
+
+    @classmethod
+    def from_raw_digests(
+        cls, raw_digests: bytes, scheme: DigestScheme = MD5
+    ) -> 'DigestIndex':
+        """Build in-memory index from sorted binary digests.
+
+        :param raw_digests: sorted digests concatenated together
+        """
+        # Digests are sorted as bytes, so keys are sorted as integers
+        keys = array('Q')
+        if scheme.size == _KEY_SIZE:
+            keys.frombytes(raw_digests)
+        else:
+            step = scheme.size // _KEY_SIZE
+            with memoryview(raw_digests) as view:
+                keys.extend(view.cast('Q')[::step])
+        if sys.byteorder == 'little':
+            keys.byteswap()
+        data = keys.tobytes()
+        if scheme.size != _KEY_SIZE:
+            data += raw_digests
+        return cls(data, scheme=scheme)
+
+    @property
+    def data(self) -> bytes:
+        """Data of index as it's stored in index file."""
+        offset = self._offset
+        return self._buffer[offset:]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, digest: object) -> bool:
+        if not isinstance(digest, str) or len(digest) != self._hex_size:
+            return False
+        try:
+            key = int(digest[:_KEY_HEX_SIZE], 16)
+        except ValueError:
+            return False
+        position = bisect_left(self._keys, key)
+        if position == self._count or self._keys[position] != key:
+            return False
+        if self._digest_size == _KEY_SIZE:
+            return True
+        try:
+            raw_digest = bytes.fromhex(digest)
+        except ValueError:
+            return False
+        return self._contains_from(position, raw_digest)
+
+    def contains_raw(self, raw_digest: bytes) -> bool:
+        """Check if binary digest is inside index."""
+        if len(raw_digest) != self._digest_size:
+            return False
+        key = int.from_bytes(raw_digest[:_KEY_SIZE], 'big')
+        position = bisect_left(self._keys, key)
+        if position == self._count or self._keys[position] != key:
+            return False
+        if self._digest_size == _KEY_SIZE:
+            return True
+        return self._contains_from(position, raw_digest)
+
+    def _contains_from(self, position: int, raw_digest: bytes) -> bool:
+        """Compare whole digests with the same key starting from position.
+
+        Digests with the same key are rare, but possible.
+        """
+        size = self._digest_size
+        key = self._keys[position]
+        while position < self._count and self._keys[position] == key:
+            start = self._digests_offset + position * size
+            end = start + size
+            if self._buffer[start:end] == raw_digest:
+                return True
+            position += 1
+        return False
+
+
+def _get_record_size(scheme: DigestScheme) -> int:
+    """Get count of bytes index data takes per digest: key and digest."""
+    if scheme.size == _KEY_SIZE:
+        return _KEY_SIZE
+    return _KEY_SIZE + scheme.size
+
+
+def get_index_path(baseline_file: Path) -> Path:
+    """Get path of the index of the baseline inside cache directory.
+
+    Index is found by absolute path of baseline, see `get_cache_dir`.
+    """
+    path = str(baseline_file.resolve()).encode('utf-8', 'surrogateescape')
+    key = hashlib.sha256(path).hexdigest()
+    return get_cache_dir() / _INDEX_DIR / f'{key}{INDEX_SUFFIX}'
+
+
+def get_baseline_stamp(baseline_file: Path) -> BaselineStamp:
+    """Get current state of baseline file."""
+    stat = baseline_file.stat()
+    return BaselineStamp(
+        _hash_file(baseline_file), stat.st_size, stat.st_mtime_ns
+    )
+
+
+def open_digest_index(
+    baseline_file: Path, scheme: DigestScheme = MD5
+) -> Optional[DigestIndex]:
+    """Memory-map index of the baseline.
+
+    Index of baseline modified without content changes (touched or checked
+    out again) is stamped with the new state of baseline, so baseline isn't
+    hashed on the following loads.
+
+    :param scheme: digest scheme of baseline
+    :return: index or None if it's missing or built for another content
+    """
+    index_path = get_index_path(baseline_file)
+    try:
+        with index_path.open('rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    if len(buffer) < _HEADER.size:
+        return None
+    magic, content_hash, size, mtime, digest_size, count = _HEADER.unpack_from(
+        buffer
+    )
+    if (
+        magic != _MAGIC
+        or digest_size != scheme.size
+        or len(buffer) != _HEADER.size + count * _get_record_size(scheme)
+    ):
+        return None
+    # Same size and modification time means same content, skip hashing then
+    stat = baseline_file.stat()
+    if size != stat.st_size or mtime != stat.st_mtime_ns:
+        if content_hash != _hash_file(baseline_file):
+            return None
+        header = _HEADER.pack(
+            magic,
+            content_hash,
+            stat.st_size,
+            stat.st_mtime_ns,
+            digest_size,
+            count,
+        )
+        with suppress(OSError), index_path.open('r+b') as file:
+            file.write(header)
+    return DigestIndex(buffer, offset=_HEADER.size, scheme=scheme)
+
+
+def save_digest_index(
+    baseline_file: Path, index: DigestIndex, stamp: BaselineStamp
+) -> None:
+    """Save index of the baseline into cache directory.
+
+    Stamp must be taken before baseline is read, so index built from
+    modified baseline is considered stale.
+    """
+    header = _HEADER.pack(
+        _MAGIC,
+        stamp.content_hash,
+        stamp.size,
+        stamp.mtime,
+        index.scheme.size,
+        len(index),
+    )
+    index_path = get_index_path(baseline_file)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(index_path, header, index.data)
+
+
+def _hash_file(path: Path) -> bytes:
+    """Get MD5 hash of file content."""
+    file_hash = hashlib.md5()
+    with path.open('rb') as file:
+        for block in iter(lambda: file.read(_READ_BLOCK_SIZE), b''):
+            file_hash.update(block)
+    return file_hash.digest()
@@ -0,0 +1,77 @@
+"""Git utilities."""
+
+import hashlib
+import subprocess
+from pathlib import Path
+from typing import Tuple
+
+from linthell.utils.diff_scope import DiffScope
+
+
+class GitError(Exception):
+    """Git command failed."""
+
+
+def get_changed_files(ref: str) -> Tuple[str, ...]:
+    """Get files changed in working tree since git ref.
+
+    Deleted files are included, renamed files are listed by both old and new
+    paths. Paths are relative to repository root.
+
+    :raise GitError: if ref is unknown or git is unavailable
+    """
+    output = _run_git('diff', '--name-only', '--no-renames', '-z', ref, '--')
+    return tuple(path for path in output.split('\0') if path)
+
+
+def get_index_digest() -> str:
+    """Get hash of git index, it changes once files are added or staged.
+
+    :raise GitError: if git is unavailable or repository has no index yet
+    """
+    index_path = _run_git('rev-parse', '--git-path', 'index').strip()
+    try:
+        content = Path(index_path).read_bytes()
+    except OSError as error:
+        raise GitError(str(error)) from error
+    return hashlib.sha256(content).hexdigest()
+
+
+def get_diff_scope(ref: str) -> DiffScope:
+    """Get lines changed in working tree since git ref.
+
+    Paths are relative to current directory, files outside of it are skipped.
+
+    :raise GitError: if ref is unknown or git is unavailable
+    """
+    output = _run_git(
+        'diff',
+        '--unified=0',
+        '--no-renames',
+        '--no-color',
+        '--no-ext-diff',
+        '--relative',
+        '--src-prefix=a/',
+        '--dst-prefix=b/',
+        ref,
+        '--',
+    )
+    # Changed lines may contain other line boundaries, like form feed
+    return DiffScope.from_diff(output.split('\n'))
+
+
+def _run_git(*args: str) -> str:
+    """Run git command and return its stdout."""
+    try:
+        git_process = subprocess.run(
+            ['git', *args],
+            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+    except subprocess.CalledProcessError as error:
+        raise GitError(error.stderr.strip()) from error
+    except OSError as error:
+        raise GitError(str(error)) from error
+    return git_process.stdout
@@ -1,10 +1,54 @@
 """Utilities for ID Lines and digests conversions."""
 
 import hashlib
+from typing import Dict, NamedTuple
 
 from linthell.utils.types import Digest, IdLine
 
 
+class DigestScheme(NamedTuple):
+    """Hash function used to convert id lines of baseline to digests."""
+
+    name: str
+    size: int
+    """Size of digest in bytes."""
+
+    def raw_digest(self, id_line: IdLine) -> bytes:
+        """Convert utf-8 id line to digest as raw bytes."""
+        data = id_line.encode('utf-8')
+        if self.name == MD5_NAME:
+            return hashlib.md5(data).digest()
+        return hashlib.blake2b(data, digest_size=self.size).digest()
+
+    def digest(self, id_line: IdLine) -> Digest:
+        """Convert utf-8 id line to digest as hex."""
+        return self.raw_digest(id_line).hex()
+
+
+MD5_NAME = 'md5'
+MD5 = DigestScheme(MD5_NAME, 16)
+"""Scheme of baselines without header."""
+BLAKE2B_64 = DigestScheme('blake2b-64', 8)
+BLAKE2B_128 = DigestScheme('blake2b-128', 16)
+DIGEST_SCHEMES: Dict[str, DigestScheme] = {
+    scheme.name: scheme for scheme in (MD5, BLAKE2B_64, BLAKE2B_128)
+}
+
+
 def id_line_to_digest(id_line: IdLine) -> Digest:
     """Convert MD5 hash as hex from utf-8 id line."""
     return hashlib.md5(id_line.encode('utf-8')).hexdigest()
+
+
+def id_line_to_raw_digest(id_line: IdLine) -> bytes:
+    """Convert MD5 hash as raw bytes from utf-8 id line."""
+    return hashlib.md5(id_line.encode('utf-8')).digest()
+
+
+def id_line_to_path(id_line: IdLine) -> str:
+    """Get normalized path of file from id line.
+
+    Id lines of all plugins start with path of file followed by colon
+    (or consist of path only).
+    """
+    return id_line.split(':', 1)[0]
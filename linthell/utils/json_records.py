@@ -0,0 +1,250 @@
+"""Incremental scanner of records inside JSON linter outputs.
+
+Linters print errors as JSON values nested into containers, e.g. an array
+of objects (`pylint --output-format=json`), an object mapping paths to
+arrays of objects (`flake8 --format=json`) or a value per line (JSON lines,
+`mypy -O json`). Scanner walks containers around records itself and
+decodes each record with C-accelerated `json` decoder, so records are
+yielded as soon as their chunks are read and the whole output is never
+kept in memory.
+"""
+
+import json
+import re
+from typing import Any, Iterable, Iterator, List, Match, Tuple, cast
+
+_WHITESPACE_PATTERN = re.compile(r'[ \t\n\r]*')
+_CLOSING_CHARS = {'[': ']', '{': '}'}
+
+_EXPECT_VALUE = 'value'
+_EXPECT_VALUE_OR_CLOSE = 'value or close'
+_EXPECT_KEY = 'key'
+_EXPECT_KEY_OR_CLOSE = 'key or close'
+_EXPECT_COLON = 'colon'
+_EXPECT_COMMA_OR_CLOSE = 'comma or close'
+_EXPECT_END = 'end'
+
+
+def _skip_whitespace(text: str, position: int) -> int:
+    """Get position of the first non-whitespace char from position."""
+    match = cast(Match[str], _WHITESPACE_PATTERN.match(text, position))
+    return match.end()
+
+
+class JsonOutputInvalidError(ValueError):
+    """Linter output isn't valid JSON of expected structure."""
+
+    def __init__(self, text: str, msg: str) -> None:
+        """Initialize exception instance.
+
+        :param text: part of output where error is found
+        :param msg: verbose message of error
+        """
+        super().__init__(text, msg)
+        self.text = text
+        self.msg = msg
+
+    def __str__(self) -> str:
+        return f'Invalid JSON output ({self.msg}): {self.text[:80]!r}'
+
+
+class _NeedMoreInput(Exception):
+    """Scanned part of output ends in the middle of a record."""
+
+
+class JsonRecordsScanner:
+    """Push scanner of JSON records nested `depth` containers deep.
+
+    Usage:
+    scanner = JsonRecordsScanner(depth=1)
+    for chunk in chunks:
+        records = scanner.feed(chunk)
+    records = scanner.close()
+
+    With depth 0 output is a sequence of top-level values, one per line.
+    Lines which aren't JSON objects or arrays (like summary lines printed
+    after records) are skipped.
+    """
+
+    def __init__(self, depth: int) -> None:  # noqa: D107
+        self.depth = depth
+        self._decoder = json.JSONDecoder()
+        self._closing_stack: List[str] = []
+        self._expect = _EXPECT_VALUE
+        self._buffer = ''
+        """Unscanned rest of the previous chunks."""
+        self._parts: List[str] = []
+        self._parts_size = 0
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Scan the next chunk of output.
+
+        Unfinished record at the end is scanned once enough of output is
+        fed, so a huge record is not rescanned on every small chunk.
+
+        :return: records finished inside the chunk
+        """
+        self._parts.append(chunk)
+        self._parts_size += len(chunk)
+        if self._parts_size < len(self._buffer):
+            return []
+        return self._scan(is_final=False)
+
+    def close(self) -> List[Any]:
+        """Scan the rest of output.
+
+        :return: the last records
+        :raise JsonOutputInvalidError: if output is invalid or unfinished
+        """
+        records = self._scan(is_final=True)
+        # Nothing is expected before the first value, so empty output is ok
+        if self._closing_stack or self._expect not in (
+            _EXPECT_VALUE,
+            _EXPECT_END,
+        ):
+            raise JsonOutputInvalidError(self._buffer, 'unexpected end')
+        return records
+
+    def _scan(self, is_final: bool) -> List[Any]:
+        """Scan buffered output, keep unfinished record for the next scan."""
+        self._parts.insert(0, self._buffer)
+        text = ''.join(self._parts)
+        self._parts = []
+        self._parts_size = 0
+        records: List[Any] = []
+        position = 0
+        try:
+            while True:
+                position = _skip_whitespace(text, position)
+                if position == len(text):
+                    break
+                position = self._step(text, position, records, is_final)
+        except _NeedMoreInput:
+            if is_final:
+                raise JsonOutputInvalidError(text[position:], 'unexpected end')
+        self._buffer = text[position:]
+        return records
+
+    def _step(
+        self, text: str, position: int, records: List[Any], is_final: bool
+    ) -> int:
+        """Scan a single token or record starting at position.
+
+        :return: position right after scanned part
+        """
+        char = text[position]
+        expect = self._expect
+        if expect in (_EXPECT_VALUE_OR_CLOSE, _EXPECT_KEY_OR_CLOSE):
+            if char == self._closing_stack[-1]:
+                return self._close(position)
+            expect = self._expect = (
+                _EXPECT_VALUE
+                if expect == _EXPECT_VALUE_OR_CLOSE
+                else _EXPECT_KEY
+            )
+
+        if expect == _EXPECT_VALUE:
+            if len(self._closing_stack) < self.depth:
+                closing = _CLOSING_CHARS.get(char)
+                if closing is None:
+                    raise JsonOutputInvalidError(
+                        text[position:], 'expected array or object'
+                    )
+                self._closing_stack.append(closing)
+                self._expect = (
+                    _EXPECT_VALUE_OR_CLOSE
+                    if char == '['
+                    else _EXPECT_KEY_OR_CLOSE
+                )
+                return position + 1
+            if self.depth == 0 and char not in _CLOSING_CHARS:
+                return self._skip_line(text, position, is_final)
+            record, end = self._decode(text, position, is_final)
+            records.append(record)
+            if self.depth:
+                self._expect = _EXPECT_COMMA_OR_CLOSE
+            return end
+
+        if expect == _EXPECT_KEY:
+            key, end = self._decode(text, position, is_final)
+            if not isinstance(key, str):
+                raise JsonOutputInvalidError(
+                    text[position:], 'expected object key'
+                )
+            self._expect = _EXPECT_COLON
+            return end
+
+        if expect == _EXPECT_COLON and char == ':':
+            self._expect = _EXPECT_VALUE
+            return position + 1
+
+        if expect == _EXPECT_COMMA_OR_CLOSE:
+            if char == ',':
+                self._expect = (
+                    _EXPECT_VALUE
+                    if self._closing_stack[-1] == ']'
+                    else _EXPECT_KEY
+                )
+                return position + 1
+            if char == self._closing_stack[-1]:
+                return self._close(position)
+
+        raise JsonOutputInvalidError(text[position:], f'expected {expect}')
+
+    def _close(self, position: int) -> int:
+        """Close the innermost container."""
+        self._closing_stack.pop()
+        self._expect = (
+            _EXPECT_COMMA_OR_CLOSE if self._closing_stack else _EXPECT_END
+        )
+        return position + 1
+
+    def _decode(
+        self, text: str, position: int, is_final: bool
+    ) -> Tuple[Any, int]:
+        """Decode JSON value starting at position.
+
+        :return: value and position right after it
+        """
+        try:
+            value, end = self._decoder.raw_decode(text, position)
+        except json.JSONDecodeError as error:
+            # Value can be cut by the end of chunk, it's found out only
+            # once the whole output is read
+            if not is_final:
+                raise _NeedMoreInput from error
+            raise JsonOutputInvalidError(text[position:], error.msg)
+        if end == len(text) and not is_final:
+            # Number at the end may continue in the next chunk
+            raise _NeedMoreInput
+        return value, end
+
+    @staticmethod
+    def _skip_line(text: str, position: int, is_final: bool) -> int:
+        """Skip line which isn't a record."""
+        line_break = text.find('\n', position)
+        if line_break != -1:
+            return line_break + 1
+        if not is_final:
+            raise _NeedMoreInput
+        return len(text)
+
+
+def iter_json_records(
+    chunks: Iterable[str], depth: int
+) -> Iterator[List[Any]]:
+    """Scan JSON linter output by chunks, see `JsonRecordsScanner`.
+
+    :param chunks: linter output split by chunks
+    :param depth: count of containers around records
+    :return: iterator of records finished inside each chunk
+    :raise JsonOutputInvalidError: if output is invalid or unfinished
+    """
+    scanner = JsonRecordsScanner(depth)
+    for chunk in chunks:
+        records = scanner.feed(chunk)
+        if records:
+            yield records
+    records = scanner.close()
+    if records:
+        yield records
@@ -1,8 +1,15 @@
 from dataclasses import dataclass
-from typing import List, Set
+from typing import Container, Iterable, Iterator, List, Optional, Tuple, Union
 
 from linthell.plugins.base import LinthellPlugin
-from linthell.utils.id_lines import id_line_to_digest
+from linthell.utils import timings
+from linthell.utils.baseline import ShardedDigests
+from linthell.utils.baseline_db import DatabaseDigests
+from linthell.utils.digest_index import DigestIndex
+from linthell.utils.id_lines import MD5, DigestScheme, id_line_to_path
+from linthell.utils.nested_baselines import NestedBaselines
+from linthell.utils.parallel import is_splittable, iter_errors_with_digests
+from linthell.utils.types import Digest, LinterError
 
 
 @dataclass
@@ -13,18 +20,164 @@ class LintReport:
 
 
 def lint(
-    digests: Set[str], linter_output: str, plugin: LinthellPlugin
+    digests: Container[Digest],
+    linter_output: str,
+    plugin: LinthellPlugin,
+    jobs: Optional[int] = None,
 ) -> LintReport:
     """Lint provided linter output and returns report with found errors.
 
     :param digests: digests of already known errors
     :param linter_output: whole output of linter
     :param plugin: plugin to use, depends on linter
+    :param jobs: count of processes to parse output in parallel, it's parsed
+    serially by default or if plugin can't split output
     :return: report with errors, which wasn't found in digests
     """
-    errors = []
-    for linter_error in plugin.parse(linter_output):
-        digest = id_line_to_digest(linter_error.id_line)
-        if digest not in digests:
-            errors.append(linter_error.error_message)
+    if jobs is not None and jobs > 1 and is_splittable(plugin):
+        errors_with_digests = iter_errors_with_digests(
+            [linter_output], plugin, jobs, scheme=get_digest_scheme(digests)
+        )
+        new_errors = iter_new_errors_by_digests(digests, errors_with_digests)
+    else:
+        linter_errors = timings.timed(
+            'parse', plugin.iter_parse([linter_output])
+        )
+        new_errors = iter_new_errors(digests, linter_errors)
+    errors = [linter_error.error_message for linter_error in new_errors]
     return LintReport(errors)
+
+
+def get_digest_scheme(digests: Container[Digest]) -> DigestScheme:
+    """Get scheme to convert id lines to digests comparable with digests.
+
+    Plain containers (like set) are considered to contain MD5 digests.
+    """
+    if isinstance(digests, (DigestIndex, ShardedDigests, DatabaseDigests)):
+        return digests.scheme
+    return MD5
+
+
+def iter_new_errors(
+    digests: Union[Container[Digest], NestedBaselines],
+    linter_errors: Iterable[LinterError],
+) -> Iterator[LinterError]:
+    """Filter out known errors lazily, keeping the order of linter errors.
+
+    :param digests: digests of already known errors or baselines of
+    subprojects, see `iter_new_errors_by_baselines`
+    :param linter_errors: parsed errors of linter
+    :return: iterator of errors, which wasn't found in digests
+    """
+    if isinstance(digests, NestedBaselines):
+        return iter_new_errors_by_baselines(digests, linter_errors)
+    hash_span = timings.span('hash')
+    get_digest = get_digest_scheme(digests).digest
+
+    def iter_digests() -> Iterator[Tuple[LinterError, Digest]]:
+        for linter_error in linter_errors:
+            with hash_span:
+                digest = get_digest(linter_error.id_line)
+            yield linter_error, digest
+
+    return iter_new_errors_by_digests(digests, iter_digests())
+
+
+def iter_new_errors_by_digests(
+    digests: Container[Digest],
+    errors_with_digests: Iterable[Tuple[LinterError, Digest]],
+) -> Iterator[LinterError]:
+    """Filter out known errors by digests computed in advance.
+
+    Errors are looked up only in shard of their file if baseline is sharded.
+
+    :param digests: digests of already known errors
+    :param errors_with_digests: parsed errors with digests of their id lines
+    :return: iterator of errors, which wasn't found in digests
+    """
+    get_shard = None
+    if isinstance(digests, ShardedDigests):
+        get_shard = digests.get_shard
+    errors_count = new_errors_count = 0
+    for linter_error, digest in errors_with_digests:
+        errors_count += 1
+        known_digests = digests
+        if get_shard is not None:
+            known_digests = get_shard(id_line_to_path(linter_error.id_line))
+        if digest not in known_digests:
+            new_errors_count += 1
+            yield linter_error
+    timings.count('errors', errors_count)
+    timings.count('new errors', new_errors_count)
+    timings.count('filtered errors', errors_count - new_errors_count)
+
+
+def iter_new_errors_by_baselines(
+    baselines: NestedBaselines, linter_errors: Iterable[LinterError]
+) -> Iterator[LinterError]:
+    """Filter out errors known by the nearest baselines of their files.
+
+    Id lines are looked up without directory of baseline, like subproject
+    lints itself. Errors of files without baseline are new.
+
+    :param baselines: baselines of subprojects
+    :param linter_errors: parsed errors of linter
+    :return: iterator of errors, which wasn't found in their baselines
+    """
+    hash_span = timings.span('hash')
+    errors_count = new_errors_count = 0
+    for linter_error in linter_errors:
+        errors_count += 1
+        id_line = linter_error.id_line
+        routed = baselines.route(id_line_to_path(id_line))
+        if routed is not None:
+            prefix_length, digests = routed
+            id_line = id_line[prefix_length:]
+            with hash_span:
+                digest = get_digest_scheme(digests).digest(id_line)
+            if isinstance(digests, ShardedDigests):
+                digests = digests.get_shard(id_line_to_path(id_line))
+            if digest in digests:
+                continue
+        new_errors_count += 1
+        yield linter_error
+    timings.count('errors', errors_count)
+    timings.count('new errors', new_errors_count)
+    timings.count('filtered errors', errors_count - new_errors_count)
+
+
+def print_new_errors(
+    digests: Union[Container[Digest], NestedBaselines],
+    linter_errors: Iterable[LinterError],
+    max_count: Optional[int] = None,
+) -> int:
+    """Print new errors as soon as they are found.
+
+    :param digests: digests of already known errors or baselines of
+    subprojects
+    :param linter_errors: parsed errors of linter
+    :param max_count: stop once this count of errors is printed
+    :return: count of printed errors
+    """
+    return print_errors(iter_new_errors(digests, linter_errors), max_count)
+
+
+def print_errors(
+    linter_errors: Iterable[LinterError], max_count: Optional[int] = None
+) -> int:
+    """Print errors as soon as they are found.
+
+    :param linter_errors: errors to print
+    :param max_count: stop once this count of errors is printed, the rest
+    of errors isn't consumed
+    :return: count of printed errors
+    """
+    count = 0
+    print_span = timings.span('print')
+    for linter_error in linter_errors:
+        with print_span:
+            print(linter_error.error_message, flush=True)
+        count += 1
+        if count == max_count:
+            break
+    return count
@@ -0,0 +1,98 @@
+"""Linter output read from stdin or file."""
+
+import codecs
+import mmap
+import os
+import stat
+from types import TracebackType
+from typing import Iterator, Optional, TextIO, Type
+
+from linthell.plugins.base import LinthellPlugin
+from linthell.utils.diff_scope import DiffScope
+from linthell.utils.streams import iter_chunks
+from linthell.utils.types import LinterError
+
+
+class LinterInput:
+    """Linter output provided by text stream (stdin or file).
+
+    If stream is a regular UTF-8 file with LF line breaks (`--input` file or
+    stdin redirected from file), it's memory mapped: plugins supporting it
+    parse raw bytes and decode only the parts they need, so the whole output
+    is never decoded and copied. Pipes are read by chunks of text.
+
+    Usage:
+    with LinterInput(stream) as linter_input:
+        for linter_error in linter_input.iter_parse(plugin):
+            ...
+    """
+
+    def __init__(self, stream: TextIO) -> None:  # noqa: D107
+        self.stream = stream
+        self.buffer = _map_stream(stream)
+        """Memory mapped output, None if stream can't be mapped."""
+
+    def iter_chunks(self) -> Iterator[str]:
+        """Read linter output by chunks of text."""
+        return iter_chunks(self.stream)
+
+    def iter_parse(
+        self, plugin: LinthellPlugin, scope: Optional[DiffScope] = None
+    ) -> Iterator[LinterError]:
+        """Parse linter output, memory mapped one if plugin supports it.
+
+        Messages of errors must be accessed before input is closed.
+
+        :param plugin: plugin to parse output
+        :param scope: if provided, only errors inside it are yielded
+        """
+        if self.buffer is not None:
+            linter_errors = plugin.iter_parse_buffer(self.buffer, scope)
+            if linter_errors is not None:
+                return linter_errors
+        chunks = self.iter_chunks()
+        if scope is None:
+            return plugin.iter_parse(chunks)
+        return plugin.iter_parse_in_scope(chunks, scope)
+
+    def close(self) -> None:
+        """Unmap linter output, stream itself is closed by its owner."""
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+
+    def __enter__(self) -> 'LinterInput':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def _map_stream(stream: TextIO) -> Optional[mmap.mmap]:
+    """Memory map stream if it's a regular UTF-8 file read from the start.
+
+    Output with CR line breaks isn't mapped, text streams translate them.
+    """
+    try:
+        if codecs.lookup(stream.encoding).name != 'utf-8':
+            return None
+        fileno = stream.fileno()
+        if not stat.S_ISREG(os.fstat(fileno).st_mode):
+            return None
+        if os.lseek(fileno, 0, os.SEEK_CUR) != 0:
+            return None
+        # Empty file can't be mapped, ValueError is raised
+        buffer = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, LookupError, TypeError):
+        # Streams without file descriptor (io.UnsupportedOperation) or
+        # encoding (TypeError) are read by chunks
+        return None
+    if buffer.find(b'\r') != -1:
+        buffer.close()
+        return None
+    return buffer
@@ -1,27 +1,300 @@
 """Utilities for linters handling."""
 
+import math
+import os
+import queue
 import shlex
+import signal
 import subprocess
-from typing import Tuple
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import (
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from typing_extensions import Literal
 
+from linthell.plugins.base import LinthellPlugin
+from linthell.utils import timings
+from linthell.utils.diff_scope import DiffScope
+from linthell.utils.results_cache import ResultsCache
+from linthell.utils.streams import create_output_decoder, iter_fd_chunks
+from linthell.utils.types import LinterError
+
+_MIN_COMMAND_LENGTH = 2**12
+_MAX_COMMAND_LENGTH = 2**17
+"""Command line length limit, same as pre-commit uses for its hooks."""
+_READ_SIZE = 64 * 1024
+"""Max size of linter output read at once."""
+
 
 def run_linter_and_get_output(
     linter_command: str,
     files: Tuple[str, ...],
     linter_output: Literal['stdout', 'stderr'],
+    jobs: Optional[int] = None,
+    whole_program: bool = False,
 ) -> str:
-    """Execute linter command against files and return its output."""
-    linter_process = subprocess.run(
-        [*shlex.split(linter_command), *files],
-        text=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        check=False,
+    """Execute linter command against files and return its output.
+
+    See `iter_linter_output` for parameters.
+    """
+    return ''.join(
+        timings.timed(
+            'run linter',
+            iter_linter_output(
+                linter_command, files, linter_output, jobs, whole_program
+            ),
+        )
     )
-    if linter_output == 'stdout':
-        output = linter_process.stdout
+
+
+def iter_linter_output(
+    linter_command: str,
+    files: Tuple[str, ...],
+    linter_output: Literal['stdout', 'stderr'],
+    jobs: Optional[int] = None,
+    whole_program: bool = False,
+) -> Generator[str, None, None]:
+    """Execute linter command against files and yield its output by chunks.
+
+    Output is yielded as soon as linter prints it, empty chunk is yielded
+    once linter goes idle (see `iter_fd_chunks`). The other stream of linter
+    is discarded. Files are split into chunks which fit into command line
+    length limit and chunks are linted in parallel: output of the first
+    linter is streamed, outputs of the following ones are buffered until
+    previous linters finish, so the result doesn't depend on processes
+    scheduling.
+
+    Linters which are still running are killed once generator is closed,
+    for example when enough new errors are found.
+
+    :param linter_command: linter command with options
+    :param files: files to lint
+    :param linter_output: where linter outputs its errors
+    :param jobs: count of linter processes to run in parallel, CPU count
+    by default
+    :param whole_program: execute linter once against all files, required
+    by linters which analyze files together (for example, mypy)
+    """
+    command = shlex.split(linter_command)
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if whole_program:
+        files_chunks = [files]
     else:
-        output = linter_process.stderr
-    return output
+        files_chunks = split_files(command, files, jobs)
+
+    timings.count('linted files', len(files))
+    if len(files_chunks) <= 1:
+        process = _start_linter(command, linter_output, files)
+        try:
+            yield from _iter_decoded_output(process)
+            process.wait()
+        finally:
+            _kill_linter(process)
+        return
+
+    stopped = threading.Event()
+    lock = threading.Lock()
+    processes: List['subprocess.Popen[bytes]'] = []
+
+    def lint(
+        files_chunk: Tuple[str, ...],
+        output_queue: 'queue.Queue[Optional[str]]',
+    ) -> None:
+        try:
+            with lock:
+                if stopped.is_set():
+                    return
+                process = _start_linter(command, linter_output, files_chunk)
+                processes.append(process)
+            for output in _iter_decoded_output(process):
+                output_queue.put(output)
+            process.wait()
+        finally:
+            output_queue.put(None)
+
+    with ThreadPoolExecutor(jobs) as executor:
+        output_queues: List['queue.Queue[Optional[str]]'] = [
+            queue.Queue() for _ in files_chunks
+        ]
+        futures = [
+            executor.submit(lint, files_chunk, output_queue)
+            for files_chunk, output_queue in zip(files_chunks, output_queues)
+        ]
+        try:
+            for future, output_queue in zip(futures, output_queues):
+                last_output = ''
+                # None marks the end of linter output
+                for output in iter(output_queue.get, None):
+                    last_output = output or last_output
+                    yield output
+                future.result()
+                # Outputs are concatenated safely
+                if last_output and not last_output.endswith('\n'):
+                    yield '\n'
+        finally:
+            with lock:
+                stopped.set()
+                for process in processes:
+                    _kill_linter(process)
+
+
+def get_linter_errors(
+    linter_command: str,
+    files: Tuple[str, ...],
+    linter_output: Literal['stdout', 'stderr'],
+    plugin: LinthellPlugin,
+    jobs: Optional[int] = None,
+    whole_program: bool = False,
+    cache: Optional[ResultsCache] = None,
+    scope: Optional[DiffScope] = None,
+) -> Generator[LinterError, None, None]:
+    """Execute linter command against files and parse its output.
+
+    Output is parsed as soon as linter prints it. Close generator to stop
+    linting early, running linters are killed.
+
+    If cache is provided, only files missing in cache are linted. Cache is
+    ignored for whole program linters, because errors of a file depend
+    on other files. Errors of linted files are yielded once linting is
+    finished, so they can be cached.
+
+    If scope is provided, errors outside of it are dropped. Without cache
+    it's done before id lines are built, cache keeps all errors of file.
+
+    See `iter_linter_output` for other parameters.
+    """
+
+    def lint(files_to_lint: Tuple[str, ...]) -> Iterator[LinterError]:
+        chunks = timings.timed(
+            'run linter',
+            iter_linter_output(
+                linter_command,
+                files_to_lint,
+                linter_output,
+                jobs=jobs,
+                whole_program=whole_program,
+            ),
+        )
+        if scope is None or is_cached:
+            return timings.timed('parse', plugin.iter_parse(chunks))
+        return timings.timed(
+            'parse', plugin.iter_parse_in_scope(chunks, scope)
+        )
+
+    is_cached = cache is not None and not whole_program and bool(files)
+    linter_errors: Iterable[LinterError]
+    if cache is None or not is_cached:
+        linter_errors = lint(files)
+    else:
+        linter_errors = cache.iter_errors(files, lint)
+        if scope is not None:
+            linter_errors = (
+                linter_error
+                for linter_error in linter_errors
+                if scope.contains(linter_error.path, linter_error.line)
+            )
+    yield from linter_errors
+
+
+def split_files(
+    command: Sequence[str], files: Tuple[str, ...], jobs: int
+) -> List[Tuple[str, ...]]:
+    """Split files into chunks to execute linter against each chunk.
+
+    Each chunk fits into command line length limit, chunks count is at
+    least `jobs` if there are enough files.
+    """
+    if not files:
+        return [files]
+    max_length = _get_max_command_length() - _get_command_length(command)
+    max_files = math.ceil(len(files) / jobs)
+
+    chunks: List[Tuple[str, ...]] = []
+    chunk: List[str] = []
+    chunk_length = 0
+    for file in files:
+        file_length = _get_command_length((file,))
+        if chunk and (
+            len(chunk) >= max_files or chunk_length + file_length > max_length
+        ):
+            chunks.append(tuple(chunk))
+            chunk, chunk_length = [], 0
+        chunk.append(file)
+        chunk_length += file_length
+    chunks.append(tuple(chunk))
+    return chunks
+
+
+def _start_linter(
+    command: Sequence[str],
+    linter_output: Literal['stdout', 'stderr'],
+    files: Tuple[str, ...],
+) -> 'subprocess.Popen[bytes]':
+    """Start linter against files, only its output stream is piped.
+
+    Linter is started in its own process group on POSIX, so processes
+    started by linter command (like `poetry run mypy`) are killed with it.
+    """
+    is_stdout = linter_output == 'stdout'
+    return subprocess.Popen(
+        [*command, *files],
+        stdout=subprocess.PIPE if is_stdout else subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL if is_stdout else subprocess.PIPE,
+        start_new_session=sys.platform != 'win32',
+    )
+
+
+def _iter_decoded_output(process: 'subprocess.Popen[bytes]') -> Iterator[str]:
+    """Read piped output of linter as soon as it's printed.
+
+    Empty chunk is yielded once linter goes idle.
+    """
+    stream = process.stdout if process.stdout is not None else process.stderr
+    assert stream is not None
+    with stream:
+        yield from iter_fd_chunks(
+            stream.fileno(), create_output_decoder(), _READ_SIZE
+        )
+
+
+def _kill_linter(process: 'subprocess.Popen[bytes]') -> None:
+    """Kill linter with its process group if it's still running."""
+    if process.poll() is None:
+        # Linter may exit right before it's killed
+        with suppress(OSError):
+            if sys.platform == 'win32':
+                process.kill()
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+    process.wait()
+
+
+def _get_command_length(args: Sequence[str]) -> int:
+    """Get length of arguments inside command line, in bytes."""
+    return sum(len(arg.encode()) + 1 for arg in args)
+
+
+def _get_max_command_length() -> int:
+    """Get max length of command line, environment variables included."""
+    if sys.platform == 'win32':
+        return 2**15 - 2048
+    try:
+        max_length = os.sysconf('SC_ARG_MAX')
+    except (AttributeError, ValueError):
+        return _MIN_COMMAND_LENGTH
+    environment_length = sum(
+        len(key) + len(value) + 2 for key, value in os.environb.items()
+    )
+    max_length -= environment_length + 2048
+    return max(min(max_length, _MAX_COMMAND_LENGTH), _MIN_COMMAND_LENGTH)
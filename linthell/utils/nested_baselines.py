@@ -0,0 +1,92 @@
+"""Baselines of subprojects of monorepo, found by paths of files.
+
+Like `.gitignore` files, baseline applies to files of its directory and its
+subdirectories, the nearest one wins. Each baseline is generated by its own
+subproject as usual, so paths of its id lines are relative to its directory.
+"""
+
+import os
+from pathlib import Path
+from typing import Container, Dict, Optional, Tuple
+
+from linthell.utils import timings
+from linthell.utils.baseline import get_digests_from_baseline
+from linthell.utils.types import Digest
+
+
+class _Directory:
+    """Node of trie of directories, one per path component."""
+
+    __slots__ = ('children', 'baseline_file')
+
+    def __init__(self, baseline_file: Optional[Path]) -> None:
+        self.children: Dict[str, '_Directory'] = {}
+        self.baseline_file = baseline_file
+        """Baseline inside directory, None if there is no one."""
+
+
+class NestedBaselines:
+    """Baselines found up the directory tree of each linted file.
+
+    Directories are looked up once: the trie of directories down from
+    working directory is built while files are routed, each node knows
+    whether its directory has a baseline. Baselines are loaded only once an
+    error of their files is checked.
+    """
+
+    def __init__(
+        self, baseline_name: str, use_index: bool = True
+    ) -> None:  # noqa: D107
+        self.baseline_name = baseline_name
+        """Path of baseline relative to directory of subproject."""
+        self.use_index = use_index
+        self._root = _Directory(self._find_baseline(''))
+        self._digests: Dict[Path, Container[Digest]] = {}
+
+    def route(self, path: str) -> Optional[Tuple[int, Container[Digest]]]:
+        """Find the nearest baseline of file among its directories.
+
+        :param path: normalized path of file
+        :return: length of directory prefix of path (with trailing slash),
+        paths of baseline are relative to it, and digests of baseline; None
+        if file has no baseline
+        :raise BaselineFormatError: if baseline can't be loaded
+        """
+        node = self._root
+        nearest = (0, node.baseline_file)
+        prefix_length = 0
+        *directories, _ = path.split('/')
+        for directory in directories:
+            if directory in ('', '.', '..'):
+                # Outside of working directory or not normalized
+                break
+            prefix_length += len(directory) + 1
+            child = node.children.get(directory)
+            if child is None:
+                child = _Directory(self._find_baseline(path[:prefix_length]))
+                node.children[directory] = child
+            node = child
+            if node.baseline_file is not None:
+                nearest = (prefix_length, node.baseline_file)
+        prefix_length, baseline_file = nearest
+        if baseline_file is None:
+            return None
+        return prefix_length, self._get_digests(baseline_file)
+
+    def _find_baseline(self, directory: str) -> Optional[Path]:
+        """Get baseline of directory (relative with trailing slash)."""
+        baseline_file = Path(directory + self.baseline_name)
+        if os.path.exists(baseline_file):
+            return baseline_file
+        return None
+
+    def _get_digests(self, baseline_file: Path) -> Container[Digest]:
+        """Load digests of baseline on the first use."""
+        digests = self._digests.get(baseline_file)
+        if digests is None:
+            digests = get_digests_from_baseline(
+                baseline_file, use_index=self.use_index
+            )
+            self._digests[baseline_file] = digests
+            timings.count('loaded baselines', 1)
+        return digests
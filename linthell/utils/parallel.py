@@ -0,0 +1,174 @@
+"""Parsing of huge linter outputs in parallel processes.
+
+Linter output is split into blocks at record boundaries found by plugin,
+blocks are parsed (and id lines are hashed) in a process pool and results
+are merged in order of blocks, so they are the same as of serial parsing.
+"""
+
+from collections import deque
+from concurrent.futures import Future
+from functools import partial
+from typing import (
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from linthell.plugins.base import LinthellPlugin
+from linthell.utils.diff_scope import DiffScope
+from linthell.utils.id_lines import MD5, DigestScheme
+from linthell.utils.types import Digest, IdLine, LinterError
+
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+"""Approximate size of linter output block parsed by a single process."""
+_PENDING_BLOCKS_PER_JOB = 2
+"""Blocks submitted ahead per process, limits memory of pending results."""
+
+T = TypeVar('T')
+
+
+def is_splittable(plugin: LinthellPlugin) -> bool:
+    """Check if plugin can split its output into blocks."""
+    return (
+        type(plugin).find_record_boundary
+        is not LinthellPlugin.find_record_boundary
+    )
+
+
+def iter_blocks(
+    chunks: Iterable[str],
+    plugin: LinthellPlugin,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Iterator[str]:
+    """Join chunks of linter output into blocks split at record boundaries.
+
+    Block is yielded once boundary is found after half of block size, so
+    blocks are from half to about whole block size long.
+    """
+    parts: List[str] = []
+    parts_size = 0
+    threshold = block_size
+    for chunk in chunks:
+        parts.append(chunk)
+        parts_size += len(chunk)
+        if parts_size < threshold:
+            continue
+        buffer = ''.join(parts)
+        boundary = plugin.find_record_boundary(buffer, block_size // 2)
+        if not boundary:
+            # No boundary yet, e.g. a huge record, wait for more output
+            parts = [buffer]
+            threshold = parts_size * 2
+            continue
+        yield buffer[:boundary]
+        parts = [buffer[boundary:]]
+        parts_size = len(parts[0])
+        threshold = block_size
+    buffer = ''.join(parts)
+    if buffer:
+        yield buffer
+
+
+def iter_errors_with_digests(
+    chunks: Iterable[str],
+    plugin: LinthellPlugin,
+    jobs: int,
+    scope: Optional[DiffScope] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    scheme: DigestScheme = MD5,
+) -> Iterator[Tuple[LinterError, Digest]]:
+    """Parse linter output and hash id lines of errors in parallel.
+
+    :param chunks: linter output split by chunks
+    :param plugin: plugin to parse output, it must be picklable
+    :param jobs: count of processes
+    :param scope: if provided, errors outside of it are dropped
+    :param block_size: approximate size of block parsed by a process
+    :param scheme: digest scheme of baseline
+    :return: errors with digests of their id lines, in order of output
+    """
+    blocks = iter_blocks(chunks, plugin, block_size)
+    for results in _map_in_order(
+        partial(_parse_block_with_digests, scheme=scheme),
+        blocks,
+        plugin,
+        jobs,
+        scope,
+    ):
+        yield from results
+
+
+def iter_id_lines(
+    chunks: Iterable[str],
+    plugin: LinthellPlugin,
+    jobs: int,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Iterator[IdLine]:
+    """Parse linter output in parallel and yield id lines of errors.
+
+    See `iter_errors_with_digests` for parameters.
+    """
+    blocks = iter_blocks(chunks, plugin, block_size)
+    for results in _map_in_order(_parse_block_id_lines, blocks, plugin, jobs):
+        yield from results
+
+
+def _map_in_order(
+    function: Callable[[LinthellPlugin, str, Optional[DiffScope]], T],
+    blocks: Iterable[str],
+    plugin: LinthellPlugin,
+    jobs: int,
+    scope: Optional[DiffScope] = None,
+) -> Iterator[T]:
+    """Apply function to blocks in process pool, yield results in order.
+
+    Only a few blocks per process are submitted ahead, so the whole output
+    isn't kept in memory.
+    """
+    # Importing multiprocessing takes a while, most runs parse serially
+    from concurrent.futures import ProcessPoolExecutor
+
+    pending: Deque['Future[T]'] = deque()
+    with ProcessPoolExecutor(jobs) as executor:
+        for block in blocks:
+            pending.append(executor.submit(function, plugin, block, scope))
+            if len(pending) >= jobs * _PENDING_BLOCKS_PER_JOB:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _parse_block(
+    plugin: LinthellPlugin, block: str, scope: Optional[DiffScope]
+) -> Iterator[LinterError]:
+    if scope is None:
+        return plugin.iter_parse([block])
+    return plugin.iter_parse_in_scope([block], scope)
+
+
+def _parse_block_with_digests(
+    plugin: LinthellPlugin,
+    block: str,
+    scope: Optional[DiffScope],
+    scheme: DigestScheme,
+) -> List[Tuple[LinterError, Digest]]:
+    """Parse block of output and hash id lines, executed in pool."""
+    return [
+        (linter_error, scheme.digest(linter_error.id_line))
+        for linter_error in _parse_block(plugin, block, scope)
+    ]
+
+
+def _parse_block_id_lines(
+    plugin: LinthellPlugin, block: str, scope: Optional[DiffScope]
+) -> List[IdLine]:
+    """Parse block of output and get id lines, executed in pool."""
+    return [
+        linter_error.id_line
+        for linter_error in _parse_block(plugin, block, scope)
+    ]
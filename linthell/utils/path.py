@@ -1,3 +1,5 @@
+import os
+import tempfile
 from pathlib import Path
 
 
@@ -12,3 +14,17 @@ def normalize_path(path: Path) -> str:
     if path.is_absolute():
         path = path.relative_to(Path.cwd())
     return path.as_posix()
+
+
+def write_atomic(path: Path, *parts: bytes) -> None:
+    """Write file atomically, so concurrent readers see whole file only."""
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=path.name, delete=False
+    ) as file:
+        for part in parts:
+            file.write(part)
+    try:
+        os.replace(file.name, path)
+    except OSError:
+        os.unlink(file.name)
+        raise
@@ -1,33 +1,263 @@
-"""Pre-commit integration utilities."""
+"""Pre-commit integration utilities.
 
-from typing import Tuple
+Modules of pre-commit are imported only when hooks are resolved, it takes
+a while, so commands which find files of hooks in cache don't pay for it.
+"""
 
-from pre_commit.clientlib import load_config  # type: ignore
-from pre_commit.commands.run import Classifier  # type: ignore
-from pre_commit.git import get_all_files  # type: ignore
-from pre_commit.repository import all_hooks  # type: ignore
-from pre_commit.store import Store  # type: ignore
+import hashlib
+import importlib.util
+import json
+import os
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
+from linthell.utils import timings
+from linthell.utils.cache import get_cache_dir
+from linthell.utils.git import GitError, get_index_digest
+from linthell.utils.path import write_atomic
 
-def get_all_files_by_hook(config_file: str, hook_name: str) -> Tuple[str, ...]:
+HOOK_FILES_CACHE_VERSION = '1'
+"""Bump it once format of cached manifests changes."""
+_MAX_CACHED_MANIFESTS = 8
+"""Manifests of older index states are removed."""
+
+
+class HookFilesManifest(NamedTuple):
+    """Files of all hooks of pre-commit config (like with --all-files)."""
+
+    files: Tuple[str, ...]
+    """All files of git repository."""
+    hooks: Dict[str, Optional[Tuple[int, ...]]]
+    """Indices of files checked by hook, by hook name.
+
+    None if several hooks have the same name.
+    """
+
+    def get_files(self, hook_name: str) -> Tuple[str, ...]:
+        """Get all files that hook checks.
+
+        :raise ValueError: if hook is unknown or its name is ambiguous
+        """
+        if hook_name not in self.hooks:
+            raise ValueError(f'Unknown hook name: {hook_name}')
+        indices = self.hooks[hook_name]
+        if indices is None:
+            raise ValueError(f'Several hooks are named {hook_name}')
+        return tuple(self.files[index] for index in indices)
+
+    def to_json(self) -> bytes:
+        """Serialize manifest to store it in cache."""
+        manifest = {'files': self.files, 'hooks': self.hooks}
+        return json.dumps(manifest, ensure_ascii=False).encode('utf-8')
+
+    @classmethod
+    def from_json(cls, content: bytes) -> 'HookFilesManifest':
+        """Deserialize manifest stored in cache.
+
+        :raise ValueError: if content isn't a manifest
+        """
+        try:
+            manifest = json.loads(content)
+            return cls(
+                tuple(manifest['files']),
+                {
+                    hook_name: None if indices is None else tuple(indices)
+                    for hook_name, indices in manifest['hooks'].items()
+                },
+            )
+        except (KeyError, TypeError, AttributeError) as error:
+            raise ValueError(f'Invalid manifest: {error!r}') from error
+
+
+def get_all_files_by_hook(
+    config_file: str,
+    hook_name: str,
+    use_cache: bool = True,
+    cache_dir: Optional[Path] = None,
+) -> Tuple[str, ...]:
     """Get all files that hook checks (simular to --all behaviour).
 
     Based on pre-commit hook internals, so might not work on some version of
     pre-commit. Report an author about it (with pre-commit and linthell
     versions).
+
+    :param use_cache: take files from manifest cached by state of git index
+    and config, see `get_hook_files_manifest`
+    :param cache_dir: root directory of linthell caches
     """
-    config = load_config(config_file)
-    classifier = Classifier.from_config(
-        filenames=get_all_files(),
-        include=config['files'],
-        exclude=config['exclude'],
+    if use_cache:
+        manifest = get_hook_files_manifest(config_file, cache_dir)
+        # Files deleted from working tree are still in git index
+        return tuple(
+            filename
+            for filename in manifest.get_files(hook_name)
+            if os.path.lexists(filename)
+        )
+    from pre_commit.git import get_all_files  # type: ignore
+
+    return get_files_by_hook(
+        config_file, hook_name, get_all_files(), use_cache=False
     )
-    store = Store()
-    hooks = [
-        hook for hook in all_hooks(config, store) if hook.name == hook_name
+
+
+def get_files_by_hook(
+    config_file: str,
+    hook_name: str,
+    filenames: Iterable[str],
+    use_cache: bool = True,
+    cache_dir: Optional[Path] = None,
+) -> Tuple[str, ...]:
+    """Get files that hook checks among provided ones.
+
+    Missing files are skipped. See `get_all_files_by_hook` for details.
+    Cached manifest is used only if all provided files are in git index,
+    other files (like untracked ones) are classified by pre-commit.
+    """
+    filenames = [
+        filename for filename in filenames if os.path.lexists(filename)
     ]
+    if use_cache:
+        manifest = get_hook_files_manifest(config_file, cache_dir)
+        if set(filenames) <= set(manifest.files):
+            hook_files = set(manifest.get_files(hook_name))
+            return tuple(
+                filename for filename in filenames if filename in hook_files
+            )
+    config = _load_config(config_file)
+    [hook] = _load_hooks(config, hook_name)
+    classifier = _create_classifier(config, filenames)
+    return tuple(classifier.filenames_for_hook(hook))
+
+
+def get_hook_files_manifest(
+    config_file: str, cache_dir: Optional[Path] = None
+) -> HookFilesManifest:
+    """Get files of all hooks, manifest is cached until its inputs change.
+
+    Manifest is cached by content of config and git index (files are added,
+    removed or staged), working directory and installed pre-commit. Hooks are
+    resolved only if manifest isn't cached, resolving may install repos of
+    hooks. Outside of git repository manifest is never cached.
+
+    :param config_file: path to pre-commit config
+    :param cache_dir: root directory of linthell caches, see
+    `get_cache_dir` for default
+    """
+    key = _get_manifest_key(config_file)
+    manifest_path = None
+    if key is not None:
+        manifest_path = (
+            (cache_dir or get_cache_dir()) / 'hooks' / f'{key}.json'
+        )
+        with suppress(OSError, ValueError):
+            manifest = HookFilesManifest.from_json(manifest_path.read_bytes())
+            with suppress(OSError):
+                # Modification time is used as last access time by eviction
+                os.utime(manifest_path)
+            timings.count('hook files cache hits', 1)
+            return manifest
+
+    timings.count('hook files cache misses', 1)
+    with timings.span('resolve hooks'):
+        manifest = _build_manifest(config_file)
+    if manifest_path is not None:
+        with suppress(OSError):
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(manifest_path, manifest.to_json())
+            _evict_manifests(manifest_path.parent)
+    return manifest
+
+
+def _get_manifest_key(config_file: str) -> Optional[str]:
+    """Get cache key of manifest, None if manifest can't be cached."""
+    try:
+        parts = [
+            HOOK_FILES_CACHE_VERSION,
+            os.getcwd(),
+            hashlib.sha256(Path(config_file).read_bytes()).hexdigest(),
+            get_index_digest(),
+        ]
+    except (OSError, GitError):
+        return None
+    # Version of pre-commit is taken into account by modification time of
+    # its package, importing pre-commit to get version is slow
+    spec = importlib.util.find_spec('pre_commit')
+    if spec is not None and spec.origin:
+        with suppress(OSError):
+            parts.append(str(os.stat(spec.origin).st_mtime_ns))
+
+    key = hashlib.sha256()
+    for part in parts:
+        key.update(part.encode('utf-8'))
+        key.update(b'\0')
+    return key.hexdigest()
+
+
+def _build_manifest(config_file: str) -> HookFilesManifest:
+    """Resolve all hooks and classify all files of repository by them."""
+    from pre_commit.git import get_all_files  # type: ignore
+
+    config = _load_config(config_file)
+    files = tuple(get_all_files())
+    classifier = _create_classifier(config, files)
+    indices_by_file = {file: index for index, file in enumerate(files)}
+    hooks: Dict[str, Optional[Tuple[int, ...]]] = {}
+    for hook in _load_hooks(config):
+        if hook.name in hooks:
+            hooks[hook.name] = None
+            continue
+        hooks[hook.name] = tuple(
+            indices_by_file[file]
+            for file in classifier.filenames_for_hook(hook)
+        )
+    return HookFilesManifest(files, hooks)
+
+
+def _load_config(config_file: str) -> Dict[str, Any]:
+    from pre_commit.clientlib import load_config  # type: ignore
+
+    return load_config(config_file)
+
+
+def _load_hooks(
+    config: Dict[str, Any], hook_name: Optional[str] = None
+) -> List[Any]:
+    """Resolve hooks of config, hooks with provided name only if it's set.
+
+    :raise ValueError: if there is no hook with provided name
+    """
+    from pre_commit.repository import all_hooks  # type: ignore
+    from pre_commit.store import Store  # type: ignore
+
+    hooks = all_hooks(config, Store())
+    if hook_name is None:
+        return list(hooks)
+    hooks = [hook for hook in hooks if hook.name == hook_name]
     if not hooks:
         raise ValueError(f'Unknown hook name: {hook_name}')
-    [hook] = hooks
-    filenames = classifier.filenames_for_hook(hook)
-    return filenames
+    return hooks
+
+
+def _create_classifier(
+    config: Dict[str, Any], filenames: Iterable[str]
+) -> Any:
+    from pre_commit.commands.run import Classifier  # type: ignore
+
+    return Classifier.from_config(
+        filenames=filenames,
+        include=config['files'],
+        exclude=config['exclude'],
+    )
+
+
+def _evict_manifests(directory: Path) -> None:
+    """Remove least recently used manifests."""
+    manifests = []
+    with suppress(OSError):
+        for entry in os.scandir(directory):
+            manifests.append((entry.stat().st_mtime, entry.path))
+    manifests.sort(reverse=True)
+    for _, manifest_path in manifests[_MAX_CACHED_MANIFESTS:]:
+        with suppress(OSError):
+            os.unlink(manifest_path)
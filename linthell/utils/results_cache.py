@@ -0,0 +1,284 @@
+"""Content-addressed cache of parsed linter errors per file."""
+
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import subprocess
+from contextlib import suppress
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from linthell.plugins.base import LinthellPlugin
+from linthell.utils import timings
+from linthell.utils.cache import get_cache_dir
+from linthell.utils.path import normalize_path, write_atomic
+from linthell.utils.types import LinterError
+
+CACHE_VERSION = '2'
+"""Bump it once format of entries or id lines changes."""
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+DEFAULT_LINTER_CONFIG_FILES = (
+    'setup.cfg',
+    'tox.ini',
+    'pyproject.toml',
+    '.flake8',
+    '.pylintrc',
+    'pylintrc',
+    'mypy.ini',
+    '.mypy.ini',
+    '.pydocstyle',
+    '.pydocstyle.ini',
+    '.pydocstylerc',
+    '.isort.cfg',
+    '.editorconfig',
+)
+"""Common config files of python linters, they invalidate cache too."""
+_EVICTION_RATIO = 0.8
+"""Eviction removes entries until cache size is below this part of limit."""
+_VERSION_TIMEOUT = 30
+"""Seconds to wait for linter to print its version."""
+
+
+class ResultsCache:
+    """Cache of parsed linter errors, one entry per linted file.
+
+    Entry key is built from file path and content and linting context:
+    linter command, linter output stream, plugin and linter config files.
+    So entry is reused only if nothing that can affect the result changed.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        context: str,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ) -> None:
+        """Initialize cache.
+
+        :param cache_dir: root directory of linthell caches
+        :param context: hash of linting context, see `get_linting_context`
+        :param max_size: max size of cache in bytes
+        """
+        self.directory = cache_dir / 'results'
+        self.context = context
+        self.max_size = max_size
+
+    @classmethod
+    def for_linter(
+        cls,
+        linter_command: str,
+        linter_output: str,
+        plugin: LinthellPlugin,
+        cache_dir: Optional[Path] = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        config_files: Iterable[str] = (),
+    ) -> 'ResultsCache':
+        """Create cache for linter.
+
+        :param cache_dir: root directory of linthell caches, see
+        `get_cache_dir` for default
+        :param config_files: linter config files in addition to common ones
+        """
+        context = get_linting_context(
+            linter_command,
+            linter_output,
+            plugin,
+            [*DEFAULT_LINTER_CONFIG_FILES, *config_files],
+        )
+        return cls(cache_dir or get_cache_dir(), context, max_size)
+
+    def iter_errors(
+        self,
+        files: Tuple[str, ...],
+        lint: Callable[[Tuple[str, ...]], Iterable[LinterError]],
+    ) -> Iterator[LinterError]:
+        """Get errors of files, lint only files missing in cache.
+
+        Errors are yielded in order of files. Errors of files which weren't
+        requested are yielded at the end and aren't cached.
+
+        :param files: files to lint
+        :param lint: function which lints files and returns parsed errors
+        """
+        with timings.span('cache.load'):
+            keys = {file: self.get_key(file) for file in files}
+            cached_errors: Dict[str, List[LinterError]] = {}
+            missed_files = []
+            for file, key in keys.items():
+                errors = self.load(key) if key else None
+                if errors is None:
+                    missed_files.append(file)
+                else:
+                    cached_errors[file] = errors
+        timings.count('cache hits', len(cached_errors))
+        timings.count('cache misses', len(missed_files))
+
+        normalized_paths = {
+            file: normalize_path(Path(file)) for file in missed_files
+        }
+        fresh_errors: Dict[str, List[LinterError]] = {
+            normalized_path: []
+            for normalized_path in normalized_paths.values()
+        }
+        other_errors = []
+        is_cacheable = True
+        if missed_files:
+            for error in lint(tuple(missed_files)):
+                if error.path in fresh_errors:
+                    fresh_errors[error.path].append(error)
+                else:
+                    # Errors without path may belong to any file
+                    is_cacheable = is_cacheable and error.path is not None
+                    other_errors.append(error)
+            if is_cacheable:
+                with timings.span('cache.save'):
+                    for file in missed_files:
+                        key = keys[file]
+                        if key:
+                            self.save(
+                                key, fresh_errors[normalized_paths[file]]
+                            )
+                    self.evict()
+
+        for file in keys:
+            if file in cached_errors:
+                yield from cached_errors[file]
+            else:
+                yield from fresh_errors[normalized_paths[file]]
+        yield from other_errors
+
+    def get_key(self, file: str) -> Optional[str]:
+        """Get entry key of file, None if file can't be read."""
+        try:
+            content = Path(file).read_bytes()
+        except OSError:
+            return None
+        key = hashlib.sha256()
+        for part in (
+            self.context.encode(),
+            normalize_path(Path(file)).encode(),
+            hashlib.sha256(content).digest(),
+        ):
+            key.update(part)
+            key.update(b'\0')
+        return key.hexdigest()
+
+    def load(self, key: str) -> Optional[List[LinterError]]:
+        """Load errors of entry, None if it's missing."""
+        entry_path = self._get_entry_path(key)
+        try:
+            records = json.loads(entry_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        with suppress(OSError):
+            # Modification time is used as last access time by eviction
+            os.utime(entry_path)
+        return [
+            LinterError(id_line, error_message, path, line)
+            for id_line, error_message, path, line in records
+        ]
+
+    def save(self, key: str, errors: List[LinterError]) -> None:
+        """Save errors of entry, errors to write cache are ignored."""
+        entry_path = self._get_entry_path(key)
+        records = [
+            [error.id_line, error.error_message, error.path, error.line]
+            for error in errors
+        ]
+        content = json.dumps(records, ensure_ascii=False).encode('utf-8')
+        with suppress(OSError):
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(entry_path, content)
+
+    def evict(self) -> None:
+        """Remove least recently used entries if cache is too big."""
+        entries = []
+        total_size = 0
+        with suppress(OSError):
+            for shard in os.scandir(self.directory):
+                if not shard.is_dir():
+                    continue
+                for entry in os.scandir(shard.path):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total_size += stat.st_size
+        if total_size <= self.max_size:
+            return
+
+        target_size = self.max_size * _EVICTION_RATIO
+        for _, size, entry_path in sorted(entries):
+            if total_size <= target_size:
+                break
+            with suppress(OSError):
+                os.unlink(entry_path)
+                total_size -= size
+
+    def _get_entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f'{key}.json'
+
+
+def get_linting_context(
+    linter_command: str,
+    linter_output: str,
+    plugin: LinthellPlugin,
+    config_files: Iterable[str] = DEFAULT_LINTER_CONFIG_FILES,
+) -> str:
+    """Get hash of everything except file itself that affects linter result.
+
+    Linter version is taken into account, see `get_linter_version`.
+    """
+    command = shlex.split(linter_command)
+    plugin_class = type(plugin)
+    parts = [
+        CACHE_VERSION,
+        *command,
+        linter_output,
+        f'{plugin_class.__module__}.{plugin_class.__qualname__}',
+        getattr(plugin, 'lint_format', ''),
+        get_linter_version(command),
+    ]
+    for config_file in sorted(set(config_files)):
+        try:
+            config_hash = hashlib.sha256(Path(config_file).read_bytes())
+        except OSError:
+            parts.append(f'{config_file}:-')
+        else:
+            parts.append(f'{config_file}:{config_hash.hexdigest()}')
+
+    context = hashlib.sha256()
+    for part in parts:
+        context.update(part.encode('utf-8'))
+        context.update(b'\0')
+    return context.hexdigest()
+
+
+def get_linter_version(command: List[str]) -> str:
+    """Get version of linter: output of linter command with `--version`.
+
+    The whole command is run, so wrappers like `poetry run` or `python -m`
+    report version of linter they actually run. If linter can't print its
+    version, modification time of command executable is used instead,
+    it changes once it's (re)installed.
+
+    :param command: linter command split to arguments
+    """
+    if not command:
+        return ''
+    with timings.span('cache.version'):
+        with suppress(OSError, subprocess.SubprocessError):
+            result = subprocess.run(
+                [*command, '--version'],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                timeout=_VERSION_TIMEOUT,
+                check=True,
+            )
+            return result.stdout.decode('utf-8', 'replace')
+    executable = shutil.which(command[0])
+    if executable:
+        with suppress(OSError):
+            return str(os.stat(executable).st_mtime_ns)
+    return ''
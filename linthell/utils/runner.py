@@ -0,0 +1,222 @@
+"""Concurrent execution of several linters declared in config file."""
+
+import asyncio
+import os
+import shlex
+import signal
+import sys
+from asyncio.subprocess import DEVNULL, Process
+from contextlib import suppress
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+from typing_extensions import Literal
+
+from linthell.plugins.base import LinthellPlugin, load_plugin_by_name
+from linthell.plugins.regex import LinthellRegexPlugin
+from linthell.utils.baseline import (
+    BaselineFormatError,
+    get_digests_from_baseline,
+)
+from linthell.utils.baseline_db import DatabaseError
+from linthell.utils.lint import iter_new_errors
+from linthell.utils.streams import create_output_decoder, iter_fd_chunks
+
+
+@dataclass(frozen=True)
+class LinterConfig:
+    """Linter declared in config file for `run` command."""
+
+    name: str
+    linter_command: str
+    baseline_file: str
+    plugin_name: Optional[str] = None
+    lint_format: Optional[str] = None
+    linter_output: Literal['stdout', 'stderr'] = 'stdout'
+
+    @classmethod
+    def from_section(
+        cls, name: str, section: Mapping[str, str]
+    ) -> 'LinterConfig':
+        """Create linter config from config file section.
+
+        :raise ValueError: if section has unknown keys or misses required
+        """
+        keys = {field.name for field in fields(cls)} - {'name'}
+        unknown_keys = set(section) - keys
+        if unknown_keys:
+            raise ValueError(
+                f'Unknown keys of linter {name}: {", ".join(unknown_keys)}'
+            )
+        for key in ('linter_command', 'baseline_file'):
+            if key not in section:
+                raise ValueError(f'Linter {name} misses {key}')
+        if ('plugin_name' in section) == ('lint_format' in section):
+            raise ValueError(
+                f'Linter {name} must have either plugin_name or lint_format'
+            )
+        if section.get('linter_output', 'stdout') not in ('stdout', 'stderr'):
+            raise ValueError(
+                f'Linter {name} linter_output must be stdout or stderr'
+            )
+        return cls(name=name, **section)  # type: ignore
+
+    def create_plugin(self) -> LinthellPlugin:
+        """Create plugin to parse linter output."""
+        if self.plugin_name:
+            return load_plugin_by_name(self.plugin_name)
+        assert self.lint_format
+        return LinthellRegexPlugin(self.lint_format)
+
+
+@dataclass
+class LinterReport:
+    """Report from linting output of a single linter."""
+
+    name: str
+    errors: List[str]
+
+
+def run_linters(
+    linters: Sequence[LinterConfig],
+    files: Tuple[str, ...] = (),
+    use_baseline_index: bool = True,
+) -> List[LinterReport]:
+    """Run linters concurrently and lint their outputs against baselines.
+
+    :param linters: linters to run
+    :param files: files to append to each linter command
+    :param use_baseline_index: use binary index of baselines
+    :return: reports in order of linters
+    :raise ValueError: if any linter cannot be started or its output cannot
+    be linted (for example, its baseline is invalid), other linters are
+    killed then
+    """
+    return asyncio.run(_run_linters(linters, files, use_baseline_index))
+
+
+async def _run_linters(
+    linters: Sequence[LinterConfig],
+    files: Tuple[str, ...],
+    use_baseline_index: bool,
+) -> List[LinterReport]:
+    """Start all linters first, then lint their outputs as they are printed."""
+    processes: List[Process] = []
+    output_fds: List[int] = []
+    try:
+        for linter in linters:
+            process, output_fd = await _start_linter(linter, files)
+            processes.append(process)
+            output_fds.append(output_fd)
+    except ValueError:
+        await _kill_linters(processes)
+        for output_fd in output_fds:
+            os.close(output_fd)
+        raise
+
+    tasks = [
+        asyncio.ensure_future(
+            _lint(linter, process, output_fd, use_baseline_index)
+        )
+        for linter, process, output_fd in zip(linters, processes, output_fds)
+    ]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await _kill_linters(processes)
+        raise
+
+
+async def _kill_linters(processes: Sequence[Process]) -> None:
+    """Kill linters which are still running, with their process groups.
+
+    Processes spawned by linter keep its output pipe open, so they are
+    killed too.
+    """
+    for process in processes:
+        if process.returncode is None:
+            # Linter may exit right before it's killed
+            with suppress(ProcessLookupError):
+                if sys.platform == 'win32':
+                    process.kill()
+                else:
+                    os.killpg(process.pid, signal.SIGKILL)
+            await process.wait()
+
+
+async def _start_linter(
+    linter: LinterConfig, files: Tuple[str, ...]
+) -> Tuple[Process, int]:
+    """Start linter process, unused output stream is discarded.
+
+    :return: linter process and read end of pipe with its output
+    """
+    is_stdout = linter.linter_output == 'stdout'
+    output_fd, write_fd = os.pipe()
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *shlex.split(linter.linter_command),
+            *files,
+            stdout=write_fd if is_stdout else DEVNULL,
+            stderr=DEVNULL if is_stdout else write_fd,
+            start_new_session=sys.platform != 'win32',
+        )
+    except OSError as error:
+        os.close(output_fd)
+        raise ValueError(f'Cannot run linter {linter.name}: {error}')
+    finally:
+        os.close(write_fd)
+    return process, output_fd
+
+
+async def _lint(
+    linter: LinterConfig,
+    process: Process,
+    output_fd: int,
+    use_baseline_index: bool,
+) -> LinterReport:
+    """Lint linter output in a thread as soon as it's printed.
+
+    Thread is used so event loop keeps waiting for other linters.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        report = await loop.run_in_executor(
+            None, _lint_output, linter, output_fd, use_baseline_index
+        )
+    except (BaselineFormatError, DatabaseError, OSError) as error:
+        raise ValueError(
+            f'Cannot lint output of linter {linter.name}: {error}'
+        ) from error
+    await process.wait()
+    return report
+
+
+def _lint_output(
+    linter: LinterConfig, output_fd: int, use_baseline_index: bool
+) -> LinterReport:
+    """Lint linter output against linter baseline.
+
+    Output is parsed chunk by chunk while it's read from the pipe, it's
+    never kept in memory as a whole.
+
+    :param output_fd: read end of pipe with linter output, it's closed
+    """
+    try:
+        plugin = linter.create_plugin()
+        digests = get_digests_from_baseline(
+            Path(linter.baseline_file), use_index=use_baseline_index
+        )
+        chunks = iter_fd_chunks(output_fd, create_output_decoder())
+        errors = [
+            linter_error.error_message
+            for linter_error in iter_new_errors(
+                digests, plugin.iter_parse(chunks)
+            )
+        ]
+    finally:
+        os.close(output_fd)
+    return LinterReport(linter.name, errors)
@@ -0,0 +1,221 @@
+"""Bounded access to lines of source files.
+
+Replacement of `linecache` for large linter outputs: files are
+memory-mapped instead of being read into lists of strings, line offsets
+are indexed lazily and least recently used files are closed once memory
+or file budget is exceeded.
+"""
+
+import io
+import mmap
+import os
+import re
+import tokenize
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from types import TracebackType
+from typing import Iterable, List, Optional, Type, Union
+
+from linthell.utils import timings
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+"""Default budget of memory-mapped files size."""
+DEFAULT_MAX_FILES = 128
+"""Default budget of simultaneously opened files."""
+DEFAULT_PREFETCH_WORKERS = 8
+_LONE_CARRIAGE_RETURN_PATTERN = re.compile(rb'\r(?!\n)')
+
+
+class _SourceFile:
+    """Memory-mapped source file with lazily built line offsets."""
+
+    def __init__(self, path: str, read_ahead: bool = False) -> None:
+        """Memory-map file.
+
+        :param path: path to file
+        :param read_ahead: ask OS to start reading the whole file in
+        background, so the first access doesn't wait for I/O
+        """
+        with open(path, 'rb') as file:
+            self.size = os.fstat(file.fileno()).st_size
+            self.buffer: Union[bytes, mmap.mmap] = b''
+            if self.size:
+                self.buffer = mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            if read_ahead and hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+        self.encoding: Optional[str] = None
+        self._offsets: List[int] = [0]
+        """Start offsets of lines, the last one is offset of unread part."""
+        self._is_indexed = False
+        self._is_prepared = False
+
+    def getline(self, line_number: int) -> str:
+        """Get line by its number (starting from 1) without line break."""
+        if not self._is_prepared:
+            self._prepare()
+        if self.encoding is None or line_number < 1:
+            return ''
+        self._index_until(line_number)
+        if line_number >= len(self._offsets):
+            return ''
+        start = self._offsets[line_number - 1]
+        end = self._offsets[line_number] - 1
+        line = self.buffer[start:end]
+        if line.endswith(b'\r'):
+            line = line[:-1]
+        try:
+            return line.decode(self.encoding)
+        except UnicodeDecodeError:
+            return ''
+
+    def close(self) -> None:
+        """Unmap file from memory."""
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def _prepare(self) -> None:
+        """Detect encoding and line breaks style on the first access."""
+        self._is_prepared = True
+        if _LONE_CARRIAGE_RETURN_PATTERN.search(self.buffer):
+            # Lone '\r' is a line break too (as for `linecache`), such files
+            # are rare enough to normalize them in memory
+            content = self.buffer[:]
+            self.close()
+            self.buffer = content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        self.encoding = _detect_encoding(self.buffer)
+
+    def _index_until(self, line_number: int) -> None:
+        """Find line breaks until the end of the requested line."""
+        offsets = self._offsets
+        while len(offsets) <= line_number and not self._is_indexed:
+            line_break = self.buffer.find(b'\n', offsets[-1])
+            if line_break != -1:
+                offsets.append(line_break + 1)
+                continue
+            self._is_indexed = True
+            end = len(self.buffer)
+            if offsets[-1] < end:
+                # The last line without line break
+                offsets.append(end + 1)
+
+
+def _detect_encoding(buffer: Union[bytes, mmap.mmap]) -> Optional[str]:
+    """Detect encoding of python source (coding cookie and BOM aware)."""
+    head = io.BytesIO(buffer[:1024])
+    try:
+        encoding, _ = tokenize.detect_encoding(head.readline)
+    except SyntaxError:
+        return None
+    return encoding
+
+
+def _open_source_file(
+    path: str, read_ahead: bool = False
+) -> Optional[_SourceFile]:
+    """Open source file, return None if it cannot be read."""
+    try:
+        return _SourceFile(path, read_ahead=read_ahead)
+    except (OSError, ValueError):
+        return None
+
+
+class SourceLines:
+    """LRU cache of memory-mapped source files.
+
+    Usage:
+    with SourceLines() as source_lines:
+        source_lines.prefetch(['a.py', 'b.py'])
+        code = source_lines.getline('a.py', 10)
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_files: int = DEFAULT_MAX_FILES,
+        prefetch_workers: int = DEFAULT_PREFETCH_WORKERS,
+    ) -> None:
+        """Initialize empty cache.
+
+        :param max_bytes: max total size of opened files
+        :param max_files: max count of opened files
+        :param prefetch_workers: count of threads to open files in parallel
+        """
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.prefetch_workers = prefetch_workers
+        self._files: 'OrderedDict[str, Optional[_SourceFile]]' = OrderedDict()
+        self._total_bytes = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def getline(self, path: str, line_number: int) -> str:
+        """Get line of file by its number (starting from 1).
+
+        Line break is not included. If file or line doesn't exist, returns
+        empty string.
+        """
+        if path in self._files:
+            self._files.move_to_end(path)
+            source_file = self._files[path]
+        else:
+            source_file = _open_source_file(path)
+            self._add(path, source_file)
+        if source_file is None:
+            return ''
+        return source_file.getline(line_number)
+
+    def prefetch(self, paths: Iterable[str]) -> None:
+        """Open files in parallel, so later `getline` calls don't wait I/O.
+
+        Files which don't fit into budget are skipped.
+        """
+        missing_paths = [path for path in paths if path not in self._files]
+        missing_paths = missing_paths[: self.max_files]
+        if not missing_paths:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.prefetch_workers)
+        source_files = self._executor.map(
+            partial(_open_source_file, read_ahead=True), missing_paths
+        )
+        for path, source_file in zip(missing_paths, source_files):
+            self._add(path, source_file)
+
+    def close(self) -> None:
+        """Close all opened files and prefetch threads."""
+        for source_file in self._files.values():
+            if source_file is not None:
+                source_file.close()
+        self._files.clear()
+        self._total_bytes = 0
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'SourceLines':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def _add(self, path: str, source_file: Optional[_SourceFile]) -> None:
+        """Add file to the cache, evict least recently used files."""
+        self._files[path] = source_file
+        if source_file is not None:
+            self._total_bytes += source_file.size
+            timings.count('files touched')
+        while len(self._files) > 1 and (
+            len(self._files) > self.max_files
+            or self._total_bytes > self.max_bytes
+        ):
+            _, evicted_file = self._files.popitem(last=False)
+            if evicted_file is not None:
+                self._total_bytes -= evicted_file.size
+                evicted_file.close()
@@ -0,0 +1,150 @@
+"""Utilities for incremental processing of linter output.
+
+Chunks of linter output read from pipes are yielded as soon as data arrives.
+Empty chunk means that the pipe went idle: parsers may emit records they
+hold back if those are complete anyway, the next line can't change them.
+"""
+
+import codecs
+import io
+import locale
+import os
+import select
+import stat
+import sys
+from typing import Iterable, Iterator, Optional, TextIO
+
+from linthell.utils import timings
+
+CHUNK_SIZE = 64 * 1024
+"""Default size of chunks to read linter output by."""
+IDLE_TIMEOUT = 0.1
+"""Seconds without new data after which pipe is considered idle."""
+_LINE_BREAKS = '\r\n\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+"""Characters treated as line boundaries by `str.splitlines`."""
+
+
+def iter_chunks(stream: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Read text stream chunk by chunk until EOF.
+
+    Pipes (and terminals) are read by `iter_fd_chunks`, so output is yielded
+    as soon as it arrives, not once the whole chunk is read.
+    """
+    fd = _get_pipe_fd(stream)
+    if fd is None:
+        chunks = iter(lambda: stream.read(chunk_size), '')
+    else:
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder(stream.encoding)(
+                stream.errors or 'strict'
+            ),
+            translate=True,
+        )
+        chunks = iter_fd_chunks(fd, decoder, chunk_size)
+    return timings.timed('read input', chunks)
+
+
+def iter_fd_chunks(
+    fd: int,
+    decoder: io.IncrementalNewlineDecoder,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[str]:
+    """Read file descriptor until EOF, yield data as soon as it arrives.
+
+    Empty chunk is yielded once no data arrives for `IDLE_TIMEOUT` after
+    the last chunk (not on Windows, its pipes can't be waited for).
+
+    :param decoder: decoder of read bytes to text
+    """
+    can_wait = sys.platform != 'win32'
+    is_idle = True
+    while True:
+        if not is_idle and can_wait:
+            readable, _, _ = select.select([fd], [], [], IDLE_TIMEOUT)
+            if not readable:
+                is_idle = True
+                yield ''
+        data = os.read(fd, chunk_size)
+        output = decoder.decode(data, final=not data)
+        if output:
+            is_idle = False
+            yield output
+        if not data:
+            return
+
+
+def create_output_decoder() -> io.IncrementalNewlineDecoder:
+    """Create decoder of piped process output.
+
+    Output is decoded same way as `subprocess.run` with `text=True` does:
+    with locale encoding and universal newlines.
+    """
+    return io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder(locale.getpreferredencoding(False))(),
+        translate=True,
+    )
+
+
+def find_line_start(text: str, position: int) -> Optional[int]:
+    """Find start of the first line at or after position.
+
+    :return: position of line start, None if there are no lines after
+    """
+    if position <= 0:
+        return 0
+    line_break = text.find('\n', position - 1)
+    if line_break == -1:
+        return None
+    return line_break + 1
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Split chunks of text into lines without line breaks.
+
+    Works like `str.splitlines` over concatenated chunks, but keeps only
+    the last unfinished line in memory.
+    """
+    pending = ''
+    for chunk in chunks:
+        lines = (pending + chunk).splitlines(keepends=True)
+        # The last line may continue in the next chunk (even if it ends
+        # with '\r', it can be the first half of '\r\n')
+        pending = lines.pop() if lines else ''
+        for line in lines:
+            yield line.rstrip(_LINE_BREAKS)
+    if pending:
+        yield pending.rstrip(_LINE_BREAKS)
+
+
+def iter_lf_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Split chunks of text into lines by line feed only, as diff tools do.
+
+    Unlike `iter_lines`, other line boundaries (form feed, lone carriage
+    return, etc.) are kept inside lines, only trailing carriage return is
+    stripped.
+    """
+    pending = ''
+    for chunk in chunks:
+        lines = (pending + chunk).split('\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line[:-1] if line.endswith('\r') else line
+    if pending:
+        yield pending[:-1] if pending.endswith('\r') else pending
+
+
+def _get_pipe_fd(stream: TextIO) -> Optional[int]:
+    """Get file descriptor of stream if it's a pipe, socket or terminal.
+
+    Stream must not be read yet, decoded data buffered by stream is lost.
+    """
+    if not hasattr(stream, 'buffer') or not stream.encoding:
+        return None
+    try:
+        fd = stream.fileno()
+        if stat.S_ISREG(os.fstat(fd).st_mode):
+            return None
+    except (OSError, ValueError):
+        # Streams without file descriptor (io.UnsupportedOperation)
+        return None
+    return fd
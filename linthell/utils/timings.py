@@ -0,0 +1,164 @@
+"""Instrumentation of linthell phases: spans timings and counters.
+
+Recording is disabled by default, then spans and counters cost almost
+nothing. Plugins can record their own phases the same way linthell does:
+
+    from linthell.utils import timings
+
+    with timings.span('my-plugin.parse'):
+        records = parse_records(linter_output)
+    timings.count('my-plugin.records', len(records))
+"""
+
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Dict, Iterable, Iterator, Optional, Type, TypeVar
+
+T = TypeVar('T')
+
+
+@dataclass
+class SpanStats:
+    """Total time spent inside span with the same name."""
+
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    """CPU time of linthell process, linter processes are not included."""
+    calls: int = 0
+
+
+@dataclass
+class Stats:
+    """Recorded spans and counters in order of first occurrence."""
+
+    spans: Dict[str, SpanStats] = field(default_factory=dict)
+    counters: Dict[str, int] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.perf_counter)
+    started_at_cpu: float = field(default_factory=time.process_time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert stats to JSON-serializable dict."""
+        return {
+            'wall_time': time.perf_counter() - self.started_at,
+            'cpu_time': time.process_time() - self.started_at_cpu,
+            'spans': {
+                name: asdict(span_stats)
+                for name, span_stats in self.spans.items()
+            },
+            'counters': dict(self.counters),
+        }
+
+    def format(self) -> str:
+        """Format stats as human readable table."""
+        stats = self.to_dict()
+        width = max([len(name) for name in self.spans] + [len('total')])
+        lines = [
+            f'{"phase":<{width}}  {"wall, s":>9}  {"cpu, s":>9}  {"calls":>8}',
+        ]
+        for name, span_stats in self.spans.items():
+            lines.append(
+                f'{name:<{width}}  {span_stats.wall_time:>9.3f}'
+                f'  {span_stats.cpu_time:>9.3f}  {span_stats.calls:>8}'
+            )
+        lines.append(
+            f'{"total":<{width}}  {stats["wall_time"]:>9.3f}'
+            f'  {stats["cpu_time"]:>9.3f}'
+        )
+        if self.counters:
+            width = max(len(name) for name in self.counters)
+            lines.append('')
+            lines.extend(
+                f'{name:<{width}}  {value:>9}'
+                for name, value in self.counters.items()
+            )
+        return '\n'.join(lines)
+
+
+_stats: Optional[Stats] = None
+
+
+def enable() -> Stats:
+    """Start recording spans and counters."""
+    global _stats
+    _stats = Stats()
+    return _stats
+
+
+def disable() -> None:
+    """Stop recording, recorded stats are dropped."""
+    global _stats
+    _stats = None
+
+
+def get_stats() -> Optional[Stats]:
+    """Get recorded stats, None if recording is disabled."""
+    return _stats
+
+
+def save_stats(stats: Stats, path: Path) -> None:
+    """Save stats into JSON file."""
+    path.write_text(json.dumps(stats.to_dict(), indent=2) + '\n')
+
+
+class Span:
+    """Context manager which adds time spent inside it to the named span.
+
+    Instance can be created once and entered many times, it's cheaper for
+    hot loops. Spans can be nested, time of nested span is included into
+    outer span too.
+    """
+
+    __slots__ = ('name', '_wall_start', '_cpu_start')
+
+    def __init__(self, name: str) -> None:  # noqa: D107
+        self.name = name
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+
+    def __enter__(self) -> 'Span':
+        if _stats is not None:
+            self._wall_start = time.perf_counter()
+            self._cpu_start = time.process_time()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if _stats is None:
+            return
+        span_stats = _stats.spans.get(self.name)
+        if span_stats is None:
+            span_stats = _stats.spans[self.name] = SpanStats()
+        span_stats.wall_time += time.perf_counter() - self._wall_start
+        span_stats.cpu_time += time.process_time() - self._cpu_start
+        span_stats.calls += 1
+
+
+def span(name: str) -> Span:
+    """Time code inside `with` block as named span."""
+    return Span(name)
+
+
+def timed(name: str, iterable: Iterable[T]) -> Iterator[T]:
+    """Time producing of each item of iterable as named span."""
+    iterator = iter(iterable)
+    item_span = Span(name)
+    while True:
+        with item_span:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def count(name: str, value: int = 1) -> None:
+    """Add value to the named counter."""
+    if _stats is not None:
+        _stats.counters[name] = _stats.counters.get(name, 0) + value
@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+import mmap
+from typing import Any, Optional, Tuple, Union, cast
 
 IdLine = str
 """
@@ -9,11 +10,109 @@ Is needed to identify error even source code changed
 """
 Digest = str
 """Hash of id line, is used to compare saved errors with current ones"""
+LinterOutput = Union[str, bytes, mmap.mmap]
+"""Linter output as text or UTF-8 encoded bytes (e.g. memory mapped file)"""
 
 
-@dataclass(frozen=True)
 class LinterError:
-    """Linter error in terms of linthell's vision."""
+    """Linter error in terms of linthell's vision.
+
+    Compact immutable record. Plugins can keep error message as a part of
+    linter output (see `from_output`), then it's copied only once it's
+    accessed, e.g. printed for a new error. Most errors are filtered out by
+    baseline, so their messages are never copied.
+    """
+
+    __slots__ = ('id_line', 'path', 'line', '_message', '_start', '_end')
 
     id_line: IdLine
-    error_message: str
+    path: Optional[str]
+    """Normalized path of file with the error, if plugin can provide it."""
+    line: Optional[int]
+    """Line number of the error inside file, if plugin can provide it."""
+    _message: LinterOutput
+    """Error message or linter output containing it."""
+    _start: Optional[int]
+    """Position of error message inside linter output, None if whole."""
+    _end: int
+
+    def __init__(
+        self,
+        id_line: IdLine,
+        error_message: str,
+        path: Optional[str] = None,
+        line: Optional[int] = None,
+    ) -> None:  # noqa: D107
+        _set = object.__setattr__
+        _set(self, 'id_line', id_line)
+        _set(self, 'path', path)
+        _set(self, 'line', line)
+        _set(self, '_message', error_message)
+        _set(self, '_start', None)
+        _set(self, '_end', 0)
+
+    @classmethod
+    def from_output(
+        cls,
+        id_line: IdLine,
+        linter_output: LinterOutput,
+        start: int,
+        end: int,
+        path: Optional[str] = None,
+        line: Optional[int] = None,
+    ) -> 'LinterError':
+        """Create error which message is a part of linter output.
+
+        Linter output isn't copied, error keeps reference to it until
+        message is accessed. Bytes are decoded on access.
+
+        :param start: position of error message inside linter output
+        :param end: position right after error message
+        """
+        error = cls(id_line, cast(str, linter_output), path, line)
+        object.__setattr__(error, '_start', start)
+        object.__setattr__(error, '_end', end)
+        return error
+
+    @property
+    def error_message(self) -> str:
+        """Message printed for a new error."""
+        start = self._start
+        if start is None:
+            return cast(str, self._message)
+        end = self._end
+        message = self._message[start:end]
+        if not isinstance(message, str):
+            message = message.decode('utf-8')
+        # Release linter output, message is copied once
+        object.__setattr__(self, '_message', message)
+        object.__setattr__(self, '_start', None)
+        return message
+
+    def _astuple(self) -> Tuple[IdLine, str, Optional[str], Optional[int]]:
+        return self.id_line, self.error_message, self.path, self.line
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LinterError):
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    def __hash__(self) -> int:
+        return hash(self._astuple())
+
+    def __repr__(self) -> str:
+        return (
+            f'{type(self).__name__}(id_line={self.id_line!r}, '
+            f'error_message={self.error_message!r}, '
+            f'path={self.path!r}, line={self.line!r})'
+        )
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Only the message is pickled, not the whole linter output
+        return type(self), self._astuple()
@@ -0,0 +1,229 @@
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from click.testing import CliRunner
+
+from linthell.cli import cli
+from linthell.utils import baseline as baseline_module
+from linthell.utils.baseline import (
+    LEGACY_FORMAT,
+    BaselineFormat,
+    BaselineFormatError,
+    get_baseline_format,
+    get_digests_from_baseline,
+    load_baseline,
+    migrate_baseline,
+    read_baseline_format,
+    save_baseline,
+    update_baseline,
+)
+from linthell.utils.baseline_db import DatabaseError, is_database
+from linthell.utils.types import LinterError
+
+ID_LINES = [
+    f'{name}.py:import os:F401 \'os\' imported but unused'
+    for name in ('a', 'b', 'c', 'd', 'e', 'f')
+]
+SHARDED = get_baseline_format(sharded=True)
+SQLITE = get_baseline_format(sqlite=True)
+STORAGES = [
+    LEGACY_FORMAT,
+    get_baseline_format(digest='blake2b-64'),
+    SHARDED,
+    SQLITE,
+]
+
+
+@pytest.fixture(autouse=True)
+def project_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('LINTHELL_DAEMON', '0')
+    monkeypatch.setenv('LINTHELL_CACHE_DIR', str(tmp_path / 'cache'))
+    return tmp_path
+
+
+def assert_baseline(
+    baseline_file: Path, id_lines: List[str], baseline_format: BaselineFormat
+) -> None:
+    assert read_baseline_format(baseline_file) == baseline_format
+    assert sorted(load_baseline(baseline_file)) == sorted(id_lines)
+    digests = get_digests_from_baseline(baseline_file)
+    for id_line in id_lines:
+        assert baseline_format.scheme.digest(id_line) in digests
+    missing_id_line = 'g.py:import os:F401 \'os\' imported but unused'
+    assert baseline_format.scheme.digest(missing_id_line) not in digests
+
+
+@pytest.mark.parametrize('baseline_format', STORAGES)
+def test_baseline_round_trip(
+    tmp_path: Path, baseline_format: BaselineFormat
+) -> None:
+    baseline_file = tmp_path / 'baseline'
+
+    save_baseline(baseline_file, ID_LINES, baseline_format)
+
+    assert_baseline(baseline_file, ID_LINES, baseline_format)
+    assert ID_LINES[0] in load_baseline(baseline_file, ['a.py'])
+
+
+@pytest.mark.parametrize('baseline_format', STORAGES)
+def test_baseline_update_of_paths(
+    tmp_path: Path, baseline_format: BaselineFormat
+) -> None:
+    baseline_file = tmp_path / 'baseline'
+    save_baseline(baseline_file, ID_LINES, baseline_format)
+    paths = {'a.py', 'b.py', 'g.py'}
+    new_error = LinterError('g.py:import re:F401', 'g.py:1:1', 'g.py', 1)
+
+    id_lines = update_baseline(
+        load_baseline(baseline_file, paths), [new_error], paths
+    )
+    save_baseline(baseline_file, id_lines, baseline_format, paths)
+
+    assert_baseline(
+        baseline_file, ID_LINES[2:] + ['g.py:import re:F401'], baseline_format
+    )
+
+
+def test_sqlite_baseline_is_database(tmp_path: Path) -> None:
+    baseline_file = tmp_path / 'baseline.sqlite'
+
+    save_baseline(baseline_file, ID_LINES, SQLITE)
+    save_baseline(baseline_file, ID_LINES[:1], SQLITE, ['b.py'])
+
+    assert is_database(baseline_file)
+    assert_baseline(baseline_file, [ID_LINES[0], *ID_LINES[2:]], SQLITE)
+    assert load_baseline(baseline_file, ['c.py', 'x.py']) == [ID_LINES[2]]
+
+
+def test_digests_only_sqlite_baseline(tmp_path: Path) -> None:
+    baseline_file = tmp_path / 'baseline.sqlite'
+    baseline_format = get_baseline_format(digests_only=True, sqlite=True)
+
+    save_baseline(baseline_file, ID_LINES, baseline_format)
+
+    digests = get_digests_from_baseline(baseline_file)
+    assert baseline_format.scheme.digest(ID_LINES[0]) in digests
+    with pytest.raises(BaselineFormatError):
+        load_baseline(baseline_file)
+
+
+def test_sharded_baseline_round_trip(tmp_path: Path) -> None:
+    baseline_dir = tmp_path / 'baseline'
+
+    save_baseline(baseline_dir, ID_LINES, SHARDED)
+
+    assert_baseline(baseline_dir, ID_LINES, SHARDED)
+    assert load_baseline(baseline_dir, ['a.py']) == [ID_LINES[0]]
+
+
+def test_sharded_baseline_update_rewrites_shards_of_paths(
+    tmp_path: Path,
+) -> None:
+    baseline_dir = tmp_path / 'baseline'
+    save_baseline(baseline_dir, ID_LINES, SHARDED)
+    updated_id_lines = load_baseline(baseline_dir, ['a.py', 'b.py'])
+    updated_id_lines.remove(ID_LINES[0])
+
+    save_baseline(baseline_dir, updated_id_lines, SHARDED, ['a.py', 'b.py'])
+
+    assert_baseline(baseline_dir, ID_LINES[1:], SHARDED)
+
+
+def test_saving_sharded_baseline_keeps_unrelated_files(
+    tmp_path: Path,
+) -> None:
+    baseline_dir = tmp_path / 'baseline'
+    save_baseline(baseline_dir, ID_LINES, SHARDED)
+    notes = baseline_dir / 'notes.txt'
+    notes.write_text('important')
+
+    save_baseline(baseline_dir, ID_LINES[:1], SHARDED)
+    with pytest.raises(BaselineFormatError):
+        migrate_baseline(baseline_dir, get_baseline_format(digest='md5'))
+
+    assert notes.read_text() == 'important'
+    assert_baseline(baseline_dir, ID_LINES[:1], SHARDED)
+
+
+@pytest.mark.parametrize('options', [[], ['--sharded'], ['--sqlite']])
+def test_baseline_command_rejects_directory_without_manifest(
+    tmp_path: Path, options: List[str]
+) -> None:
+    docs = tmp_path / 'docs'
+    docs.mkdir()
+    (docs / 'notes.txt').write_text('important')
+    (tmp_path / 'flake8.out').write_text('a.py:1:1: F401 unused\n')
+
+    result = CliRunner().invoke(
+        cli,
+        ['baseline', '-b', 'docs', '-p', 'flake8', '--input', 'flake8.out']
+        + options,
+    )
+
+    assert result.exit_code == 1
+    assert 'docs' in result.output
+    assert sorted(path.name for path in docs.iterdir()) == ['notes.txt']
+    assert (docs / 'notes.txt').read_text() == 'important'
+
+
+def test_empty_directory_is_sharded_baseline_only_if_requested(
+    tmp_path: Path,
+) -> None:
+    (tmp_path / 'baseline').mkdir()
+    (tmp_path / 'a.py').write_text('import os\n')
+    (tmp_path / 'flake8.out').write_text(
+        'a.py:1:1: F401 \'os\' imported but unused\n'
+    )
+    command = [
+        'baseline',
+        '-b',
+        'baseline',
+        '-p',
+        'flake8',
+        '--input',
+        'flake8.out',
+    ]
+
+    assert CliRunner().invoke(cli, command).exit_code == 1
+    assert CliRunner().invoke(cli, command + ['--sharded']).exit_code == 0
+    assert_baseline(tmp_path / 'baseline', ID_LINES[:1], SHARDED)
+
+
+def test_migrate_baseline_between_storages(tmp_path: Path) -> None:
+    (tmp_path / 'baselines').mkdir()
+    baseline_file = tmp_path / 'baselines' / 'baseline.txt'
+    save_baseline(baseline_file, ID_LINES)
+    sqlite = get_baseline_format(sqlite=True)
+    text = get_baseline_format(digest='blake2b-64')
+
+    for baseline_format in (SHARDED, sqlite, text, SHARDED, LEGACY_FORMAT):
+        migrate_baseline(baseline_file, baseline_format)
+
+        assert [path.name for path in baseline_file.parent.iterdir()] == [
+            'baseline.txt'
+        ]
+        assert_baseline(baseline_file, ID_LINES, baseline_format)
+
+
+@pytest.mark.parametrize('sharded', [True, False])
+def test_failed_migration_keeps_baseline(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, sharded: bool
+) -> None:
+    (tmp_path / 'baselines').mkdir()
+    baseline_file = tmp_path / 'baselines' / 'baseline.txt'
+    baseline_format = get_baseline_format(sharded=sharded)
+    save_baseline(baseline_file, ID_LINES, baseline_format)
+
+    def save_entries(*args: Any, **kwargs: Any) -> None:
+        raise DatabaseError('database or disk is full')
+
+    monkeypatch.setattr(baseline_module, 'save_entries', save_entries)
+    with pytest.raises(BaselineFormatError):
+        migrate_baseline(baseline_file, get_baseline_format(sqlite=True))
+
+    assert_baseline(baseline_file, ID_LINES, baseline_format)
+    assert [path.name for path in baseline_file.parent.iterdir()] == [
+        'baseline.txt'
+    ]
@@ -0,0 +1,100 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from linthell.client import _is_supported
+from linthell.utils.baseline import save_baseline
+from linthell.utils.daemon import is_running
+
+pytestmark = pytest.mark.skipif(
+    not _is_supported() or not hasattr(os, 'fork'),
+    reason='Daemon is not supported on this platform',
+)
+CLIENT = '''
+import sys
+from linthell.client import run_by_daemon
+
+exit_code = run_by_daemon(sys.argv[1:])
+sys.exit(100 if exit_code is None else exit_code)
+'''
+NOT_FORWARDED = 100
+UNUSED_OS = 'F401 \'os\' imported but unused'
+
+
+@pytest.fixture
+def socket_path(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[str]:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('LINTHELL_CACHE_DIR', str(tmp_path / 'cache'))
+    # Unix socket path must be short
+    with tempfile.TemporaryDirectory() as socket_dir:
+        socket_path = os.path.join(socket_dir, 'linthell.sock')
+        monkeypatch.setenv('LINTHELL_SOCKET', socket_path)
+        daemon = subprocess.Popen(
+            [sys.executable, '-m', 'linthell', 'serve'],
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            deadline = time.monotonic() + 30
+            while not is_running(socket_path):
+                assert daemon.poll() is None, 'Daemon exited'
+                assert time.monotonic() < deadline, 'Daemon did not start'
+                time.sleep(0.05)
+            yield socket_path
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+
+def run_client(*args: str) -> 'subprocess.CompletedProcess[str]':
+    return subprocess.run(
+        [sys.executable, '-c', CLIENT, *args],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+
+
+def test_lint_is_run_by_daemon(tmp_path: Path, socket_path: str) -> None:
+    for name in ('a.py', 'b.py'):
+        (tmp_path / name).write_text('import os\n')
+    (tmp_path / 'flake8.out').write_text(
+        f'a.py:1:1: {UNUSED_OS}\nb.py:1:1: {UNUSED_OS}\n'
+    )
+    save_baseline(tmp_path / 'baseline.txt', [f'a.py:import os:{UNUSED_OS}'])
+    command = [
+        'lint',
+        '-b',
+        'baseline.txt',
+        '-p',
+        'flake8',
+        '--input',
+        'flake8.out',
+    ]
+
+    result = run_client(*command)
+
+    assert result.returncode == 1
+    assert result.stdout.splitlines() == [f'b.py:1:1: {UNUSED_OS}']
+
+    # Changed baseline is reloaded by daemon
+    save_baseline(
+        tmp_path / 'baseline.txt',
+        [f'a.py:import os:{UNUSED_OS}', f'b.py:import os:{UNUSED_OS}'],
+    )
+    result = run_client(*command)
+
+    assert result.returncode == 0
+    assert result.stdout == ''
+
+
+def test_other_commands_are_not_run_by_daemon(socket_path: str) -> None:
+    result = run_client('gc-baseline', '-b', 'baseline.txt')
+
+    assert result.returncode == NOT_FORWARDED
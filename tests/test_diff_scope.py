@@ -0,0 +1,38 @@
+from linthell.utils.diff_scope import DiffScope
+
+DIFF = '''\
+diff --git a/a.py b/a.py
+--- a/a.py
++++ b/a.py
+@@ -1,0 +2,2 @@
++x = 1
++++ b/b.py
+@@ -5 +7 @@
+-y = 2
++y = 3
+diff --git a/c.py b/c.py
+--- a/c.py
++++ /dev/null
+@@ -1,2 +0,0 @@
+-z = 1
+--- a/a.py
+'''
+
+
+def test_changed_line_starting_like_file_header_stays_in_hunk() -> None:
+    scope = DiffScope.from_diff(DIFF.split('\n'))
+
+    assert scope.files == ('a.py',)
+    assert scope.contains('a.py', 3)
+    assert scope.contains('a.py', 7)
+    assert not scope.contains('a.py', 4)
+    assert not scope.contains('b.py', 1)
+
+
+def test_hunk_without_counts_is_a_single_line() -> None:
+    scope = DiffScope.from_diff(
+        ['--- a/a.py', '+++ b/a.py', '@@ -3 +3 @@', '-old', '+new']
+    )
+
+    assert scope.contains('a.py', 3)
+    assert not scope.contains('a.py', 4)
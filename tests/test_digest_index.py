@@ -0,0 +1,88 @@
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from linthell.utils import digest_index
+from linthell.utils.baseline import get_baseline_format, save_baseline
+from linthell.utils.digest_index import (
+    DigestIndex,
+    get_baseline_stamp,
+    open_digest_index,
+    save_digest_index,
+)
+from linthell.utils.id_lines import DIGEST_SCHEMES, DigestScheme
+
+ID_LINES = [f'{index % 7}.py:x = {index}:E225' for index in range(1000)]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv('LINTHELL_CACHE_DIR', str(tmp_path / 'cache'))
+    return tmp_path / 'cache'
+
+
+def assert_index(index: DigestIndex, scheme: DigestScheme) -> None:
+    assert len(index) == len(ID_LINES)
+    for id_line in ID_LINES:
+        assert scheme.digest(id_line) in index
+        assert index.contains_raw(scheme.raw_digest(id_line))
+    for id_line in ('7.py:x = 1:E225', '0.py:x = 0:E226'):
+        assert scheme.digest(id_line) not in index
+        assert not index.contains_raw(scheme.raw_digest(id_line))
+    assert 'not a digest' not in index
+
+
+@pytest.mark.parametrize('scheme', DIGEST_SCHEMES.values())
+def test_index_round_trip(tmp_path: Path, scheme: DigestScheme) -> None:
+    baseline_file = tmp_path / 'baseline.txt'
+    save_baseline(baseline_file, ID_LINES, get_baseline_format(scheme.name))
+    stamp = get_baseline_stamp(baseline_file)
+
+    assert_index(DigestIndex.from_id_lines(ID_LINES, scheme), scheme)
+    assert open_digest_index(baseline_file, scheme) is None
+    save_digest_index(
+        baseline_file, DigestIndex.from_id_lines(ID_LINES, scheme), stamp
+    )
+    index = open_digest_index(baseline_file, scheme)
+
+    assert index is not None
+    assert_index(index, scheme)
+
+
+def test_index_of_changed_baseline_is_stale(tmp_path: Path) -> None:
+    scheme = DIGEST_SCHEMES['blake2b-64']
+    baseline_file = tmp_path / 'baseline.txt'
+    save_baseline(baseline_file, ID_LINES, get_baseline_format(scheme.name))
+    stamp = get_baseline_stamp(baseline_file)
+    index = DigestIndex.from_id_lines(ID_LINES, scheme)
+    save_digest_index(baseline_file, index, stamp)
+
+    save_baseline(baseline_file, ID_LINES[1:], get_baseline_format())
+
+    assert open_digest_index(baseline_file, scheme) is None
+
+
+def test_touched_baseline_is_hashed_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    scheme = DIGEST_SCHEMES['blake2b-64']
+    baseline_file = tmp_path / 'baseline.txt'
+    save_baseline(baseline_file, ID_LINES, get_baseline_format(scheme.name))
+    stamp = get_baseline_stamp(baseline_file)
+    index = DigestIndex.from_id_lines(ID_LINES, scheme)
+    save_digest_index(baseline_file, index, stamp)
+    os.utime(baseline_file, ns=(0, 0))
+    hashed_files: List[Path] = []
+    hash_file = digest_index._hash_file
+
+    def spy_hash_file(path: Path) -> bytes:
+        hashed_files.append(path)
+        return hash_file(path)
+
+    monkeypatch.setattr(digest_index, '_hash_file', spy_hash_file)
+
+    assert open_digest_index(baseline_file, scheme) is not None
+    assert open_digest_index(baseline_file, scheme) is not None
+    assert hashed_files == [baseline_file]
@@ -0,0 +1,101 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+from click.testing import CliRunner, Result
+
+from linthell.cli import cli
+from linthell.utils.baseline import (
+    LEGACY_FORMAT,
+    BaselineFormat,
+    get_baseline_format,
+    get_digests_from_baseline,
+    save_baseline,
+)
+
+ID_LINES = [
+    f'{name}.py:import os:F401 \'os\' imported but unused'
+    for name in ('a', 'b', 'c')
+]
+STORAGES = [
+    LEGACY_FORMAT,
+    get_baseline_format(digest='blake2b-64'),
+    get_baseline_format(sharded=True),
+    get_baseline_format(sqlite=True),
+]
+
+
+@pytest.fixture(autouse=True)
+def project_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('LINTHELL_DAEMON', '0')
+    monkeypatch.setenv('LINTHELL_CACHE_DIR', str(tmp_path / 'cache'))
+    for name in ('a.py', 'b.py'):
+        (tmp_path / name).write_text('import os\n')
+    return tmp_path
+
+
+def gc(options: List[str]) -> Result:
+    return CliRunner().invoke(cli, ['gc-baseline', '-b', 'baseline', *options])
+
+
+def assert_entries(
+    baseline_format: BaselineFormat, id_lines: List[str]
+) -> None:
+    digests = get_digests_from_baseline(Path('baseline'), use_index=False)
+    for id_line in ID_LINES:
+        is_kept = baseline_format.scheme.digest(id_line) in digests
+        assert is_kept == (id_line in id_lines)
+
+
+@pytest.mark.parametrize('baseline_format', STORAGES)
+def test_gc_removes_entries_of_missing_files(
+    baseline_format: BaselineFormat,
+) -> None:
+    save_baseline(Path('baseline'), ID_LINES, baseline_format)
+
+    result = gc([])
+
+    assert result.exit_code == 0, result.output
+    assert 'Removed 1 of 3 entries: 1 of missing files' in result.output
+    assert_entries(baseline_format, ID_LINES[:2])
+
+
+@pytest.mark.parametrize('baseline_format', STORAGES)
+def test_gc_with_input_removes_entries_not_reported(
+    tmp_path: Path, baseline_format: BaselineFormat
+) -> None:
+    save_baseline(Path('baseline'), ID_LINES, baseline_format)
+    (tmp_path / 'flake8.out').write_text(
+        'b.py:1:1: F401 \'os\' imported but unused\n'
+    )
+
+    result = gc(['-p', 'flake8', '--input', 'flake8.out'])
+
+    assert result.exit_code == 0, result.output
+    assert (
+        'Removed 2 of 3 entries: 1 of missing files, 1 not reported'
+        in result.output
+    )
+    assert_entries(baseline_format, ID_LINES[1:2])
+
+
+def test_gc_keeps_baseline_without_stale_entries(tmp_path: Path) -> None:
+    save_baseline(Path('baseline'), ID_LINES[:2])
+    content = (tmp_path / 'baseline').read_bytes()
+
+    result = gc([])
+
+    assert result.exit_code == 0, result.output
+    assert 'Removed 0 of 2 entries' in result.output
+    assert (tmp_path / 'baseline').read_bytes() == content
+
+
+def test_gc_of_digests_only_baseline_requires_input() -> None:
+    baseline_format = get_baseline_format(digests_only=True)
+    save_baseline(Path('baseline'), ID_LINES, baseline_format)
+
+    result = gc([])
+
+    assert result.exit_code == 1
+    assert_entries(baseline_format, ID_LINES)
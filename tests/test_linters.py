@@ -0,0 +1,48 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from linthell.plugins.base import load_plugin_by_name
+from linthell.utils.linters import get_linter_errors
+
+SLOW_LINTER = '''
+import sys, time
+for path in sys.argv[1:]:
+    print(f'{path}:1:1: F401 unused', flush=True)
+time.sleep(20)
+'''
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_error_is_yielded_before_linter_exits(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, jobs: int
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'linter.py').write_text(SLOW_LINTER)
+    for name in ('a.py', 'b.py'):
+        (tmp_path / name).write_text('import os\n')
+    started = time.monotonic()
+
+    linter_errors = get_linter_errors(
+        f'{sys.executable} linter.py',
+        ('a.py', 'b.py'),
+        'stdout',
+        load_plugin_by_name('flake8'),
+        jobs=jobs,
+    )
+    linter_error = next(linter_errors)
+    linter_errors.close()
+
+    assert linter_error.id_line == 'a.py:import os:F401 unused'
+    assert time.monotonic() - started < 10
+
+
+@pytest.mark.parametrize(
+    'plugin_name', ['mypy', 'mypy-json', 'pylint', 'pylint-json']
+)
+def test_cross_module_linters_are_run_against_all_files(
+    plugin_name: str,
+) -> None:
+    assert load_plugin_by_name(plugin_name).whole_program
@@ -0,0 +1,111 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+from click.testing import CliRunner
+
+from linthell.cli import cli
+from linthell.utils.baseline import (
+    BaselineFormatError,
+    get_baseline_format,
+    save_baseline,
+)
+from linthell.utils.nested_baselines import NestedBaselines
+
+UNUSED_OS = 'import os:F401 \'os\' imported but unused'
+
+
+@pytest.fixture(autouse=True)
+def project_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('LINTHELL_DAEMON', '0')
+    monkeypatch.setenv('LINTHELL_CACHE_DIR', str(tmp_path / 'cache'))
+    for file in ('setup.py', 'api/api.py', 'api/tests/test.py', 'web/web.py'):
+        (tmp_path / file).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / file).write_text('import os\n')
+    return tmp_path
+
+
+def save(baseline_file: str, paths: List[str]) -> None:
+    save_baseline(
+        Path(baseline_file),
+        [f'{path}:{UNUSED_OS}' for path in paths],
+        get_baseline_format(digest='blake2b-64'),
+    )
+
+
+def test_nearest_baseline_wins() -> None:
+    save('baseline.txt', ['setup.py'])
+    save('api/baseline.txt', ['api.py'])
+    baselines = NestedBaselines('baseline.txt')
+
+    routes = {
+        path: baselines.route(path)
+        for path in ('setup.py', 'api/api.py', 'api/tests/test.py', 'web/w.py')
+    }
+
+    assert {path: route[0] for path, route in routes.items() if route} == {
+        'setup.py': 0,
+        'api/api.py': 4,
+        'api/tests/test.py': 4,
+        'web/w.py': 0,
+    }
+    assert routes['api/api.py'][1] is routes['api/tests/test.py'][1]
+
+
+def test_file_without_baseline_is_not_routed() -> None:
+    save('api/baseline.txt', ['api.py'])
+    baselines = NestedBaselines('baseline.txt')
+
+    assert baselines.route('web/web.py') is None
+    assert baselines.route('../outside.py') is None
+    assert baselines.route('api/api.py') is not None
+
+
+def test_baselines_are_loaded_lazily() -> None:
+    save('api/baseline.txt', ['api.py'])
+    (Path('web') / 'baseline.txt').write_text(
+        '# linthell-baseline version=999\n'
+    )
+    baselines = NestedBaselines('baseline.txt')
+
+    assert baselines.route('api/api.py') is not None
+    with pytest.raises(BaselineFormatError):
+        baselines.route('web/web.py')
+
+
+def test_lint_checks_errors_against_nearest_baselines(
+    tmp_path: Path,
+) -> None:
+    save('baseline.txt', ['setup.py'])
+    save('api/baseline.txt', ['api.py'])
+    (tmp_path / 'flake8.out').write_text(
+        ''.join(
+            f'{path}:1:1: F401 \'os\' imported but unused\n'
+            for path in (
+                'setup.py',
+                'api/api.py',
+                'api/tests/test.py',
+                'web/web.py',
+            )
+        )
+    )
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            'lint',
+            '--baseline-name',
+            'baseline.txt',
+            '-p',
+            'flake8',
+            '--input',
+            'flake8.out',
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert result.output.splitlines() == [
+        'api/tests/test.py:1:1: F401 \'os\' imported but unused',
+        'web/web.py:1:1: F401 \'os\' imported but unused',
+    ]
@@ -0,0 +1,114 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+from click.testing import CliRunner
+
+from linthell.cli import cli
+from linthell.plugins.base import load_plugin_by_name
+from linthell.utils.baseline import save_baseline
+from linthell.utils.id_lines import DIGEST_SCHEMES
+from linthell.utils.parallel import (
+    is_splittable,
+    iter_blocks,
+    iter_errors_with_digests,
+    iter_id_lines,
+)
+
+OUTPUTS = {
+    'flake8': ''.join(
+        f'a.py:{index % 3 + 1}:1: E{index:03} error {index}\n'
+        for index in range(300)
+    ),
+    'pydocstyle': ''.join(
+        f'a.py:{index % 3 + 1} in public function `f{index}`:\n'
+        f'        D103: Missing docstring in public function\n'
+        for index in range(300)
+    ),
+    'mypy': ''.join(
+        f'a.py:{index % 3 + 1}: error: Error {index}  [misc]\n'
+        f'a.py:{index % 3 + 1}: note: Note {index}\n'
+        for index in range(300)
+    ),
+}
+
+
+@pytest.fixture(autouse=True)
+def project_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('LINTHELL_DAEMON', '0')
+    monkeypatch.setenv('LINTHELL_CACHE_DIR', str(tmp_path / 'cache'))
+    (tmp_path / 'a.py').write_text('import os\nimport sys\nx=1\n')
+    return tmp_path
+
+
+def split(text: str, size: int) -> List[str]:
+    chunks = []
+    for start in range(0, len(text), size):
+        end = start + size
+        chunks.append(text[start:end])
+    return chunks
+
+
+@pytest.mark.parametrize('plugin_name', OUTPUTS)
+def test_blocks_are_split_at_record_boundaries(plugin_name: str) -> None:
+    plugin = load_plugin_by_name(plugin_name)
+    output = OUTPUTS[plugin_name]
+
+    blocks = list(iter_blocks(split(output, 100), plugin, block_size=500))
+
+    assert is_splittable(plugin)
+    assert len(blocks) > 10
+    assert ''.join(blocks) == output
+    serial_errors = [error.id_line for error in plugin.iter_parse([output])]
+    block_errors = [
+        error.id_line
+        for block in blocks
+        for error in plugin.iter_parse([block])
+    ]
+    assert block_errors == serial_errors
+
+
+@pytest.mark.parametrize('plugin_name', OUTPUTS)
+def test_parallel_parsing_keeps_order_of_errors(plugin_name: str) -> None:
+    plugin = load_plugin_by_name(plugin_name)
+    output = OUTPUTS[plugin_name]
+    scheme = DIGEST_SCHEMES['blake2b-64']
+    serial_errors = list(plugin.iter_parse([output]))
+
+    errors_with_digests = list(
+        iter_errors_with_digests(
+            split(output, 100), plugin, 2, block_size=500, scheme=scheme
+        )
+    )
+    id_lines = list(iter_id_lines([output], plugin, 2, block_size=500))
+
+    assert errors_with_digests == [
+        (error, scheme.digest(error.id_line)) for error in serial_errors
+    ]
+    assert id_lines == [error.id_line for error in serial_errors]
+
+
+def test_lint_with_jobs_reports_same_errors(tmp_path: Path) -> None:
+    output = OUTPUTS['flake8'] * 500
+    (tmp_path / 'flake8.out').write_text(output)
+    save_baseline(
+        tmp_path / 'baseline.txt',
+        [f'a.py:import os:E{index:03} error {index}' for index in range(300)],
+    )
+    command = [
+        'lint',
+        '-b',
+        'baseline.txt',
+        '-p',
+        'flake8',
+        '--input',
+        'flake8.out',
+    ]
+
+    serial = CliRunner().invoke(cli, command)
+    parallel = CliRunner().invoke(cli, command + ['--jobs', '2'])
+
+    assert serial.exit_code == parallel.exit_code == 1
+    assert parallel.output == serial.output
+    assert len(parallel.output.splitlines()) == 200 * 500
@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from linthell.cli import cli
+
+
+def test_baseline_without_pre_commit_is_usage_error(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('LINTHELL_DAEMON', '0')
+    monkeypatch.setitem(sys.modules, 'pre_commit', None)
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            'pre-commit',
+            'baseline',
+            '--baseline',
+            'baseline.txt',
+            '--plugin-name',
+            'flake8',
+            '--linter-command',
+            'flake8',
+            '--hook-name',
+            'flake8',
+            '--no-hook-cache',
+        ],
+    )
+
+    assert result.exit_code == 2
+    assert 'pre-commit package is not installed' in result.output
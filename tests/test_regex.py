@@ -0,0 +1,115 @@
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from linthell.plugins.base import load_plugin_by_name
+from linthell.plugins.regex import LinthellRegexPlugin
+
+SINGLE_LINE_FORMAT = r'(?P<path>.+):(?P<line>\d+): (?P<message>.+)'
+
+
+@pytest.fixture(autouse=True)
+def project_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    (tmp_path / 'a.py').write_text('import os\nimport sys\n')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_single_line_error_is_yielded_without_waiting_for_next_line() -> None:
+    plugin = LinthellRegexPlugin(SINGLE_LINE_FORMAT)
+    requested: List[str] = []
+
+    def iter_chunks() -> Iterator[str]:
+        yield 'a.py:1: F401 unused\n'
+        requested.append('second')
+        yield 'a.py:2: F401 unused\n'
+
+    linter_errors = plugin.iter_parse(iter_chunks())
+    linter_error = next(linter_errors)
+
+    assert linter_error.id_line == 'a.py:import os:F401 unused'
+    assert linter_error.error_message == 'a.py:1: F401 unused'
+    assert requested == []
+    assert [error.id_line for error in linter_errors] == [
+        'a.py:import sys:F401 unused'
+    ]
+
+
+def test_unfinished_line_is_held_back() -> None:
+    plugin = LinthellRegexPlugin(SINGLE_LINE_FORMAT)
+
+    linter_errors = plugin.iter_parse(['a.py:1: F4', '01 unused\n'])
+
+    assert [error.error_message for error in linter_errors] == [
+        'a.py:1: F401 unused'
+    ]
+
+
+@pytest.mark.parametrize('plugin_name', ['flake8', 'pylint'])
+def test_single_line_plugins_do_not_hold_back_lines(plugin_name: str) -> None:
+    plugin = load_plugin_by_name(plugin_name)
+
+    assert isinstance(plugin, LinthellRegexPlugin)
+    assert plugin.max_record_lines == 1
+
+
+def test_complete_multiline_error_is_yielded_without_waiting() -> None:
+    plugin = load_plugin_by_name('pydocstyle')
+    requested: List[str] = []
+
+    def iter_chunks() -> Iterator[str]:
+        yield 'a.py:1 at module level:\n        D100: Missing docstring\n'
+        requested.append('eof')
+
+    linter_errors = plugin.iter_parse(iter_chunks())
+    linter_error = next(linter_errors)
+
+    assert linter_error.id_line == 'a.py:import os:D100: Missing docstring'
+    assert requested == []
+
+
+def test_error_is_not_truncated_when_source_is_idle() -> None:
+    plugin = load_plugin_by_name('mypy')
+
+    linter_errors = plugin.iter_parse(
+        ['a.py:1: error: Bad  [misc]\n', '', 'a.py:1: note: Hint\n']
+    )
+
+    assert [error.error_message for error in linter_errors] == [
+        'a.py:1: error: Bad  [misc]\na.py:1: note: Hint'
+    ]
+
+
+@pytest.mark.parametrize(
+    'lint_format',
+    [
+        r'(?P<path>.+):(?P<line>\d+)\n(?P<message>.+)',
+        r'(?P<path>.+):(?P<line>\d+):\s(?P<message>.+)',
+        r'(?P<path>[^:]+):(?P<line>\d+): (?P<message>.+)',
+        r'(?P<path>.+):(?P<line>\d+)\D(?P<message>.+)',
+        r'(?P<path>.+):(?P<line>\d+)\W(?P<message>.+)',
+        r'(?P<path>.+):(?P<line>[\t-\r\d]+)(?P<message>.+)',
+        r'(?s)(?P<path>.+):(?P<line>\d+): (?P<message>.+)',
+        r'(?P<path>.+):(?P<line>\d+): (?P<message>(?s:.+))',
+        r'(?P<path>.+):(?P<line>\d+): (?P<message>.+)(?=\x0a)',
+        r'(?P<path>.+):(?P<line>\d+): (?P<message>.+',
+    ],
+)
+def test_formats_which_can_match_line_break_hold_back_lines(
+    lint_format: str,
+) -> None:
+    assert LinthellRegexPlugin(lint_format).max_record_lines == 2
+
+
+@pytest.mark.parametrize(
+    'lint_format',
+    [
+        SINGLE_LINE_FORMAT,
+        r'(?P<path>[^:\n]+):(?P<line>\d+):\d+: (?P<message>\S.*)',
+        r'(?P<path>\w+\.py):(?P<line>\d+)(?::\d+)?: (?P<message>.+)',
+        r'(?s)(?P<path>[^\s:]+):(?P<line>\d+): (?P<message>(?-s:.+))',
+    ],
+)
+def test_single_line_formats_do_not_hold_back_lines(lint_format: str) -> None:
+    assert LinthellRegexPlugin(lint_format).max_record_lines == 1
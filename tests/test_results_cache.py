@@ -0,0 +1,114 @@
+import shlex
+import sys
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+import pytest
+
+from linthell.plugins.base import load_plugin_by_name
+from linthell.utils.results_cache import ResultsCache
+from linthell.utils.types import LinterError
+
+LINTER = '''
+import sys
+from pathlib import Path
+
+if sys.argv[1:] == ['--version']:
+    print(Path('version.txt').read_text())
+'''
+
+
+@pytest.fixture(autouse=True)
+def project_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'linter.py').write_text(LINTER)
+    (tmp_path / 'version.txt').write_text('1.0')
+    for name in ('a.py', 'b.py'):
+        (tmp_path / name).write_text('import os\n')
+    return tmp_path
+
+
+def create_cache(tmp_path: Path, linter_command: str) -> ResultsCache:
+    return ResultsCache.for_linter(
+        linter_command,
+        'stdout',
+        load_plugin_by_name('flake8'),
+        cache_dir=tmp_path / 'cache',
+    )
+
+
+def linter_command(*args: str) -> str:
+    return ' '.join(
+        shlex.quote(arg) for arg in (sys.executable, 'linter.py', *args)
+    )
+
+
+class FakeLinter:
+    def __init__(self) -> None:
+        self.linted_files: List[Tuple[str, ...]] = []
+
+    def __call__(self, files: Tuple[str, ...]) -> Iterable[LinterError]:
+        self.linted_files.append(files)
+        for file in files:
+            yield LinterError(f'{file}:import os:F401', f'{file}:1:1', file, 1)
+
+
+def test_cache_lints_only_missed_files(tmp_path: Path) -> None:
+    cache = create_cache(tmp_path, linter_command())
+    lint = FakeLinter()
+    list(cache.iter_errors(('a.py',), lint))
+
+    errors = list(cache.iter_errors(('b.py', 'a.py'), lint))
+
+    assert [error.error_message for error in errors] == [
+        'b.py:1:1',
+        'a.py:1:1',
+    ]
+    assert lint.linted_files == [('a.py',), ('b.py',)]
+
+
+def test_changed_file_is_linted_again(tmp_path: Path) -> None:
+    cache = create_cache(tmp_path, linter_command())
+    lint = FakeLinter()
+    list(cache.iter_errors(('a.py', 'b.py'), lint))
+
+    (tmp_path / 'a.py').write_text('import sys\n')
+    list(cache.iter_errors(('a.py', 'b.py'), lint))
+
+    assert lint.linted_files == [('a.py', 'b.py'), ('a.py',)]
+
+
+def test_errors_without_path_are_not_cached(tmp_path: Path) -> None:
+    cache = create_cache(tmp_path, linter_command())
+
+    def lint(files: Tuple[str, ...]) -> Iterable[LinterError]:
+        return [LinterError('config:error', 'config error')]
+
+    errors = list(cache.iter_errors(('a.py',), lint))
+
+    assert [error.error_message for error in errors] == ['config error']
+    assert cache.load(cache.get_key('a.py') or '') is None
+
+
+def test_cache_depends_on_linter_version(tmp_path: Path) -> None:
+    context = create_cache(tmp_path, linter_command()).context
+
+    assert create_cache(tmp_path, linter_command()).context == context
+    (tmp_path / 'version.txt').write_text('2.0')
+    assert create_cache(tmp_path, linter_command()).context != context
+    assert create_cache(tmp_path, linter_command('-q')).context != context
+
+
+def test_eviction_removes_least_recently_used_entries(tmp_path: Path) -> None:
+    cache = create_cache(tmp_path, linter_command())
+    error = LinterError('a.py:import os:F401', 'a.py:1:1', 'a.py', 1)
+    for index in range(10):
+        cache.save(f'{index:02}', [error])
+    entry_size = cache._get_entry_path('00').stat().st_size
+    cache.max_size = entry_size * 5
+
+    cache.evict()
+
+    entries = sorted(cache.directory.glob('*/*.json'))
+    assert len(entries) == 4
+    assert cache.load('00') is None
@@ -0,0 +1,96 @@
+import shlex
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+from click.testing import CliRunner, Result
+
+from linthell.cli import cli
+from linthell.utils.baseline import save_baseline
+
+LINTER = '''
+import sys
+
+for index in range(int(sys.argv[1])):
+    print(f'a.py:{index + 1}:1: E225 missing whitespace around operator')
+print('b.py:1:1: F401 \\'os\\' imported but unused')
+'''
+
+
+@pytest.fixture(autouse=True)
+def project_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('LINTHELL_DAEMON', '0')
+    monkeypatch.setenv('LINTHELL_CACHE_DIR', str(tmp_path / 'cache'))
+    (tmp_path / 'linter.py').write_text(LINTER)
+    (tmp_path / 'a.py').write_text('x=1\n' * 100_000)
+    (tmp_path / 'b.py').write_text('import os\n')
+    return tmp_path
+
+
+def run(tmp_path: Path, config: str, options: List[str]) -> Result:
+    (tmp_path / 'linthell.ini').write_text(config)
+    return CliRunner().invoke(
+        cli, ['--config', 'linthell.ini', 'run'] + options
+    )
+
+
+def linter_section(name: str, errors_count: int) -> str:
+    command = ' '.join(
+        shlex.quote(arg)
+        for arg in (sys.executable, 'linter.py', str(errors_count))
+    )
+    return (
+        f'[run:{name}]\n'
+        f'linter_command = {command}\n'
+        f'baseline_file = {name}.txt\n'
+        'plugin_name = flake8\n'
+    )
+
+
+def test_run_reports_new_errors_of_each_linter(tmp_path: Path) -> None:
+    save_baseline(
+        tmp_path / 'first.txt',
+        ['b.py:import os:F401 \'os\' imported but unused'],
+    )
+    save_baseline(tmp_path / 'second.txt', [])
+    config = ''.join(
+        [
+            '[run]\nlinters = first\n',
+            linter_section('first', 0),
+            linter_section('second', 1),
+        ]
+    )
+
+    result = run(tmp_path, config, [])
+
+    assert result.exit_code == 1
+    assert result.output.splitlines() == [
+        '[second]',
+        'a.py:1:1: E225 missing whitespace around operator',
+        'b.py:1:1: F401 \'os\' imported but unused',
+    ]
+    assert run(tmp_path, config, ['--linter', 'first']).exit_code == 0
+
+
+def test_run_lints_large_output(tmp_path: Path) -> None:
+    save_baseline(
+        tmp_path / 'big.txt',
+        ['a.py:x=1:E225 missing whitespace around operator'],
+    )
+
+    result = run(tmp_path, linter_section('big', 100_000), [])
+
+    assert result.exit_code == 1
+    assert result.output.splitlines() == [
+        '[big]',
+        'b.py:1:1: F401 \'os\' imported but unused',
+    ]
+
+
+def test_run_without_linters_is_usage_error(tmp_path: Path) -> None:
+    result = run(tmp_path, '[run]\nlinters = first\n', [])
+
+    assert result.exit_code == 2
+    assert 'No linters declared' in result.output
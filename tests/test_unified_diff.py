@@ -0,0 +1,23 @@
+import pytest
+
+from linthell.plugins.base import load_plugin_by_name
+
+DIFF = (
+    '--- a.py\t2024-01-01 00:00:00.000000 +0000\n'
+    '+++ a.py\t2024-01-01 00:00:01.000000 +0000\n'
+    '@@ -1,2 +1,2 @@\n'
+    '-x = 1  \x0c# page\n'
+    '+x = 1  # page\n'
+    ' y = " "\n'
+)
+
+
+@pytest.mark.parametrize('plugin_name', ['black-diff', 'isort-diff'])
+def test_id_lines_are_cut_like_splitlines_did(plugin_name: str) -> None:
+    linter_errors = load_plugin_by_name(plugin_name).parse(DIFF)
+
+    assert [error.id_line for error in linter_errors] == [
+        'a.py:-x = 1  ',
+        'a.py:+x = 1  # page',
+    ]
+    assert [error.line for error in linter_errors] == [1, 1]